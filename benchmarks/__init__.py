@@ -0,0 +1,9 @@
+"""Hermetic benchmarks: fixture sites and a fake LLM served on localhost."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
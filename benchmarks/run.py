@@ -0,0 +1,357 @@
+"""
+Run the pipeline stages against local fixture sites and a fake LLM.
+
+    python -m benchmarks.run [--latency-ms 0] [--error-rate 0] [--repeat 3]
+                             [--save-baseline | --check] [-- <analyzer flags>]
+
+Every stage (resolve_privacy_url, fetch_policy_text, chunking, scoring) is
+measured per site for wall time, requests, bytes and peak Python memory.
+Nothing leaves the machine: the sites and the OpenAI-compatible endpoint
+are ThreadingHTTPServers on 127.0.0.1, and the HTTP cache is disabled.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Final, TypeVar
+
+from . import ROOT
+from .servers import FakeLLM, FixtureSite, Traffic
+
+import main as analyzer_main
+from analyzer.discovery import SuccessStats
+from analyzer.discoverycache import configure_discovery_cache
+from analyzer.httpcache import configure_http_cache
+
+__all__ = ["SITES", "STAGES", "compare", "run_benchmarks"]
+
+T = TypeVar("T")
+
+DEFAULT_BASELINE: Final[Path] = ROOT / "benchmarks" / "baseline.json"
+
+# (fixture directory, policy path, how discovery should find it)
+SITES: Final[tuple[tuple[str, str], ...]] = (
+    ("direct", "/privacy-policy"),  # common path probe
+    ("sitemap", "/legal/privacy-notice"),  # robots.txt → index → gzipped child
+    ("links", "/company/data-handling-privacy"),  # homepage link only
+)
+STAGES: Final[tuple[str, ...]] = ("resolve", "fetch", "chunking", "scoring")
+
+# A metric regresses when it grows by more than its ratio AND its floor.
+_SLACK: Final[dict[str, tuple[float, float]]] = {
+    "wall_ms": (0.5, 25.0),
+    "requests": (0.2, 2.0),
+    "bytes": (0.1, 1024.0),
+    "peak_kib": (0.5, 256.0),
+}
+
+
+@contextmanager
+def _env(**values: str) -> Iterator[None]:
+    old = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _measure(
+    fn: Callable[[], T], traffic: Sequence[Traffic]
+) -> tuple[T | None, dict[str, Any]]:
+    """Run `fn` once; report wall time, server traffic and peak allocations."""
+    for t in traffic:
+        t.reset()
+    # A fresh memo keeps each stage's downloads its own.
+    analyzer_main._FETCH_MEMO.clear()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    error = None
+    running = set(threading.enumerate())
+    start = time.perf_counter()
+    try:
+        result: T | None = fn()
+    except Exception as exc:
+        result, error = None, f"{type(exc).__name__}: {exc}"
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    # Discovery returns before its losing probes finish; let them land here
+    # instead of in the next stage's traffic.
+    for t in threading.enumerate():
+        if t not in running and not t.daemon:
+            t.join(timeout=10)
+    seen = [t.snapshot() for t in traffic]
+    metrics: dict[str, Any] = {
+        "wall_ms": round(wall * 1000, 2),
+        "requests": sum(s["requests"] for s in seen),
+        "bytes": sum(s["bytes_in"] + s["bytes_out"] for s in seen),
+        "http_errors": sum(s["errors"] for s in seen),
+        "peak_kib": round(max(0, peak - base) / 1024, 1),
+    }
+    if error:
+        metrics["error"] = error
+    return result, metrics
+
+
+def _run_site(
+    site: FixtureSite, llm: FakeLLM, args: argparse.Namespace
+) -> dict[str, Any]:
+    stages: dict[str, dict[str, Any]] = {}
+    net = [site.traffic]
+
+    resolved, stages["resolve"] = _measure(
+        lambda: analyzer_main.resolve_privacy_url(
+            site.base_url + "/", deadline=args.discover_timeout
+        )[0],
+        net,
+    )
+    url = resolved or site.base_url + "/"
+    text, stages["fetch"] = _measure(
+        lambda: analyzer_main.fetch_policy_text(url, prefer="http"), net
+    )
+    chunked, stages["chunking"] = _measure(
+        lambda: analyzer_main.chunk_content(text or "", args), []
+    )
+    _, chunks, _, max_len = chunked or ("", [], {}, None)
+    results, stages["scoring"] = _measure(
+        lambda: analyzer_main.score_chunks(
+            chunks,
+            args.model,
+            concurrency=args.concurrency,
+            progress=False,
+            max_len=max_len,
+            pack=args.pack,
+        ),
+        [llm.traffic],
+    )
+    stages["chunking"]["chunks"] = len(chunks)
+    stages["scoring"]["scored"] = len(results or [])
+    return {
+        "resolved": (resolved or "").removeprefix(site.base_url),
+        "found": resolved == site.base_url + site.policy_path,
+        "stages": stages,
+    }
+
+
+def _median(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Per-metric median over repeated runs of one site."""
+    out = dict(runs[-1])
+    out["stages"] = {}
+    for stage in STAGES:
+        samples = [r["stages"][stage] for r in runs]
+        merged = dict(samples[-1])
+        for key, value in merged.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                m = statistics.median(s[key] for s in samples)
+                merged[key] = round(m, 2) if isinstance(value, float) else int(m)
+        out["stages"][stage] = merged
+    return out
+
+
+def run_benchmarks(
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    repeat: int = 3,
+    analyzer_args: Sequence[str] = (),
+    seed: int = 0,
+    rate_limit: int = 0,
+    rate_window: float = 1.0,
+) -> dict[str, Any]:
+    """
+    Benchmark every fixture site `repeat` times and return the report.
+
+    Args:
+        latency: Seconds the fake LLM waits before each reply.
+        error_rate: Share of LLM calls answered with a 429 or 500.
+        repeat: Runs per site; each metric is the median over runs.
+        analyzer_args: Extra CLI flags (e.g. `--pack 4`) for chunking/scoring.
+        seed: Seed of the injected LLM errors.
+        rate_limit: Requests the fake LLM accepts per `rate_window` seconds
+            (0 = unlimited); the rest are answered with a 429.
+    """
+    args = analyzer_main.build_parser().parse_args(list(analyzer_args))
+    configure_http_cache(None)
+    # Every run discovers from scratch so the numbers stay comparable.
+    configure_discovery_cache(None)
+    report: dict[str, Any] = {
+        "config": {
+            "latency_ms": round(latency * 1000, 1),
+            "error_rate": error_rate,
+            "repeat": repeat,
+            "rate_limit": f"{rate_limit}/{rate_window}s" if rate_limit else None,
+            "analyzer_args": list(analyzer_args),
+        },
+        "sites": {},
+    }
+    with ExitStack() as stack:
+        llm = stack.enter_context(
+            FakeLLM(latency, error_rate, seed, rate_limit, rate_window)
+        )
+        servers = [stack.enter_context(FixtureSite(n, p)) for n, p in SITES]
+        # The client is cached per API key, so a per-run key picks up the URL.
+        stack.enter_context(
+            _env(
+                OPENAI_BASE_URL=llm.base_url + "/v1",
+                OPENAI_API_KEY=f"bench-{llm.base_url.rsplit(':', 1)[-1]}",
+            )
+        )
+        # Build the shared client up front so the first site does not pay for it.
+        analyzer_main._openai_client(os.environ["OPENAI_API_KEY"])
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            # Deferred imports (trafilatura, tiktoken, ...) load in a throwaway
+            # run instead of being charged to the first site.
+            _run_site(servers[0], llm, args)
+            for (name, _), site in zip(SITES, servers):
+                runs = []
+                for _ in range(max(1, repeat)):
+                    analyzer_main._PATH_STATS = SuccessStats()
+                    runs.append(_run_site(site, llm, args))
+                report["sites"][name] = _median(runs)
+        finally:
+            if started:
+                tracemalloc.stop()
+    report["totals"] = {
+        stage: {
+            key: round(
+                sum(s["stages"][stage][key] for s in report["sites"].values()), 2
+            )
+            for key in _SLACK
+        }
+        for stage in STAGES
+    }
+    return report
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """List metrics of `report` that regressed against `baseline`."""
+    problems = []
+    for name, old_site in baseline.get("sites", {}).items():
+        new_site = report["sites"].get(name)
+        if new_site is None:
+            continue
+        if old_site.get("found") and not new_site.get("found"):
+            problems.append(f"{name}: policy no longer found")
+        for stage in STAGES:
+            old = old_site["stages"].get(stage, {})
+            new = new_site["stages"][stage]
+            if "error" in new and "error" not in old:
+                problems.append(f"{name}.{stage}: {new['error']}")
+            for key, (ratio, floor) in _SLACK.items():
+                if key not in old:
+                    continue
+                grown = new[key] - old[key]
+                if grown > floor and new[key] > old[key] * (1 + ratio):
+                    problems.append(f"{name}.{stage}.{key}: {old[key]} -> {new[key]}")
+    return problems
+
+
+def _table(report: dict[str, Any]) -> str:
+    rows = [f"{'site':<9} {'stage':<9} {'ms':>9} {'reqs':>5} {'bytes':>9} {'KiB':>8}"]
+    for name, site in report["sites"].items():
+        for stage in STAGES:
+            m = site["stages"][stage]
+            rows.append(
+                f"{name:<9} {stage:<9} {m['wall_ms']:>9.2f} {m['requests']:>5}"
+                f" {m['bytes']:>9} {m['peak_kib']:>8.1f}"
+                + (f"  {m['error']}" if "error" in m else "")
+            )
+    return "\n".join(rows)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Fake LLM reply latency"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of fake LLM calls failing with 429/500",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Error injection seed")
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=0,
+        help="Requests the fake LLM accepts per --rate-window (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--rate-window", type=float, default=1.0, help="Rate limit window (seconds)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per site")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline report to save or compare against",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--save-baseline", action="store_true", help="Write the report as baseline"
+    )
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 when a metric regressed against the baseline",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Also write the JSON report here"
+    )
+    parser.add_argument(
+        "analyzer_args",
+        nargs="*",
+        help="Analyzer flags after `--`, e.g. -- --pack 4 --concurrency 4",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = run_benchmarks(
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        repeat=args.repeat,
+        analyzer_args=args.analyzer_args,
+        seed=args.seed,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+    )
+    print(_table(report), file=sys.stderr)
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}", file=sys.stderr)
+            return 2
+        problems = compare(report, json.loads(args.baseline.read_text("utf-8")))
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        return 1 if problems else 0
+    if not args.output:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Local HTTP servers backing the hermetic benchmarks."""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar, Final
+
+from analyzer.scoring import SCORING_WEIGHTS
+
+__all__ = ["FakeLLM", "FixtureSite", "Traffic", "fake_scores"]
+
+SITES_DIR: Final[Path] = Path(__file__).resolve().parent / "sites"
+_TYPES: Final[dict[str, str]] = {
+    ".html": "text/html; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".xml": "application/xml",
+    ".gz": "application/gzip",
+}
+
+
+class Traffic:
+    """Thread-safe request and byte counters of one server."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.errors = 0
+
+    def add(self, bytes_in: int, bytes_out: int, error: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.errors += int(error)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "errors": self.errors,
+            }
+
+
+class _Server:
+    handler: ClassVar[type[BaseHTTPRequestHandler]]
+
+    def __init__(self) -> None:
+        self.traffic = Traffic()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> "_Server":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    @property
+    def owner(self) -> Any:
+        return self.server.owner  # type: ignore[attr-defined]
+
+    def _reply(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class _SiteHandler(_Handler):
+    def do_GET(self) -> None:
+        site: FixtureSite = self.owner
+        body, content_type = site.resolve(self.path.split("?", 1)[0])
+        if body is None:
+            body, status, content_type = b"not found", 404, _TYPES[".txt"]
+        else:
+            status = 200
+        self._reply(status, body, content_type)
+        site.traffic.add(0, len(body), error=status >= 400)
+
+    do_HEAD = do_GET
+
+
+class FixtureSite(_Server):
+    """
+    Serve one fixture site from `benchmarks/sites/<name>`.
+
+    `/` maps to `index.html`, nested paths map to `_`-joined file names
+    (`/sitemaps/pages.xml` → `sitemaps_pages.xml`), a `.xml.gz` request is
+    answered with the gzipped `.xml` file, and `policy_path` serves the
+    shared `sites/policy.html`. `{base}` in XML and text files is replaced
+    with the server's own URL so sitemap entries point back at it.
+    """
+
+    handler = _SiteHandler
+
+    def __init__(self, name: str, policy_path: str) -> None:
+        self.directory = SITES_DIR / name
+        self.policy_path = policy_path
+        super().__init__()
+
+    def resolve(self, path: str) -> tuple[bytes | None, str]:
+        if path == self.policy_path:
+            return (SITES_DIR / "policy.html").read_bytes(), _TYPES[".html"]
+        name = "index.html" if path == "/" else path.strip("/").replace("/", "_")
+        packed = name.endswith(".gz")
+        file = self.directory / (name[:-3] if packed else name)
+        if not file.is_file() or ".." in name:
+            return None, ""
+        body = file.read_bytes()
+        if file.suffix in (".xml", ".txt"):
+            body = body.replace(b"{base}", self.base_url.encode())
+        if packed:
+            return gzip.compress(body, mtime=0), _TYPES[".gz"]
+        return body, _TYPES.get(file.suffix, "application/octet-stream")
+
+
+def fake_scores(text: str) -> dict[str, int]:
+    """Deterministic 0-10 category scores derived from the excerpt text."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return {k: digest[i] % 11 for i, k in enumerate(SCORING_WEIGHTS)}
+
+
+class _LLMHandler(_Handler):
+    def do_POST(self) -> None:
+        llm: FakeLLM = self.owner
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._reply(404, b"{}", "application/json")
+            llm.traffic.add(len(raw), 2, error=True)
+            return
+        admitted, limits = llm.admit()
+        if not admitted:
+            body = json.dumps({"error": {"message": "rate limited", "code": 429}})
+            self._reply(429, body.encode(), "application/json", limits)
+            llm.traffic.add(len(raw), len(body), error=True)
+            return
+        if llm.latency:
+            time.sleep(llm.latency)
+        status = llm.draw_error()
+        if status:
+            body = json.dumps({"error": {"message": "injected", "code": status}})
+            self._reply(status, body.encode(), "application/json", limits)
+            llm.traffic.add(len(raw), len(body), error=True)
+            return
+        body = json.dumps(llm.complete(json.loads(raw))).encode()
+        self._reply(200, body, "application/json", limits)
+        llm.traffic.add(len(raw), len(body))
+
+
+class FakeLLM(_Server):
+    """
+    OpenAI-compatible `/v1/chat/completions` endpoint with fake scores.
+
+    Each call sleeps `latency` seconds and fails with a 500 or 429 with
+    probability `error_rate` (seeded, so runs are repeatable). Packed
+    prompts get one result per `<excerpt>`; scores are a hash of the text.
+    With `rate_limit` set, at most that many requests are accepted per
+    `rate_window` seconds; the rest get a 429 with `retry-after-ms`, and
+    every reply carries OpenAI-style `x-ratelimit-*-requests` headers.
+    """
+
+    handler = _LLMHandler
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        rate_limit: int = 0,
+        rate_window: float = 60.0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        super().__init__()
+
+    def admit(self) -> tuple[bool, dict[str, str]]:
+        """Count a request against the window; False when it is over the limit."""
+        if not self.rate_limit:
+            return True, {}
+        with self._rng_lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start, self._window_used = now, 0
+            left_ms = (self._window_start + self.rate_window - now) * 1000
+            admitted = self._window_used < self.rate_limit
+            self._window_used += int(admitted)
+            headers = {
+                "x-ratelimit-limit-requests": str(self.rate_limit),
+                "x-ratelimit-remaining-requests": str(
+                    self.rate_limit - self._window_used
+                ),
+                "x-ratelimit-reset-requests": f"{left_ms:.0f}ms",
+            }
+            if not admitted:
+                headers["retry-after-ms"] = f"{left_ms:.0f}"
+            return admitted, headers
+
+    def draw_error(self) -> int:
+        with self._rng_lock:
+            if self._rng.random() >= self.error_rate:
+                return 0
+            return self._rng.choice((429, 500))
+
+    def complete(self, request: dict[str, Any]) -> dict[str, Any]:
+        user = str(request["messages"][-1]["content"])
+        parts = user.split('<excerpt id="')[1:]
+        if parts:
+            content: dict[str, Any] = {
+                "results": [
+                    {"excerpt": i, "scores": fake_scores(p)}
+                    for i, p in enumerate(parts, 1)
+                ]
+            }
+        else:
+            content = {"scores": fake_scores(user)}
+        text = json.dumps(content)
+        prompt_tokens = sum(len(str(m["content"])) for m in request["messages"]) // 4
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(text) // 4,
+                "total_tokens": prompt_tokens + len(text) // 4,
+            },
+        }
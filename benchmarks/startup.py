@@ -0,0 +1,152 @@
+"""
+Measure CLI startup: import time of `main` and `main.py --help`.
+
+    python -m benchmarks.startup [--runs 7] [--save-baseline | --check]
+
+Every sample is a fresh interpreter. Times are medians with the cost of an
+empty interpreter subtracted, so they track only what the analyzer loads.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+from . import ROOT, SRC
+
+__all__ = ["HEAVY_MODULES", "compare", "measure_startup"]
+
+DEFAULT_BASELINE: Final[Path] = ROOT / "benchmarks" / "startup_baseline.json"
+
+# Dependencies that must stay out of a plain `import main`.
+HEAVY_MODULES: Final[tuple[str, ...]] = (
+    "bs4",
+    "chromedriver_autoinstaller",
+    "langchain_text_splitters",
+    "numpy",
+    "openai",
+    "selenium.webdriver",
+    "tiktoken",
+    "trafilatura",
+)
+
+# A timing regresses when it grows by more than 50% and more than 30 ms.
+_RATIO: Final[float] = 0.5
+_FLOOR_MS: Final[float] = 30.0
+
+
+def _wall_ms(args: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args],
+        cwd=SRC,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def _slowest_imports(top: int) -> list[dict[str, Any]]:
+    """Top-level imports of `main` by cumulative time, from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        # Direct imports of main are indented by exactly three spaces.
+        if name.startswith("   ") and not name.startswith("    "):
+            rows.append({"module": name.strip(), "ms": int(parts[1]) / 1000})
+    rows.sort(key=lambda r: -r["ms"])
+    return [{**r, "ms": round(r["ms"], 1)} for r in rows[:top]]
+
+
+def _loaded_heavy() -> list[str]:
+    probe = (
+        "import sys, main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=SRC,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    return [m for m in out.split(",") if m]
+
+
+def measure_startup(runs: int = 7) -> dict[str, Any]:
+    """Median startup timings over `runs` fresh interpreters."""
+    samples: dict[str, list[float]] = {"python": [], "import": [], "help": []}
+    for _ in range(max(1, runs)):
+        samples["python"].append(_wall_ms(["-c", "pass"]))
+        samples["import"].append(_wall_ms(["-c", "import main"]))
+        samples["help"].append(_wall_ms(["main.py", "--help"]))
+    base = statistics.median(samples["python"])
+    return {
+        "runs": runs,
+        "python_ms": round(base, 1),
+        "import_ms": round(statistics.median(samples["import"]) - base, 1),
+        "help_ms": round(statistics.median(samples["help"]) - base, 1),
+        "heavy_modules_loaded": _loaded_heavy(),
+        "slowest_imports": _slowest_imports(10),
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """List startup regressions of `report` against `baseline`."""
+    problems = []
+    for key in ("import_ms", "help_ms"):
+        old, new = baseline.get(key), report[key]
+        if old is None:
+            continue
+        if new - old > _FLOOR_MS and new > old * (1 + _RATIO):
+            problems.append(f"{key}: {old} -> {new}")
+    allowed = set(baseline.get("heavy_modules_loaded", []))
+    for mod in report["heavy_modules_loaded"]:
+        if mod not in allowed:
+            problems.append(f"`import main` now loads {mod}")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save-baseline", action="store_true")
+    mode.add_argument("--check", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(args.runs)
+    text = json.dumps(report, indent=2) + "\n"
+    if args.save_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    sys.stdout.write(text)
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}", file=sys.stderr)
+            return 2
+        problems = compare(report, json.loads(args.baseline.read_text("utf-8")))
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import math
+from typing import Any, Final
+
+from .prefilter import relevance
+from .scoring import SCORING_WEIGHTS
+
+__all__ = ["CATEGORY_CUES", "order_chunks", "overall_stderr"]
+
+# Lowercase substrings hinting that a chunk discusses a category.
+CATEGORY_CUES: Final[dict[str, tuple[str, ...]]] = {
+    "lawful_basis_and_purpose": ("legal basis", "lawful", "legitimate interest", "purpose", "consent"),
+    "collection_and_minimization": ("we collect", "information we", "categories of", "collect"),
+    "secondary_use_and_limits": ("use your", "how we use", "compatible", "only use"),
+    "retention_and_deletion": ("retain", "retention", "delete", "deletion", "as long as"),
+    "third_parties_and_processors": ("third part", "service provider", "processor", "share", "disclose"),
+    "cross_border_transfers": ("transfer", "outside the", "standard contractual", "adequacy", "countr"),
+    "user_rights_and_redress": ("your rights", "right to", "access", "rectif", "erasure", "complain"),
+    "security_and_breach": ("secur", "encrypt", "breach", "safeguard", "protect"),
+    "transparency_and_notice": ("contact us", "changes to", "updated", "effective date", "notice"),
+    "sensitive_children_ads_profiling": ("child", "under the age", "sensitive", "advertis", "profiling", "sell"),
+}  # fmt: skip
+
+# Variance assumed for a category seen in fewer than two chunks: the largest
+# possible variance of a 0-10 score.
+_PRIOR_VARIANCE: Final[float] = 25.0
+
+
+def _cues(chunk: str) -> set[str]:
+    low = chunk.lower()
+    return {cat for cat, cues in CATEGORY_CUES.items() if any(c in low for c in cues)}
+
+
+def order_chunks(chunks: list[str]) -> list[int]:
+    """
+    Order chunk indices so likely high-information chunks are scored first.
+
+    Greedily picks the chunk that cues the most categories not yet covered,
+    breaking ties by local privacy relevance and then by position.
+    """
+    cues = [_cues(c) for c in chunks]
+    rel = [relevance(c) for c in chunks]
+    remaining = set(range(len(chunks)))
+    covered: set[str] = set()
+    order: list[int] = []
+    while remaining:
+        best = max(remaining, key=lambda i: (len(cues[i] - covered), rel[i], -i))
+        order.append(best)
+        covered |= cues[best]
+        remaining.discard(best)
+    return order
+
+
+def overall_stderr(chunk_json_list: list[dict[str, Any]]) -> float:
+    """
+    Estimated standard error of `overall_score` (0-100) from per-chunk scores.
+
+    Treats each category mean as an independent sample mean; categories with
+    fewer than two scores use the maximum variance, and a category with no
+    score at all makes the error infinite.
+    """
+    per_cat: dict[str, list[float]] = {k: [] for k in SCORING_WEIGHTS}
+    for item in chunk_json_list:
+        scores = item.get("scores", {})
+        for k in SCORING_WEIGHTS:
+            v = scores.get(k)
+            if isinstance(v, int) and 0 <= v <= 10:
+                per_cat[k].append(float(v))
+
+    total_weight = sum(SCORING_WEIGHTS.values())
+    var = 0.0
+    for cat, weight in SCORING_WEIGHTS.items():
+        vals = per_cat[cat]
+        n = len(vals)
+        if n == 0:
+            return math.inf
+        if n < 2:
+            sample_var = _PRIOR_VARIANCE
+        else:
+            mean = sum(vals) / n
+            sample_var = sum((v - mean) ** 2 for v in vals) / (n - 1)
+        var += (weight / total_weight) ** 2 * sample_var / n
+    # Category scores are 0-10 and the overall score is 0-100.
+    return round(10.0 * math.sqrt(var), 3)
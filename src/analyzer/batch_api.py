@@ -0,0 +1,275 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Final, Protocol
+
+from .prompts import (
+    PACKED_SYSTEM_SCORER,
+    SYSTEM_SCORER,
+    build_packed_user_prompt,
+    build_user_prompt,
+)
+
+__all__ = [
+    "BatchJobManifest",
+    "BatchTransport",
+    "LocalBatchTransport",
+    "OpenAIBatchTransport",
+    "build_chat_request",
+    "build_packed_chat_request",
+    "parse_batch_results",
+    "parse_packed_content",
+]
+
+TERMINAL_FAILURES: Final[frozenset[str]] = frozenset(
+    {"failed", "expired", "cancelled", "cancelling"}
+)
+_MAX_TOKENS_PER_CHUNK: Final[int] = 600
+_MAX_OUTPUT_TOKENS: Final[int] = 16000
+
+
+def build_chat_request(
+    custom_id: str, model: str, chunk: str, max_len: int | None = 6000
+) -> dict[str, Any]:
+    """
+    Build one Batch API request line scoring `chunk`.
+
+    The body matches the synchronous chunk scoring call exactly.
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_SCORER},
+                {"role": "user", "content": build_user_prompt(chunk, max_len)},
+            ],
+            "temperature": 0,
+            "max_tokens": _MAX_TOKENS_PER_CHUNK,
+            "response_format": {"type": "json_object"},
+        },
+    }
+
+
+def build_packed_chat_request(
+    custom_id: str, model: str, chunks: list[str], max_len: int | None = 6000
+) -> dict[str, Any]:
+    """
+    Build one request scoring several chunks at once.
+
+    The schema and guidance live in the system message, identical for every
+    call, and only the excerpts vary. The reply is parsed with
+    `parse_packed_content`.
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": PACKED_SYSTEM_SCORER},
+                {"role": "user", "content": build_packed_user_prompt(chunks, max_len)},
+            ],
+            "temperature": 0,
+            "max_tokens": min(_MAX_OUTPUT_TOKENS, _MAX_TOKENS_PER_CHUNK * len(chunks)),
+            "response_format": {"type": "json_object"},
+        },
+    }
+
+
+def parse_packed_content(content: str, expected: int) -> list[Any] | None:
+    """
+    Split a packed reply into per-chunk objects, in excerpt order.
+
+    Returns None unless the reply holds exactly `expected` results. Objects
+    are re-ordered by their "excerpt" id when every id is present and
+    distinct; the id field itself is removed.
+    """
+    try:
+        obj = json.loads(content.strip())
+    except ValueError:
+        return None
+    items = obj.get("results") if isinstance(obj, dict) else None
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    ids = [it.get("excerpt") if isinstance(it, dict) else None for it in items]
+    if sorted(i for i in ids if isinstance(i, int)) == list(range(1, expected + 1)):
+        items = [items[ids.index(n)] for n in range(1, expected + 1)]
+    for it in items:
+        if isinstance(it, dict):
+            it.pop("excerpt", None)
+    return items
+
+
+def parse_batch_results(lines: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+    """
+    Map each custom_id of a Batch API output file to its parsed JSON object.
+
+    Failed requests and unparsable model output map to None.
+    """
+    out: dict[str, dict[str, Any] | None] = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue
+        cid = rec.get("custom_id")
+        if not isinstance(cid, str):
+            continue
+        parsed: dict[str, Any] | None = None
+        resp = rec.get("response") or {}
+        if not rec.get("error") and resp.get("status_code") == 200:
+            try:
+                content = resp["body"]["choices"][0]["message"]["content"] or ""
+                obj = json.loads(content.strip())
+                parsed = obj if isinstance(obj, dict) else None
+            except (KeyError, IndexError, TypeError, ValueError):
+                parsed = None
+        out[cid] = parsed
+    return out
+
+
+class BatchTransport(Protocol):
+    """Uploads a request file, reports job status and streams output lines."""
+
+    def submit(self, requests_path: Path) -> str: ...
+
+    def status(self, job_id: str) -> str: ...
+
+    def results(self, job_id: str) -> Iterator[str]: ...
+
+
+class OpenAIBatchTransport:
+    """Batch transport backed by the OpenAI Files and Batches endpoints."""
+
+    def __init__(self, client: Any, completion_window: str = "24h") -> None:
+        self._client = client
+        self._window = completion_window
+
+    def submit(self, requests_path: Path) -> str:
+        with open(requests_path, "rb") as fh:
+            uploaded = self._client.files.create(file=fh, purpose="batch")
+        job = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self._window,
+        )
+        return str(job.id)
+
+    def status(self, job_id: str) -> str:
+        return str(self._client.batches.retrieve(job_id).status)
+
+    def results(self, job_id: str) -> Iterator[str]:
+        job = self._client.batches.retrieve(job_id)
+        if not job.output_file_id:
+            return iter(())
+        return iter(self._client.files.content(job.output_file_id).text.splitlines())
+
+
+class LocalBatchTransport:
+    """
+    File-based stand-in for the Batch API, used for tests and dry runs.
+
+    Submitted request files are copied into `directory`; the job completes on
+    the first status check by passing every request body to `responder`,
+    which returns the assistant message content for that request.
+    """
+
+    def __init__(
+        self, directory: str | Path, responder: Callable[[dict[str, Any]], str]
+    ) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._responder = responder
+
+    def submit(self, requests_path: Path) -> str:
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        shutil.copyfile(requests_path, self._dir / f"{job_id}.input.jsonl")
+        return job_id
+
+    def status(self, job_id: str) -> str:
+        src = self._dir / f"{job_id}.input.jsonl"
+        dst = self._dir / f"{job_id}.output.jsonl"
+        if not src.exists():
+            return "failed"
+        if not dst.exists():
+            with (
+                open(src, encoding="utf-8") as fin,
+                open(dst, "w", encoding="utf-8") as fout,
+            ):
+                for line in fin:
+                    if not line.strip():
+                        continue
+                    req = json.loads(line)
+                    body = {
+                        "choices": [
+                            {"message": {"content": self._responder(req["body"])}}
+                        ]
+                    }
+                    rec = {
+                        "custom_id": req["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                        "error": None,
+                    }
+                    fout.write(json.dumps(rec) + "\n")
+        return "completed"
+
+    def results(self, job_id: str) -> Iterator[str]:
+        with open(self._dir / f"{job_id}.output.jsonl", encoding="utf-8") as fh:
+            yield from fh
+
+
+class BatchJobManifest:
+    """
+    Local JSON record of one offline scoring job, used to resume runs.
+
+    `state` moves through prepared -> submitted -> collected (or failed);
+    `sites` keeps per-site metadata and the custom_ids of its chunk requests.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.data: dict[str, Any] = {"state": "new", "sites": []}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as fh:
+                self.data = json.load(fh)
+
+    @property
+    def state(self) -> str:
+        return str(self.data.get("state", "new"))
+
+    @property
+    def requests_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".requests.jsonl")
+
+    def update(self, **fields: Any) -> None:
+        """Set fields and atomically persist the manifest."""
+        self.data.update(fields)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def wait(
+        self,
+        transport: BatchTransport,
+        poll_interval: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> str:
+        """Poll the submitted job until it completes or fails; return the status."""
+        job_id = str(self.data["job_id"])
+        while True:
+            status = transport.status(job_id)
+            if status == "completed" or status in TERMINAL_FAILURES:
+                return status
+            sleep(poll_interval)
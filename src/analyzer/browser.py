@@ -0,0 +1,229 @@
+import atexit
+import functools
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Final
+
+from selenium.common.exceptions import WebDriverException
+
+__all__ = [
+    "BrowserPool",
+    "configure_browser_pool",
+    "ensure_chromedriver",
+    "get_browser_pool",
+    "wait_for_settle",
+]
+
+_USER_AGENT: Final[str] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+)
+
+_BLOCKED_URLS: Final[list[str]] = [
+    f"*.{ext}"
+    for ext in (
+        "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+        "woff", "woff2", "ttf", "otf", "eot",
+        "mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov", "m3u8",
+    )
+]  # fmt: skip
+
+
+@functools.cache
+def ensure_chromedriver() -> None:
+    """Install a matching chromedriver once per process."""
+    import chromedriver_autoinstaller
+
+    chromedriver_autoinstaller.install()
+
+
+def _launch_chrome() -> Any:
+    # Imported here so runs that never need a browser skip loading the driver stack.
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    ensure_chromedriver()
+    opts = Options()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_argument("--mute-audio")
+    opts.add_argument(f"--user-agent={_USER_AGENT}")
+    opts.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
+    driver = webdriver.Chrome(options=opts)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+    except Exception:
+        pass
+    return driver
+
+
+def wait_for_settle(
+    driver: Any, timeout: float = 12.0, interval: float = 0.25, stable_rounds: int = 3
+) -> None:
+    """
+    Wait until the document is loaded and its visible text stops changing.
+
+    Returns early once `document.readyState` is complete and the body text
+    length has been identical for `stable_rounds` consecutive polls; gives up
+    silently after `timeout` seconds.
+    """
+    end = time.monotonic() + timeout
+    last, stable = -1, 0
+    while time.monotonic() < end:
+        state, size = driver.execute_script(
+            "return [document.readyState,"
+            " document.body ? document.body.innerText.length : -1];"
+        )
+        if state == "complete" and size >= 0 and size == last:
+            stable += 1
+            if stable >= stable_rounds:
+                return
+        else:
+            stable = 0
+        last = size
+        time.sleep(interval)
+
+
+class _Browser:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver: Any) -> None:
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    Pool of warm headless Chrome instances.
+
+    Browsers start lazily, are handed out one caller at a time, have their
+    cookies, cache and storage wiped between pages, and are recycled after
+    `max_pages` loads or as soon as the driver errors.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_pages: int = 50,
+        settle_timeout: float = 12.0,
+        factory: Callable[[], Any] = _launch_chrome,
+    ) -> None:
+        self._idle: queue.LifoQueue[_Browser] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._lock = threading.Lock()
+        self._all: set[_Browser] = set()
+        self._max_pages = max_pages
+        self._settle_timeout = settle_timeout
+        self._factory = factory
+        self.launched = 0
+
+    def _take(self) -> _Browser:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            b = _Browser(self._factory())
+            with self._lock:
+                self._all.add(b)
+                self.launched += 1
+            return b
+
+    def _discard(self, b: _Browser) -> None:
+        with self._lock:
+            self._all.discard(b)
+        try:
+            b.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _reset(driver: Any) -> None:
+        for cmd in ("Network.clearBrowserCookies", "Network.clearBrowserCache"):
+            driver.execute_cdp_cmd(cmd, {})
+        driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+        )
+        driver.get("about:blank")
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        """Borrow a clean browser; it is reset or recycled on return."""
+        with self._slots:
+            b = self._take()
+            try:
+                yield b.driver
+            except BaseException:
+                self._discard(b)
+                raise
+            b.pages += 1
+            if b.pages >= self._max_pages:
+                self._discard(b)
+                return
+            try:
+                self._reset(b.driver)
+            except WebDriverException:
+                self._discard(b)
+                return
+            self._idle.put(b)
+
+    def fetch_text(self, url: str) -> str | None:
+        """Load `url` and return the visible body text, or None on failure."""
+        try:
+            with self.session() as driver:
+                driver.get(url)
+                wait_for_settle(driver, timeout=self._settle_timeout)
+                text = driver.execute_script(
+                    "return document.body ? document.body.innerText : null;"
+                )
+                return text if isinstance(text, str) else None
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            browsers = list(self._all)
+        for b in browsers:
+            self._discard(b)
+
+
+_pool_lock = threading.Lock()
+_pool: BrowserPool | None = None
+
+
+def configure_browser_pool(
+    size: int = 1, max_pages: int = 50, settle_timeout: float = 12.0
+) -> BrowserPool:
+    """Replace the process-wide browser pool, closing the previous one."""
+    global _pool
+    pool = BrowserPool(size=size, max_pages=max_pages, settle_timeout=settle_timeout)
+    with _pool_lock:
+        old, _pool = _pool, pool
+    if old is not None:
+        old.close()
+    return pool
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared browser pool, creating it with defaults on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+@atexit.register
+def _close_pool() -> None:
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,90 @@
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Final
+
+import diskcache
+
+__all__ = ["ChunkResultCache", "chunk_cache_key"]
+
+DEFAULT_TTL_SECONDS: Final[int] = 30 * 24 * 3600
+DEFAULT_SIZE_LIMIT_MB: Final[int] = 256
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_cache_key(
+    model: str, system_prompt: str, prompt_version: str, chunk: str
+) -> str:
+    """
+    Build a content-addressed key for one chunk scoring call.
+
+    Args:
+        model: Chat model name.
+        system_prompt: System message sent with the chunk.
+        prompt_version: Version tag of the user prompt template.
+        chunk: Chunk text.
+
+    Returns:
+        Hex digest identifying the (model, prompt, chunk) combination.
+    """
+    parts = [model, _sha256(system_prompt), prompt_version, _sha256(chunk)]
+    return _sha256(json.dumps(parts))
+
+
+class ChunkResultCache:
+    """
+    On-disk cache of per-chunk LLM results backed by diskcache.
+
+    Entries expire after `ttl_seconds`; once the cache grows past
+    `size_limit_mb` the oldest stored entries are evicted first. With
+    `refresh=True` lookups always miss but fresh results are still written.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        size_limit_mb: int = DEFAULT_SIZE_LIMIT_MB,
+        refresh: bool = False,
+    ) -> None:
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit_mb * 1024 * 1024,
+            eviction_policy="least-recently-stored",
+        )
+        self._ttl = ttl_seconds if ttl_seconds > 0 else None
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        value = None if self._refresh else self._cache.get(key)
+        with self._lock:
+            if isinstance(value, dict):
+                self.hits += 1
+                return value
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        self._cache.set(key, value, expire=self._ttl)
+
+    def scoped(self) -> "ChunkResultCache":
+        """Return a view sharing the same store but with its own hit/miss counts."""
+        view = copy.copy(self)
+        view._lock = threading.Lock()
+        view.hits = 0
+        view.misses = 0
+        return view
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._cache.close()
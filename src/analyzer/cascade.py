@@ -0,0 +1,66 @@
+from typing import Any, Final, TypeGuard
+
+from .scoring import SCORING_WEIGHTS
+
+__all__ = ["BORDERLINE_THRESHOLDS", "chunk_score", "escalation_reason"]
+
+# Overall-score (0-100) boundaries between weak, fair and strong policies; a
+# chunk scoring close to one of them is worth a second opinion.
+BORDERLINE_THRESHOLDS: Final[tuple[float, ...]] = (40.0, 70.0)
+# Chunks flagging red flags should not score this high in every category.
+_RED_FLAG_CEILING: Final[int] = 7
+
+
+def _valid_score(v: Any) -> TypeGuard[int]:
+    return isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 10
+
+
+def chunk_score(result: dict[str, Any]) -> float | None:
+    """Weighted 0-100 score of one chunk result, or None without valid scores."""
+    scores = result.get("scores")
+    if not isinstance(scores, dict):
+        return None
+    total = weight = 0.0
+    for cat, w in SCORING_WEIGHTS.items():
+        v = scores.get(cat)
+        if _valid_score(v):
+            total += v / 10.0 * w
+            weight += w
+    return round(total / weight * 100.0, 2) if weight else None
+
+
+def escalation_reason(result: Any, margin: float = 5.0) -> str | None:
+    """
+    Say why a cheap model's chunk result should be re-scored, if at all.
+
+    Returns:
+        `invalid` (no result or no scores object), `schema` (a category is
+        missing or not an integer 0-10, or rationales are missing),
+        `inconsistent` (red flags listed while every category scores at
+        least 7), `borderline` (the chunk's weighted score lies within
+        `margin` points of a BORDERLINE_THRESHOLDS value; 0 disables this)
+        or None when the result can be kept.
+    """
+    if not isinstance(result, dict) or not isinstance(result.get("scores"), dict):
+        return "invalid"
+    scores = result["scores"]
+    rationales = result.get("rationales")
+    if not all(_valid_score(scores.get(cat)) for cat in SCORING_WEIGHTS):
+        return "schema"
+    if not isinstance(rationales, dict):
+        return "schema"
+    flags = result.get("red_flags")
+    if (
+        isinstance(flags, list)
+        and any(isinstance(f, str) and f.strip() for f in flags)
+        and min(scores[cat] for cat in SCORING_WEIGHTS) >= _RED_FLAG_CEILING
+    ):
+        return "inconsistent"
+    overall = chunk_score(result)
+    if (
+        margin > 0
+        and overall is not None
+        and any(abs(overall - t) <= margin for t in BORDERLINE_THRESHOLDS)
+    ):
+        return "borderline"
+    return None
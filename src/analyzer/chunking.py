@@ -0,0 +1,152 @@
+import functools
+import math
+from typing import Any, Final, Protocol
+
+__all__ = [
+    "MODEL_TOKEN_BUDGETS",
+    "cap_char_chunks",
+    "cap_token_chunks",
+    "get_encoding",
+    "split_text_into_token_chunks",
+    "token_budget",
+]
+
+_SEPARATORS: Final[list[str]] = ["\n\n", "\n", ". ", " ", ""]
+
+# Per-chunk token targets: large enough to amortize the ~1.2k-token scoring
+# prompt, small enough that a 600-token answer stays focused.
+MODEL_TOKEN_BUDGETS: Final[dict[str, int]] = {
+    "gpt-4o": 3000,
+    "gpt-4o-mini": 3000,
+    "gpt-4.1": 4000,
+    "gpt-4.1-mini": 4000,
+    "gpt-4.1-nano": 3000,
+    "gpt-4-turbo": 3000,
+    "gpt-3.5-turbo": 1500,
+}
+DEFAULT_TOKEN_BUDGET: Final[int] = 2000
+
+
+class Encoding(Protocol):
+    def encode(self, text: str) -> list[int]: ...
+
+    def decode(self, tokens: list[int]) -> str: ...
+
+
+@functools.cache
+def get_encoding(model: str) -> Encoding:
+    """Return the tiktoken encoding for `model`, defaulting to o200k_base."""
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def token_budget(model: str, override: int | None = None) -> int:
+    """Per-chunk token budget for `model` unless explicitly overridden."""
+    if override:
+        return override
+    for name in sorted(MODEL_TOKEN_BUDGETS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_TOKEN_BUDGETS[name]
+    return DEFAULT_TOKEN_BUDGET
+
+
+def split_text_into_token_chunks(
+    text: str, max_tokens: int, overlap_tokens: int, encoding: Encoding
+) -> list[str]:
+    """
+    Split text on paragraph-first boundaries, packing chunks up to a token budget.
+
+    Args:
+        text: Text to split.
+        max_tokens: Upper bound of tokens per chunk.
+        overlap_tokens: Tokens shared by consecutive chunks.
+        encoding: Tokenizer used to measure pieces.
+
+    Returns:
+        Chunks that each fit in `max_tokens`.
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=max_tokens,
+        chunk_overlap=min(overlap_tokens, max_tokens // 2),
+        length_function=lambda t: len(encoding.encode(t)),
+        separators=_SEPARATORS,
+    )
+    return splitter.split_text(text or "")
+
+
+def cap_token_chunks(
+    text: str,
+    chunks: list[str],
+    max_chunks: int,
+    max_tokens: int,
+    overlap_tokens: int,
+    encoding: Encoding,
+    hard_cap_tokens: int,
+) -> tuple[list[str], dict[str, Any]]:
+    """
+    Enforce `max_chunks` on token chunks without silent truncation.
+
+    When there are too many chunks the text is first re-packed with a larger
+    per-chunk budget (up to `hard_cap_tokens`). Only if that is not enough is
+    the tail merged and cut at `hard_cap_tokens`; the cut is reported.
+
+    Returns:
+        The final chunks and a report with per-chunk token counts.
+    """
+    budget = max_tokens
+    if len(chunks) > max_chunks:
+        total = len(encoding.encode(text))
+        budget = min(hard_cap_tokens, math.ceil(total / max_chunks) + overlap_tokens)
+        if budget > max_tokens:
+            chunks = split_text_into_token_chunks(
+                text, budget, overlap_tokens, encoding
+            )
+    truncated: dict[str, Any] = {}
+    if len(chunks) > max_chunks:
+        tail = " ".join(chunks[max_chunks - 1 :])
+        tokens = encoding.encode(tail)
+        if len(tokens) > hard_cap_tokens:
+            truncated = {
+                "chunk": max_chunks,
+                "tokens": len(tokens) - hard_cap_tokens,
+            }
+            tail = encoding.decode(tokens[:hard_cap_tokens])
+        chunks = chunks[: max_chunks - 1] + [tail]
+    counts = [len(encoding.encode(c)) for c in chunks]
+    report: dict[str, Any] = {
+        "mode": "tokens",
+        "budget": budget,
+        "token_counts": counts,
+        "total_tokens": sum(counts),
+    }
+    if truncated:
+        report["truncated"] = truncated
+    return chunks, report
+
+
+def cap_char_chunks(
+    chunks: list[str], max_chunks: int, prompt_max_chars: int
+) -> tuple[list[str], dict[str, Any]]:
+    """
+    Merge tail chunks past `max_chunks` and report what the prompt will cut.
+
+    Returns:
+        The final chunks and a report with per-chunk character counts and any
+        characters beyond `prompt_max_chars` that will not reach the model.
+    """
+    if len(chunks) > max_chunks:
+        chunks = chunks[: max_chunks - 1] + [" ".join(chunks[max_chunks - 1 :])]
+    counts = [len(c) for c in chunks]
+    report: dict[str, Any] = {"mode": "chars", "char_counts": counts}
+    cut = {
+        i: n - prompt_max_chars for i, n in enumerate(counts, 1) if n > prompt_max_chars
+    }
+    if cut:
+        report["truncated"] = {"chunks": list(cut), "chars": sum(cut.values())}
+    return chunks, report
@@ -0,0 +1,198 @@
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .scoring import SCORING_WEIGHTS
+
+__all__ = ["ScoreCorpus"]
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass
+class ScoreCorpus:
+    """
+    Columnar per-chunk category scores for many sites.
+
+    `scores` holds one row per chunk and one column per category (NaN where
+    a chunk gave no valid score); the chunks of site `s` are rows
+    `offsets[s]:offsets[s + 1]`. Sites without any scored chunk are left out.
+    """
+
+    sites: list[str]
+    categories: list[str]
+    scores: npt.NDArray[np.float32]
+    offsets: IntArray
+
+    @classmethod
+    def from_results(
+        cls,
+        sites: Iterable[tuple[str, Sequence[Mapping[str, Any]]]],
+        categories: Sequence[str] | None = None,
+    ) -> "ScoreCorpus":
+        """
+        Build a corpus from `(site, chunk results)` pairs.
+
+        Categories default to SCORING_WEIGHTS plus any other category found
+        in the results, so newly added categories can be weighted offline.
+        """
+        names: list[str] = []
+        rows: list[Mapping[str, Any]] = []
+        offsets = [0]
+        for site, results in sites:
+            valid = [r["scores"] for r in results if isinstance(r.get("scores"), dict)]
+            if not valid:
+                continue
+            names.append(site)
+            rows.extend(valid)
+            offsets.append(len(rows))
+        if categories is None:
+            extra = sorted({k for r in rows for k in r} - SCORING_WEIGHTS.keys())
+            categories = [*SCORING_WEIGHTS, *extra]
+        col = {c: i for i, c in enumerate(categories)}
+        scores = np.full((len(rows), len(categories)), np.nan, dtype=np.float32)
+        for i, row in enumerate(rows):
+            for k, v in row.items():
+                j = col.get(k)
+                if j is not None and isinstance(v, int) and 0 <= v <= 10:
+                    scores[i, j] = v
+        return cls(names, list(categories), scores, np.asarray(offsets, np.int64))
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path) -> "ScoreCorpus":
+        """Load `ok` records of a `--report full` batch output file."""
+
+        def _records() -> Iterable[tuple[str, Sequence[Mapping[str, Any]]]]:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(rec, dict):
+                        continue
+                    chunks = rec.get("chunks")
+                    if rec.get("status") == "ok" and isinstance(chunks, list):
+                        site = rec.get("resolved_url") or rec.get("url") or ""
+                        yield site, [c for c in chunks if isinstance(c, dict)]
+
+        return cls.from_results(_records())
+
+    def save(self, path: str | Path) -> None:
+        np.savez_compressed(
+            path,
+            sites=np.asarray(self.sites, dtype=str),
+            categories=np.asarray(self.categories, dtype=str),
+            scores=self.scores,
+            offsets=self.offsets,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ScoreCorpus":
+        with np.load(path) as data:
+            return cls(
+                [str(s) for s in data["sites"]],
+                [str(c) for c in data["categories"]],
+                data["scores"],
+                data["offsets"],
+            )
+
+    def category_means(self) -> FloatArray:
+        """Per-site mean of each category (sites × categories), 0 where unscored."""
+        starts = self.offsets[:-1]
+        if len(starts) == 0:
+            return np.zeros((0, len(self.categories)))
+        present = ~np.isnan(self.scores)
+        sums = np.add.reduceat(np.where(present, self.scores, 0.0), starts, axis=0)
+        counts = np.add.reduceat(present, starts, axis=0)
+        means = np.divide(
+            sums, counts, out=np.zeros(sums.shape, np.float64), where=counts > 0
+        )
+        # Same rounding as aggregate_chunk_results so results match per site.
+        out: FloatArray = np.round(means.astype(np.float64), 2)
+        return out
+
+    def _weights(self, weights: Mapping[str, float]) -> FloatArray:
+        unknown = set(weights) - set(self.categories)
+        if unknown:
+            raise ValueError(f"Unknown categories in weights: {sorted(unknown)}")
+        w = np.array([float(weights.get(c, 0.0)) for c in self.categories])
+        if w.sum() <= 0:
+            raise ValueError("Weights must sum to a positive value")
+        return w
+
+    def aggregate(
+        self, weights: Mapping[str, float] | None = None, top: int = 3
+    ) -> dict[str, Any]:
+        """
+        Recompute every site's overall score, confidence, strengths and risks.
+
+        Args:
+            weights: Category weights; defaults to SCORING_WEIGHTS. Categories
+                missing from the mapping get weight 0.
+            top: Number of strengths and risks per site.
+
+        Returns:
+            Arrays aligned with `sites`: `overall_score`, `confidence`, and
+            `top_strengths` / `top_risks` as category indices (sites × top).
+        """
+        w = self._weights(SCORING_WEIGHTS if weights is None else weights)
+        means = self.category_means()
+        overall = np.round(means / 10.0 @ w / w.sum() * 100.0, 2)
+        if self.sites:
+            counts = np.add.reduceat(~np.isnan(self.scores), self.offsets[:-1], axis=0)
+            # Coverage counts only the weighted categories, as per site.
+            cols = [i for i, c in enumerate(self.categories) if c in SCORING_WEIGHTS]
+            covered = (counts[:, cols] > 0).sum(axis=1)
+            confidence = np.round(covered / len(SCORING_WEIGHTS), 2)
+        else:
+            confidence = np.zeros(0)
+        # Stable sorts keep category order on ties, like the per-site sort.
+        strengths = np.argsort(-means, axis=1, kind="stable")[:, :top]
+        risks = np.argsort(means, axis=1, kind="stable")[:, :top]
+        return {
+            "overall_score": overall,
+            "confidence": confidence,
+            "category_means": means,
+            "top_strengths": strengths,
+            "top_risks": risks,
+        }
+
+    def summary(
+        self,
+        weights: Mapping[str, float] | None = None,
+        percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+    ) -> dict[str, Any]:
+        """Corpus-level statistics under `weights`, as plain JSON-ready values."""
+        agg = self.aggregate(weights)
+        q = [float(p) for p in percentiles]
+
+        def _pct(values: FloatArray) -> dict[str, float]:
+            if values.size == 0:
+                return {}
+            pts = np.percentile(values, q)
+            return {f"p{p:g}": round(float(v), 2) for p, v in zip(q, pts)}
+
+        return {
+            "sites": len(self.sites),
+            "chunks": int(self.scores.shape[0]),
+            "overall_score": {
+                "mean": round(float(agg["overall_score"].mean()), 2)
+                if self.sites
+                else 0.0,
+                **_pct(agg["overall_score"]),
+            },
+            "categories": {
+                c: _pct(agg["category_means"][:, i])
+                for i, c in enumerate(self.categories)
+            },
+            "full_confidence_share": round(
+                float((agg["confidence"] >= 1.0).mean()) if self.sites else 0.0, 3
+            ),
+        }
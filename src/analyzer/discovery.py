@@ -0,0 +1,169 @@
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from .tracing import bind, span
+
+__all__ = ["DiscoveryStage", "SuccessStats", "race_candidates"]
+
+Verifier = Callable[[str], bool]
+
+
+@dataclass(frozen=True)
+class DiscoveryStage:
+    """
+    One discovery strategy.
+
+    `candidates` is either a ready list of URLs or a callable producing them
+    (run concurrently with the other stages). Stages are listed in
+    precedence order; `rank` optionally reorders probing, not precedence.
+    """
+
+    name: str
+    candidates: Sequence[str] | Callable[[], Sequence[str]]
+    verify: Verifier
+    rank: Callable[[str], float] | None = None
+
+
+class SuccessStats:
+    """Thread-safe hit/try counters used to probe historically good keys first."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, list[int]] = {}
+
+    def record(self, key: str, success: bool) -> None:
+        with self._lock:
+            c = self._counts.setdefault(key, [0, 0])
+            c[0] += int(success)
+            c[1] += 1
+
+    def rate(self, key: str) -> float:
+        """Laplace-smoothed success rate; unseen keys score 0.5."""
+        with self._lock:
+            hits, tries = self._counts.get(key, (0, 0))
+        return (hits + 1) / (tries + 2)
+
+
+_PENDING = object()
+
+
+def _list(name: str, produce: Callable[[], Sequence[str]]) -> Sequence[str]:
+    with span(f"discovery.{name}.list", "discovery") as info:
+        cands = produce()
+        info["candidates"] = len(cands)
+    return cands
+
+
+def _probe(stage: DiscoveryStage, url: str) -> bool:
+    with span(f"discovery.{stage.name}", "discovery", url=url) as info:
+        ok = bool(stage.verify(url))
+        info["verified"] = ok
+    return ok
+
+
+def race_candidates(
+    stages: Sequence[DiscoveryStage],
+    workers: int = 8,
+    deadline: float | None = None,
+    on_result: Callable[[DiscoveryStage, str, bool], None] | None = None,
+) -> str | None:
+    """
+    Verify candidates from all stages concurrently and return the winner.
+
+    The winner is the first verified candidate in precedence order (stage
+    order, then candidate order), i.e. the same URL a sequential scan would
+    return. It is returned as soon as every higher-precedence candidate has
+    failed; outstanding work is then cancelled.
+
+    Args:
+        stages: Strategies in precedence order.
+        workers: Size of the probing thread pool.
+        deadline: Seconds to wait before returning the best hit so far.
+        on_result: Called with (stage, url, verified) for each finished probe.
+
+    Returns:
+        The winning URL, or None when nothing verified in time.
+    """
+    start = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    listed: list[list[str] | None] = [None] * len(stages)
+    verdicts: dict[tuple[int, str], bool] = {}
+    futures: dict[Future[Any], tuple[str, int, str]] = {}
+    submitted: set[tuple[int, str]] = set()
+
+    def _queue(i: int, cands: Sequence[str]) -> None:
+        stage = stages[i]
+        uniq = list(dict.fromkeys(c for c in cands if c))
+        listed[i] = uniq
+        rank = stage.rank
+        order = sorted(uniq, key=lambda u: -rank(u)) if rank is not None else uniq
+        for u in order:
+            if (id(stage.verify), u) not in submitted:
+                submitted.add((id(stage.verify), u))
+                futures[pool.submit(bind(_probe), stage, u)] = ("verify", i, u)
+
+    def _verdict(i: int, u: str) -> bool | None:
+        key = (id(stages[i].verify), u)
+        return verdicts.get(key)
+
+    def _decide() -> object:
+        for i, cands in enumerate(listed):
+            if cands is None:
+                return _PENDING
+            for u in cands:
+                v = _verdict(i, u)
+                if v is None:
+                    return _PENDING
+                if v:
+                    return u
+        return None
+
+    def _best_so_far() -> str | None:
+        for i, cands in enumerate(listed):
+            for u in cands or []:
+                if _verdict(i, u):
+                    return u
+        return None
+
+    try:
+        for i, stage in enumerate(stages):
+            if callable(stage.candidates):
+                futures[pool.submit(bind(_list), stage.name, stage.candidates)] = (
+                    "list",
+                    i,
+                    "",
+                )
+            else:
+                _queue(i, stage.candidates)
+
+        while True:
+            winner = _decide()
+            if winner is not _PENDING:
+                return winner  # type: ignore[return-value]
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - (time.monotonic() - start)
+                if timeout <= 0:
+                    return _best_so_far()
+            done, _ = wait(list(futures), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                return _best_so_far()
+            for fut in done:
+                kind, i, u = futures.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception:
+                    result = [] if kind == "list" else False
+                if kind == "list":
+                    _queue(i, list(result or []))
+                    continue
+                ok = bool(result)
+                verdicts[(id(stages[i].verify), u)] = ok
+                if on_result is not None:
+                    on_result(stages[i], u, ok)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,130 @@
+import threading
+from typing import Any, Final
+
+import diskcache
+
+__all__ = ["DiscoveryCache", "configure_discovery_cache", "get_discovery_cache"]
+
+DEFAULT_TTL_SECONDS: Final[int] = 7 * 24 * 3600
+DEFAULT_NEGATIVE_TTL_SECONDS: Final[int] = 24 * 3600
+DEFAULT_SIZE_LIMIT_MB: Final[int] = 64
+
+
+class DiscoveryCache:
+    """
+    Persistent per-host memory of where a site's privacy policy lives.
+
+    Besides the resolved policy URL it remembers what did not work: common
+    paths that failed verification and hosts whose sitemaps offered no
+    candidates. Resolutions expire after `ttl_seconds`, failures after the
+    (usually shorter) `negative_ttl_seconds`; 0 means never. Every value is
+    its own diskcache key (tagged with the host), so concurrent probes can
+    record without locking.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+        size_limit_mb: int = DEFAULT_SIZE_LIMIT_MB,
+    ) -> None:
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit_mb * 1024 * 1024,
+            eviction_policy="least-recently-stored",
+        )
+        self._ttl = ttl_seconds if ttl_seconds > 0 else None
+        self._negative_ttl = negative_ttl_seconds if negative_ttl_seconds > 0 else None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "skipped_probes": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += n
+
+    @staticmethod
+    def _host(host: str) -> str:
+        return host.strip().lower()
+
+    def resolved(self, host: str) -> str | None:
+        """The policy URL last resolved for `host`, or None."""
+        url = self._cache.get(("policy", self._host(host)))
+        self._count("hits" if isinstance(url, str) else "misses")
+        return url if isinstance(url, str) else None
+
+    def store_resolved(self, host: str, url: str) -> None:
+        h = self._host(host)
+        self._cache.set(("policy", h), url, expire=self._ttl, tag=h)
+
+    def forget(self, host: str) -> None:
+        """
+        Drop everything known about `host` after its resolution stopped
+        verifying: the site changed, so its old failures may be stale too.
+        """
+        self._cache.evict(self._host(host))
+        self._count("stale")
+
+    def failed_paths(self, host: str, paths: list[str]) -> set[str]:
+        """Which of `paths` recently failed verification on `host`."""
+        h = self._host(host)
+        failed = {p for p in paths if self._cache.get(("path", h, p)) is False}
+        self._count("skipped_probes", len(failed))
+        return failed
+
+    def record_path(self, host: str, path: str, ok: bool) -> None:
+        h = self._host(host)
+        if ok:
+            self._cache.delete(("path", h, path))
+        else:
+            self._cache.set(("path", h, path), False, expire=self._negative_ttl, tag=h)
+
+    def no_sitemap(self, host: str) -> bool:
+        """True when `host` recently had no sitemap candidates."""
+        empty = self._cache.get(("sitemap", self._host(host))) is False
+        if empty:
+            self._count("skipped_probes")
+        return empty
+
+    def record_sitemap(self, host: str, found: bool) -> None:
+        h = self._host(host)
+        if found:
+            self._cache.delete(("sitemap", h))
+        else:
+            self._cache.set(("sitemap", h), False, expire=self._negative_ttl, tag=h)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        self._cache.close()
+
+
+_lock = threading.Lock()
+_discovery_cache: DiscoveryCache | None = None
+
+
+def configure_discovery_cache(
+    directory: str | None,
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    negative_ttl_seconds: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+) -> DiscoveryCache | None:
+    """Install (or with None, disable) the process-wide discovery cache."""
+    global _discovery_cache
+    cache = (
+        DiscoveryCache(directory, ttl_seconds, negative_ttl_seconds)
+        if directory
+        else None
+    )
+    with _lock:
+        old, _discovery_cache = _discovery_cache, cache
+    if old is not None:
+        old.close()
+    return cache
+
+
+def get_discovery_cache() -> DiscoveryCache | None:
+    """Return the process-wide discovery cache, or None when it is off."""
+    with _lock:
+        return _discovery_cache
@@ -0,0 +1,216 @@
+import functools
+import importlib.util
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Final
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+__all__ = [
+    "STRATEGIES",
+    "Page",
+    "configure_extractor",
+    "extract_page",
+    "register_strategy",
+]
+
+# Text under these elements is never visible page text.
+_VISIBLE_TEXT: Final = etree.XPath(
+    "//body//text()[not(ancestor::script or ancestor::style"
+    " or ancestor::noscript or ancestor::template)]"
+)
+_ANCHORS: Final = etree.XPath("//a[@href]")
+_META_CHARSET: Final[re.Pattern[bytes]] = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE
+)
+_HEADER_CHARSET: Final[re.Pattern[str]] = re.compile(
+    r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE
+)
+
+Strategy = Callable[[Any], str]
+
+
+@dataclass(frozen=True)
+class Page:
+    """
+    Everything the pipeline reads from one HTML document.
+
+    `text` is the main text picked by the extraction strategy, `body_text`
+    every visible text node of the body. `links` holds (absolute URL, anchor
+    text) pairs, limited to those accepted by the link filter when one is
+    given. `signals` are cheap quality hints: character counts, the number
+    of anchors and the share of body text that sits inside links.
+    """
+
+    url: str
+    title: str
+    text: str
+    body_text: str
+    strategy: str
+    links: tuple[tuple[str, str], ...] = ()
+    signals: dict[str, Any] = field(default_factory=dict)
+
+
+def _lxml_text(tree: Any) -> str:
+    return "\n".join(s for s in (t.strip() for t in _VISIBLE_TEXT(tree)) if s)
+
+
+def _trafilatura_text(tree: Any) -> str:
+    # trafilatura takes the parsed tree, so it neither re-downloads nor
+    # re-parses; it only runs after our own read-only passes over the tree.
+    import trafilatura
+
+    text = trafilatura.extract(tree, include_formatting=False)
+    return (text or "").strip()
+
+
+STRATEGIES: dict[str, Strategy] = {
+    "lxml": _lxml_text,
+    "trafilatura": _trafilatura_text,
+}
+
+_lock = threading.Lock()
+_default = "auto"
+
+
+def register_strategy(name: str, fn: Strategy) -> None:
+    """Make `fn` (parsed lxml tree -> main text) available as strategy `name`."""
+    with _lock:
+        STRATEGIES[name] = fn
+
+
+def configure_extractor(strategy: str = "auto") -> str:
+    """
+    Pick the strategy `extract_page` uses when none is passed.
+
+    Args:
+        strategy: A STRATEGIES name, or `auto` for trafilatura when it is
+            installed and plain lxml otherwise.
+
+    Returns:
+        The resolved strategy name.
+    """
+    global _default
+    name = _resolve(strategy)
+    with _lock:
+        _default = name
+    return name
+
+
+@functools.cache
+def _auto() -> str:
+    return "trafilatura" if importlib.util.find_spec("trafilatura") else "lxml"
+
+
+def _resolve(strategy: str) -> str:
+    if strategy == "auto":
+        return _auto()
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown extraction strategy: {strategy}")
+    return strategy
+
+
+def _encoding(content: bytes, content_type: str | None) -> str:
+    """Charset from the Content-Type header, then <meta>, then UTF-8."""
+    m = _HEADER_CHARSET.search(content_type or "")
+    if m:
+        return m.group(1)
+    meta = _META_CHARSET.search(content[:4096])
+    if meta:
+        return meta.group(1).decode("ascii", "replace")
+    return "utf-8"
+
+
+def _parse(content: bytes, content_type: str | None) -> Any:
+    encoding = _encoding(content, content_type)
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        return lxml.html.document_fromstring(content, parser=parser)
+    except LookupError:
+        # An unknown charset name; fall back to the common case.
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        return lxml.html.document_fromstring(content, parser=parser)
+
+
+def extract_page(
+    content: bytes,
+    url: str,
+    content_type: str | None = None,
+    *,
+    link_filter: Callable[[str], bool] | None = None,
+    strategy: str | None = None,
+) -> Page | None:
+    """
+    Parse an HTML document once and read text, links and signals from it.
+
+    Args:
+        content: Raw response body, exactly as downloaded.
+        url: Final URL of the document; relative links resolve against it
+            (or against `<base href>` when the page sets one).
+        content_type: Content-Type header, used to pick the charset.
+        link_filter: Keeps a link when it accepts "anchor text + href".
+        strategy: Main-text strategy; defaults to `configure_extractor()`.
+            A failing strategy falls back to the lxml body text.
+
+    Returns:
+        The extracted page, or None when the bytes are not parseable HTML.
+    """
+    if not content or not content.strip():
+        return None
+    try:
+        tree = _parse(content, content_type)
+    except (etree.ParserError, ValueError):
+        return None
+
+    base = url
+    base_href = tree.find(".//base[@href]")
+    if base_href is not None:
+        base = urljoin(url, base_href.get("href", "").strip())
+
+    links: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    anchors = 0
+    link_chars = 0
+    for a in _ANCHORS(tree):
+        href = (a.get("href") or "").strip()
+        if not href:
+            continue
+        anchors += 1
+        label = " ".join(a.itertext()).strip()
+        link_chars += len(label)
+        if link_filter is not None and not link_filter(label + " " + href):
+            continue
+        absolute = urljoin(base, href)
+        if absolute not in seen:
+            seen.add(absolute)
+            links.append((absolute, label))
+
+    body_text = _lxml_text(tree)
+    title = (tree.findtext(".//title") or "").strip()
+
+    name = _resolve(strategy or _default)
+    text = body_text
+    if name != "lxml":
+        try:
+            text = STRATEGIES[name](tree)
+        except Exception:
+            name = "lxml"
+
+    return Page(
+        url=url,
+        title=title,
+        text=text,
+        body_text=body_text,
+        strategy=name,
+        links=tuple(links),
+        signals={
+            "text_chars": len(text),
+            "body_chars": len(body_text),
+            "anchors": anchors,
+            "link_density": round(link_chars / len(body_text), 3) if body_text else 0.0,
+        },
+    )
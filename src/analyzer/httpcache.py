@@ -0,0 +1,253 @@
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Final
+
+import diskcache
+import requests
+from requests.structures import CaseInsensitiveDict
+
+__all__ = [
+    "HttpCache",
+    "configure_http_cache",
+    "get_http_cache",
+    "parse_max_age",
+]
+
+DEFAULT_SIZE_LIMIT_MB: Final[int] = 512
+# Bodies larger than this are streamed through without being stored.
+MAX_BODY_BYTES: Final[int] = 16 * 1024 * 1024
+_KEPT_HEADERS: Final[tuple[str, ...]] = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+)
+
+
+def parse_max_age(cache_control: str) -> int | None:
+    """
+    Return how long a response may be reused without revalidation.
+
+    `no-store` yields None (do not cache), `no-cache` yields 0 (always
+    revalidate); otherwise `max-age` seconds, defaulting to 0.
+    """
+    max_age = 0
+    for part in cache_control.lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name == "no-store":
+            return None
+        if name == "no-cache":
+            return 0
+        if name == "max-age":
+            try:
+                max_age = max(0, int(value.strip().strip('"')))
+            except ValueError:
+                max_age = 0
+    return max_age
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _to_response(entry: dict[str, Any]) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.url = entry["url"]
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.encoding = entry["encoding"]
+    r._content = entry["body"]
+    return r
+
+
+class HttpCache:
+    """
+    Persistent HTTP cache of response bodies and their validators.
+
+    Cached URLs are revalidated with If-None-Match / If-Modified-Since and a
+    304 is answered from disk. With `fresh_ok=True` (robots.txt, sitemaps) an
+    entry younger than its Cache-Control max-age is served without any
+    request. Only 200 responses carrying a validator or a max-age are kept.
+    """
+
+    def __init__(
+        self, directory: str, size_limit_mb: int = DEFAULT_SIZE_LIMIT_MB
+    ) -> None:
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit_mb * 1024 * 1024,
+            eviction_policy="least-recently-stored",
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "fresh": 0,
+            "revalidated": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, n in deltas.items():
+                self._stats[name] += n
+
+    def _lookup(self, url: str) -> dict[str, Any] | None:
+        entry = self._cache.get(_key(url))
+        return entry if isinstance(entry, dict) else None
+
+    def _fresh(self, entry: dict[str, Any]) -> bool:
+        age = time.time() - float(entry["stored"])
+        return age < float(entry["max_age"])
+
+    @staticmethod
+    def _conditional(entry: dict[str, Any] | None) -> dict[str, str]:
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def _store(self, url: str, r: requests.Response, body: bytes) -> None:
+        max_age = parse_max_age(r.headers.get("Cache-Control", ""))
+        has_validator = bool(r.headers.get("ETag") or r.headers.get("Last-Modified"))
+        if max_age is None or not (has_validator or max_age):
+            self._cache.delete(_key(url))
+            return
+        self._cache.set(
+            _key(url),
+            {
+                "url": r.url or url,
+                "headers": {h: r.headers[h] for h in _KEPT_HEADERS if h in r.headers},
+                "encoding": r.encoding,
+                "body": body,
+                "stored": time.time(),
+                "max_age": max_age,
+            },
+        )
+
+    def _refresh(self, url: str, entry: dict[str, Any], r: requests.Response) -> None:
+        for h in _KEPT_HEADERS:
+            if h in r.headers and h != "Content-Type":
+                entry["headers"][h] = r.headers[h]
+        if "Cache-Control" in r.headers:
+            entry["max_age"] = parse_max_age(r.headers["Cache-Control"]) or 0
+        entry["stored"] = time.time()
+        self._cache.set(_key(url), entry)
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        timeout: float = 15,
+        fresh_ok: bool = False,
+    ) -> requests.Response:
+        """GET `url` through the cache; may raise like `session.get`."""
+        self._count(requests=1)
+        entry = self._lookup(url)
+        if entry is not None and fresh_ok and self._fresh(entry):
+            self._count(fresh=1, bytes_saved=len(entry["body"]))
+            return _to_response(entry)
+        r = session.get(
+            url,
+            headers=self._conditional(entry),
+            timeout=timeout,
+            allow_redirects=True,
+        )
+        if r.status_code == 304 and entry is not None:
+            self._refresh(url, entry, r)
+            self._count(revalidated=1, bytes_saved=len(entry["body"]))
+            return _to_response(entry)
+        self._count(bytes_downloaded=len(r.content))
+        if r.status_code == 200 and len(r.content) <= MAX_BODY_BYTES:
+            self._store(url, r, r.content)
+        return r
+
+    def stream(
+        self,
+        session: requests.Session,
+        url: str,
+        timeout: float = 15,
+        chunk_size: int = 64 * 1024,
+        fresh_ok: bool = True,
+    ) -> Iterator[bytes]:
+        """
+        Yield the body of `url` in chunks, served from disk when unchanged.
+
+        A downloaded body is stored only if it was read to the end and is
+        smaller than MAX_BODY_BYTES.
+        """
+        self._count(requests=1)
+        entry = self._lookup(url)
+        if entry is not None and fresh_ok and self._fresh(entry):
+            self._count(fresh=1, bytes_saved=len(entry["body"]))
+            body = entry["body"]
+            for i in range(0, len(body), chunk_size):
+                yield body[i : i + chunk_size]
+            return
+        with session.get(
+            url,
+            headers=self._conditional(entry),
+            timeout=timeout,
+            stream=True,
+            allow_redirects=True,
+        ) as r:
+            if r.status_code == 304 and entry is not None:
+                self._refresh(url, entry, r)
+                self._count(revalidated=1, bytes_saved=len(entry["body"]))
+                body = entry["body"]
+                for i in range(0, len(body), chunk_size):
+                    yield body[i : i + chunk_size]
+                return
+            if r.status_code >= 400:
+                return
+            parts: list[bytes] | None = [] if r.status_code == 200 else None
+            size = 0
+            for part in r.iter_content(chunk_size=chunk_size):
+                size += len(part)
+                self._count(bytes_downloaded=len(part))
+                if parts is not None:
+                    parts.append(part)
+                    if size > MAX_BODY_BYTES:
+                        parts = None
+                yield part
+            if parts is not None:
+                self._store(url, r, b"".join(parts))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+        hits = stats["fresh"] + stats["revalidated"]
+        stats["hit_rate"] = (
+            round(hits / stats["requests"], 3) if stats["requests"] else 0.0
+        )
+        return stats
+
+    def close(self) -> None:
+        self._cache.close()
+
+
+_lock = threading.Lock()
+_http_cache: HttpCache | None = None
+
+
+def configure_http_cache(directory: str | None) -> HttpCache | None:
+    """Install (or with None, disable) the process-wide HTTP cache."""
+    global _http_cache
+    cache = HttpCache(directory) if directory else None
+    with _lock:
+        old, _http_cache = _http_cache, cache
+    if old is not None:
+        old.close()
+    return cache
+
+
+def get_http_cache() -> HttpCache | None:
+    """Return the process-wide HTTP cache, or None when caching is off."""
+    with _lock:
+        return _http_cache
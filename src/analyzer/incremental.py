@@ -0,0 +1,167 @@
+import difflib
+import hashlib
+import time
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Final
+
+import diskcache
+
+__all__ = [
+    "IncrementalPlan",
+    "SnapshotStore",
+    "locate_chunks",
+    "plan_incremental",
+]
+
+SNAPSHOT_VERSION: Final[int] = 1
+_MAX_SECTIONS: Final[int] = 20
+_EXCERPT_CHARS: Final[int] = 200
+
+Span = tuple[int, int]
+
+
+def locate_chunks(text: str, chunks: list[str]) -> list[Span | None]:
+    """
+    Find the character span of each chunk in `text`, in order.
+
+    Splitter output is a sequence of (possibly overlapping) substrings, so
+    each search starts just after the previous chunk's start. Chunks that
+    are not verbatim substrings (e.g. a merged tail) map to None.
+    """
+    spans: list[Span | None] = []
+    cursor = 0
+    for chunk in chunks:
+        pos = text.find(chunk, cursor)
+        if pos < 0 or not chunk:
+            spans.append(None)
+            continue
+        spans.append((pos, pos + len(chunk)))
+        cursor = pos + 1
+    return spans
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    How to turn the previous chunking into one for the new text.
+
+    `kept` maps previous chunk numbers to their span in the new text; `dirty`
+    lists new-text regions that must be re-chunked and re-scored.
+    """
+
+    kept: dict[int, Span] = field(default_factory=dict)
+    dirty: list[Span] = field(default_factory=list)
+    sections: list[dict[str, Any]] = field(default_factory=list)
+    changed_lines: int = 0
+
+
+def _line_offsets(lines: list[str]) -> list[int]:
+    return [0, *accumulate(len(line) for line in lines)]
+
+
+def _excerpt(lines: list[str]) -> str:
+    text = " ".join("".join(lines).split())
+    return text if len(text) <= _EXCERPT_CHARS else text[: _EXCERPT_CHARS - 1] + "…"
+
+
+def plan_incremental(
+    old_text: str, old_spans: list[Span | None], new_text: str
+) -> IncrementalPlan:
+    """
+    Diff `old_text` against `new_text` line by line and plan a partial rescore.
+
+    A previous chunk is kept when its whole span lies in one unchanged run of
+    lines; everything in the new text not covered by a kept chunk is dirty.
+    Whitespace-only gaps are ignored.
+    """
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    old_off, new_off = _line_offsets(old_lines), _line_offsets(new_lines)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    plan = IncrementalPlan()
+    equal: list[tuple[int, int, int]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            equal.append((old_off[i1], old_off[i2], new_off[j1] - old_off[i1]))
+            continue
+        plan.changed_lines += max(i2 - i1, j2 - j1)
+        if len(plan.sections) < _MAX_SECTIONS:
+            plan.sections.append(
+                {
+                    "change": tag,
+                    "old_lines": [i1 + 1, i2],
+                    "new_lines": [j1 + 1, j2],
+                    "excerpt": _excerpt(
+                        old_lines[i1:i2] if tag == "delete" else new_lines[j1:j2]
+                    ),
+                }
+            )
+
+    for idx, span in enumerate(old_spans):
+        if span is None:
+            continue
+        start, end = span
+        for lo, hi, shift in equal:
+            if lo <= start and end <= hi:
+                plan.kept[idx] = (start + shift, end + shift)
+                break
+
+    cursor = 0
+    for start, end in sorted(plan.kept.values()):
+        if start > cursor and new_text[cursor:start].strip():
+            plan.dirty.append((cursor, start))
+        cursor = max(cursor, end)
+    if new_text[cursor:].strip():
+        plan.dirty.append((cursor, len(new_text)))
+    return plan
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Previous extracted text, chunk spans and chunk results per resolved URL.
+
+    A snapshot is only returned when it was written under the same `scope`
+    (model, prompts and chunking settings); otherwise the caller starts over.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, url: str, scope: str) -> dict[str, Any] | None:
+        snap = self._cache.get(_key(url))
+        if (
+            not isinstance(snap, dict)
+            or snap.get("version") != SNAPSHOT_VERSION
+            or snap.get("scope") != scope
+        ):
+            return None
+        return snap
+
+    def put(
+        self,
+        url: str,
+        scope: str,
+        text: str,
+        spans: list[Span | None],
+        results: list[dict[str, Any] | None],
+    ) -> None:
+        self._cache.set(
+            _key(url),
+            {
+                "version": SNAPSHOT_VERSION,
+                "scope": scope,
+                "text": text,
+                "spans": spans,
+                "results": results,
+                "updated": time.time(),
+            },
+        )
+
+    def close(self) -> None:
+        self._cache.close()
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+__all__ = ["FetchMemo"]
+
+
+class _Entry:
+    __slots__ = ("created", "response", "derived")
+
+    def __init__(self, response: Any) -> None:
+        self.created = time.monotonic()
+        self.response = response
+        self.derived: dict[str, Any] = {}
+
+
+class FetchMemo:
+    """
+    Run-scoped memo of downloaded pages and values extracted from them.
+
+    Responses are stored under their final URL (after redirects) and the
+    requested URL is remembered as an alias, so every helper that asks for
+    the same page shares one download. Failed fetches are memoized too.
+    Concurrent requests for the same URL wait for the first download instead
+    of starting their own. The memo is LRU-bounded and entries go stale after
+    `ttl_seconds` so a long-lived process does not serve old pages.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 600.0) -> None:
+        self._max = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._aliases: dict[str, str] = {}
+        self._inflight: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.downloads = 0
+        self.hits = 0
+
+    def _lookup(self, url: str) -> _Entry | None:
+        key = self._aliases.get(url, url)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created > self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, url: str, final_url: str, entry: _Entry) -> None:
+        self._entries[final_url] = entry
+        self._entries.move_to_end(final_url)
+        if final_url != url:
+            self._aliases[url] = final_url
+        while len(self._entries) > self._max:
+            old, _ = self._entries.popitem(last=False)
+            for alias in [a for a, k in self._aliases.items() if k == old]:
+                del self._aliases[alias]
+
+    def _entry(self, url: str, loader: Callable[[str], Any]) -> _Entry:
+        with self._lock:
+            entry = self._lookup(url)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            gate = self._inflight.setdefault(url, threading.Lock())
+        with gate:
+            with self._lock:
+                entry = self._lookup(url)
+                if entry is not None:
+                    self.hits += 1
+                    return entry
+            response = loader(url)
+            final_url = getattr(response, "url", None) or url
+            entry = _Entry(response)
+            with self._lock:
+                self.downloads += 1
+                self._store(url, final_url, entry)
+                self._inflight.pop(url, None)
+            return entry
+
+    def fetch(self, url: str, loader: Callable[[str], Any]) -> Any:
+        """Return the memoized response for `url`, calling `loader` on a miss."""
+        return self._entry(url, loader).response
+
+    def derive(
+        self,
+        url: str,
+        kind: str,
+        loader: Callable[[str], Any],
+        compute: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Return a value computed once from the page at `url`.
+
+        Args:
+            url: Requested page URL.
+            kind: Name of the derived value, e.g. the extraction flavour.
+            loader: Downloads the page on a memo miss.
+            compute: Turns the memoized response into the derived value.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        entry = self._entry(url, loader)
+        with self._lock:
+            if kind in entry.derived:
+                self.hits += 1
+                return entry.derived[kind]
+        value = compute(entry.response)
+        with self._lock:
+            entry.derived.setdefault(kind, value)
+            return entry.derived[kind]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"downloads": self.downloads, "hits": self.hits}
@@ -0,0 +1,185 @@
+import re
+from collections import Counter
+from typing import Any, Final
+
+__all__ = ["PRIVACY_TERMS", "prefilter_text", "relevance"]
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+_SENTENCE_END = re.compile(r"[.!?;:](\s|$)")
+_COOKIE_ROW = re.compile(
+    r"\b(\d+\s*(second|minute|hour|day|week|month|year)s?|session|persistent"
+    r"|http\s*cookie|pixel|first[- ]party|third[- ]party|_ga\w*|_gid|_fbp"
+    r"|[a-z0-9-]+\.[a-z]{2,}(/\S*)?)\b",
+    re.IGNORECASE,
+)
+
+# Stems matched against the start of each lowercase word.
+PRIVACY_TERMS: Final[tuple[str, ...]] = (
+    "personal", "data", "information", "privacy", "collect", "process",
+    "share", "sharing", "disclos", "third", "partner", "processor", "controller",
+    "retain", "retention", "delet", "erase", "right", "access", "rectif",
+    "portab", "object", "consent", "withdraw", "opt", "cookie", "track",
+    "advertis", "profil", "secur", "breach", "encrypt", "transfer", "child",
+    "minor", "sensitive", "biometric", "health", "location", "gdpr", "ccpa",
+    "cpra", "lgpd", "law", "legal", "legitimate", "purpose", "complain",
+    "supervisory", "authority", "officer", "dpo", "contact", "request",
+    "sell", "sale", "store", "storage", "account", "email", "identif",
+    "notice", "updat", "effective", "change",
+)  # fmt: skip
+
+_MIN_KEEP_CHARS: Final[int] = 400
+_REPEAT_MAX_CHARS: Final[int] = 120
+_REPEAT_MIN_COUNT: Final[int] = 3
+
+
+def _norm(line: str) -> str:
+    return " ".join(line.split()).lower()
+
+
+def _is_term(word: str) -> bool:
+    return word.startswith(PRIVACY_TERMS)
+
+
+def relevance(block: str) -> float:
+    """
+    Privacy relevance of a text block in [0, 1] from local lexical features.
+
+    Combines the share of privacy vocabulary (saturating at 10% of words)
+    with how prose-like the block is (lines of 8+ words ending a sentence).
+    """
+    words = _WORD.findall(block.lower())
+    if not words:
+        return 0.0
+    density = min(1.0, sum(map(_is_term, words)) / len(words) * 10)
+    lines = [ln for ln in block.splitlines() if ln.strip()]
+    prose = sum(
+        1 for ln in lines if len(ln.split()) >= 8 and _SENTENCE_END.search(ln)
+    ) / max(1, len(lines))
+    return round(0.6 * density + 0.4 * prose, 3)
+
+
+def _is_fragment(line: str) -> bool:
+    return len(line.split()) <= 6 and not _SENTENCE_END.search(line)
+
+
+def _blocks(lines: list[str]) -> list[list[int]]:
+    # Blank lines separate blocks when the extractor produced them. Otherwise
+    # (e.g. get_text("\n") on tight markup) runs of short fragments such as
+    # menus or table cells form one block, and a fragment right before prose
+    # is treated as a heading that starts a section running to the next
+    # fragment. Blocks are returned as line numbers so the caller can keep
+    # the original layout.
+    if any(not ln.strip() for ln in lines):
+        blocks: list[list[int]] = []
+        current: list[int] = []
+        for i, ln in enumerate(lines):
+            if ln.strip():
+                current.append(i)
+            elif current:
+                blocks.append(current)
+                current = []
+        if current:
+            blocks.append(current)
+        return blocks
+
+    frag = [_is_fragment(ln) for ln in lines]
+    heading = [f and i + 1 < len(lines) and not frag[i + 1] for i, f in enumerate(frag)]
+    blocks = []
+    for i in range(len(lines)):
+        if blocks and not heading[i] and (frag[i - 1] or not frag[i]):
+            blocks[-1].append(i)
+        else:
+            blocks.append([i])
+    return blocks
+
+
+def _classify(block: list[str], min_relevance: float) -> str | None:
+    text = "\n".join(block)
+    words = _WORD.findall(text.lower())
+    n_lines = len(block)
+    short = sum(1 for ln in block if len(ln.split()) <= 6) / n_lines
+    has_sentence = any(_SENTENCE_END.search(ln) for ln in block)
+    cookie_hits = sum(1 for ln in block if _COOKIE_ROW.search(ln))
+    if n_lines >= 4 and short >= 0.7 and cookie_hits >= n_lines / 3:
+        return "cookie_table"
+    if not any(map(_is_term, words)) and not has_sentence:
+        return "navigation"
+    # Whole sentences are never dropped for their vocabulary alone: short
+    # policy statements ("We keep logs for 30 days.") score low but matter.
+    if not has_sentence and relevance(text) < min_relevance:
+        return "low_relevance"
+    return None
+
+
+def prefilter_text(
+    text: str, min_relevance: float = 0.15
+) -> tuple[str, dict[str, Any]]:
+    """
+    Drop boilerplate and low-relevance blocks before chunking.
+
+    Short lines repeated three or more times keep only their first
+    occurrence. The remaining blocks (paragraphs, or heading sections in
+    text without blank lines) are classified as navigation, cookie tables or
+    low relevance (`relevance` below `min_relevance`, only for blocks with no
+    complete sentence) and dropped; a one-line heading directly followed by a
+    kept block is always kept. If less than 400 characters would survive, the
+    text is returned unchanged.
+
+    Returns:
+        The filtered text and a report of dropped characters per reason.
+    """
+    lines = text.splitlines()
+    counts = Counter(_norm(ln) for ln in lines if ln.strip())
+    seen: set[str] = set()
+    dropped: Counter[str] = Counter()
+    kept = [True] * len(lines)
+    for i, ln in enumerate(lines):
+        key = _norm(ln)
+        if (
+            key
+            and len(key) <= _REPEAT_MAX_CHARS
+            and counts[key] >= _REPEAT_MIN_COUNT
+            and key in seen
+        ):
+            dropped["repeated"] += len(ln) + 1
+            kept[i] = False
+            continue
+        seen.add(key)
+
+    index = [i for i, k in enumerate(kept) if k]
+    spans = [[index[j] for j in b] for b in _blocks([lines[i] for i in index])]
+    blocks = [[lines[i] for i in span] for span in spans]
+    verdicts = [_classify(b, min_relevance) for b in blocks]
+    for i in range(len(blocks) - 1):
+        if (
+            verdicts[i] is not None
+            and len(blocks[i]) == 1
+            and len(blocks[i][0].split()) <= 12
+            and verdicts[i + 1] is None
+        ):
+            verdicts[i] = None
+
+    for block, span, verdict in zip(blocks, spans, verdicts):
+        if verdict is not None:
+            dropped[verdict] += sum(len(ln) + 1 for ln in block)
+            for i in span:
+                kept[i] = False
+
+    # Surviving lines keep their original separators; the blank lines left
+    # around a dropped block collapse into one.
+    out: list[str] = []
+    for ln, k in zip(lines, kept):
+        if not k:
+            continue
+        if ln.strip() or (out and out[-1].strip()):
+            out.append(ln)
+    while out and not out[-1].strip():
+        out.pop()
+    filtered = "\n".join(out)
+
+    report: dict[str, Any] = {"chars_in": len(text), "chars_out": len(filtered)}
+    if len(filtered.strip()) < _MIN_KEEP_CHARS:
+        report.update(chars_out=len(text), skipped="too_little_left")
+        return text, report
+    report["dropped_chars"] = dict(dropped)
+    return filtered, report
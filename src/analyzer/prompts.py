@@ -1,14 +1,23 @@
 from typing import Final
 from textwrap import dedent
 
-__all__ = ["SYSTEM_SCORER", "build_user_prompt"]
+__all__ = [
+    "PACKED_SYSTEM_SCORER",
+    "PROMPT_VERSION",
+    "SYSTEM_SCORER",
+    "build_packed_user_prompt",
+    "build_user_prompt",
+]
+
+# Bump whenever the scoring template changes so cached chunk results are not reused.
+PROMPT_VERSION: Final[str] = "1"
 
 SYSTEM_SCORER: Final[str] = (
     "You must return one valid JSON object that strictly matches the user's schema. "
     "Do not include any text outside JSON. Do not add extra fields."
 )
 
-_USER_SCORING_JSON: Final[str] = """
+_SCORING_GUIDE: Final[str] = """
 Act as a senior global privacy/compliance auditor. Given a privacy policy excerpt,
 return ONE JSON object with category scores (0–10), concise rationales, red flags,
 and optional evidence quotes. Be jurisdiction-agnostic yet globally aware of widely
@@ -68,22 +77,58 @@ Red flags (reduce scores where present):
 - Unspecified third-party sharing; selling/sharing for targeted ads without clear choice/basis.
 - No actionable rights instructions or contacts.
 - Contradictory or misleading statements vs. described practices.
+"""
 
+_USER_SCORING_JSON: Final[str] = (
+    _SCORING_GUIDE
+    + """
 Return only one JSON object. No extra text. Excerpt:
 {chunk}
 """
+)
+
+# Packed mode keeps the whole schema in the system message so the long,
+# identical prefix comes first and can hit provider-side prompt caching.
+PACKED_SYSTEM_SCORER: Final[str] = (
+    "You must return one valid JSON object and no text outside JSON."
+    + _SCORING_GUIDE
+    + """
+The user message contains several excerpts, each wrapped in <excerpt id="N"> tags.
+Score every excerpt independently, as if it were the only one. Return ONE JSON
+object of the form {"results": [...]} holding exactly one object per excerpt, in
+the same order. Each object follows the schema above plus an integer "excerpt"
+field set to the excerpt id.
+"""
+)
 
 
-def build_user_prompt(text: str, max_len: int = 6000) -> str:
+def build_user_prompt(text: str, max_len: int | None = 6000) -> str:
     """
     Avoid str.format() because the schema contains many braces. Use a safe replace.
 
     Args:
         text: Text of the input.
-        max_len: Length of input.
+        max_len: Length of input; None keeps the whole text.
 
     Returns:
         Built user prompt.
     """
     chunk = text[:max_len] if text else ""
     return dedent(_USER_SCORING_JSON).replace("{chunk}", chunk)
+
+
+def build_packed_user_prompt(texts: list[str], max_len: int | None = 6000) -> str:
+    """
+    Wrap several excerpts for one packed scoring call.
+
+    Args:
+        texts: Excerpts, numbered from 1 in the prompt.
+        max_len: Length of each excerpt; None keeps the whole text.
+
+    Returns:
+        Built user prompt.
+    """
+    return "\n\n".join(
+        f'<excerpt id="{i}">\n{(text or "")[:max_len]}\n</excerpt>'
+        for i, text in enumerate(texts, 1)
+    )
@@ -0,0 +1,329 @@
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final, TypeVar
+
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from .tracing import span
+
+__all__ = [
+    "RETRY_STATUS",
+    "LLMCallFailed",
+    "LLMScheduler",
+    "RateLimitHeaders",
+    "configure_schedulers",
+    "get_scheduler",
+    "parse_duration",
+]
+
+T = TypeVar("T")
+
+# Statuses worth another attempt: timeouts, conflicts, throttling, server errors.
+RETRY_STATUS: Final[frozenset[int]] = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+_DURATION: Final[re.Pattern[str]] = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS: Final[dict[str, float]] = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Seconds in an OpenAI reset value ("20ms", "1.5s", "6m0s") or a number."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class RateLimitHeaders:
+    """The `x-ratelimit-*` and `retry-after` values of one response."""
+
+    limit_requests: int | None = None
+    remaining_requests: int | None = None
+    reset_requests: float | None = None
+    limit_tokens: int | None = None
+    remaining_tokens: int | None = None
+    reset_tokens: float | None = None
+    retry_after: float | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str] | None) -> "RateLimitHeaders":
+        if not headers:
+            return cls()
+        h = {k.lower(): v for k, v in headers.items()}
+        retry_after = parse_duration(h.get("retry-after"))
+        retry_ms = _int(h.get("retry-after-ms"))
+        if retry_ms is not None:
+            retry_after = retry_ms / 1000
+        return cls(
+            limit_requests=_int(h.get("x-ratelimit-limit-requests")),
+            remaining_requests=_int(h.get("x-ratelimit-remaining-requests")),
+            reset_requests=parse_duration(h.get("x-ratelimit-reset-requests")),
+            limit_tokens=_int(h.get("x-ratelimit-limit-tokens")),
+            remaining_tokens=_int(h.get("x-ratelimit-remaining-tokens")),
+            reset_tokens=parse_duration(h.get("x-ratelimit-reset-tokens")),
+            retry_after=retry_after,
+        )
+
+
+class LLMCallFailed(Exception):
+    """An LLM call failed for good: not retryable, or out of attempts."""
+
+    def __init__(self, message: str, attempts: int) -> None:
+        super().__init__(message)
+        self.attempts = attempts
+
+
+def _status(exc: BaseException) -> int | None:
+    status = getattr(exc, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _headers(exc: BaseException) -> Mapping[str, str] | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    return headers if isinstance(headers, Mapping) else None
+
+
+def _retryable(exc: BaseException) -> bool:
+    status = _status(exc)
+    if status is not None:
+        # An exhausted quota is a 429 too, but waiting does not refill it.
+        quota = getattr(exc, "code", None) == "insufficient_quota"
+        return status in RETRY_STATUS and not quota
+    # openai raises APIConnectionError / APITimeoutError without a status.
+    names = {c.__name__ for c in type(exc).__mro__}
+    return bool(names & {"APIConnectionError", "ConnectionError", "TimeoutError"})
+
+
+class LLMScheduler:
+    """
+    Admission control, AIMD concurrency and retries for calls to one endpoint.
+
+    Every call waits for a concurrency slot and for the request and token
+    budgets last reported in `x-ratelimit-*` headers. The concurrency limit
+    grows by about one per limit's worth of successes and halves (at most
+    once per backoff) when the server throttles. A 429 or `retry-after`
+    pauses every caller, not just the one that was refused, so a burst of
+    failures turns into one wait instead of a retry storm. Failed calls are
+    retried with jittered exponential backoff until `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        min_concurrency: int = 1,
+        max_attempts: int = 6,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._max = float(max(1, max_concurrency))
+        self._min = float(max(1, min(min_concurrency, max_concurrency)))
+        self._attempts = max(1, max_attempts)
+        self._backoff = wait_random_exponential(multiplier=backoff, max=max_backoff)
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self._limit = self._max
+        self._in_flight = 0
+        self._reserved_tokens = 0
+        self._pause_until = 0.0
+        self._cooldown_until = 0.0
+        self._requests_left: int | None = None
+        self._requests_reset = 0.0
+        self._tokens_left: int | None = None
+        self._tokens_reset = 0.0
+        self._stats = {"calls": 0, "retries": 0, "throttled": 0, "failed": 0}
+        self._waited = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        with self._cond:
+            return int(self._limit)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "concurrency_limit": int(self._limit),
+                "waited_s": round(self._waited, 3),
+            }
+
+    def _blocked_for(self, tokens: int, now: float) -> float:
+        """Seconds until a call needing `tokens` may start (0 = now)."""
+        if now < self._pause_until:
+            return self._pause_until - now
+        if self._requests_left is not None and now >= self._requests_reset:
+            self._requests_left = None
+        if self._tokens_left is not None and now >= self._tokens_reset:
+            self._tokens_left = None
+        if self._in_flight >= int(self._limit):
+            return -1.0  # woken by the next release
+        if (
+            self._requests_left is not None
+            and self._requests_left - self._in_flight <= 0
+        ):
+            return self._requests_reset - now
+        if (
+            self._tokens_left is not None
+            and self._tokens_left - self._reserved_tokens < tokens
+        ):
+            return self._tokens_reset - now
+        return 0.0
+
+    def _acquire(self, tokens: int) -> None:
+        start = self._clock()
+        with self._cond:
+            while True:
+                now = self._clock()
+                wait = self._blocked_for(tokens, now)
+                if wait == 0.0:
+                    break
+                if wait < 0:
+                    self._cond.wait()
+                else:
+                    # Sleep outside the lock so releases are not held up.
+                    self._cond.release()
+                    try:
+                        self._sleep(wait)
+                    finally:
+                        self._cond.acquire()
+            self._in_flight += 1
+            self._reserved_tokens += tokens
+            self._waited += self._clock() - start
+
+    def _release(self, tokens: int, limits: RateLimitHeaders, ok: bool) -> None:
+        now = self._clock()
+        with self._cond:
+            self._in_flight -= 1
+            self._reserved_tokens -= tokens
+            if limits.remaining_requests is not None:
+                self._requests_left = limits.remaining_requests
+                self._requests_reset = now + (limits.reset_requests or 1.0)
+            if limits.remaining_tokens is not None:
+                self._tokens_left = limits.remaining_tokens
+                self._tokens_reset = now + (limits.reset_tokens or 1.0)
+            if ok:
+                self._limit = min(self._max, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def _throttled(self, delay: float) -> None:
+        """Halve concurrency once per backoff and pause every caller."""
+        now = self._clock()
+        with self._cond:
+            self._stats["throttled"] += 1
+            if now >= self._cooldown_until:
+                busy = min(self._limit, float(self._in_flight + 1))
+                self._limit = max(self._min, busy / 2)
+                self._cooldown_until = now + max(delay, 1.0)
+            self._pause_until = max(self._pause_until, now + delay)
+
+    def _wait(self, state: RetryCallState) -> float:
+        delay = float(self._backoff(state))
+        exc = state.outcome.exception() if state.outcome else None
+        if exc is not None:
+            limits = RateLimitHeaders.from_headers(_headers(exc))
+            if limits.retry_after is not None:
+                delay = max(delay, limits.retry_after)
+            if _status(exc) == 429:
+                self._throttled(delay)
+        with self._cond:
+            self._stats["retries"] += 1
+        return delay
+
+    def call(
+        self,
+        fn: Callable[[], tuple[T, Mapping[str, str] | None]],
+        tokens: int = 0,
+    ) -> T:
+        """
+        Run `fn` under the scheduler and return its result.
+
+        Args:
+            fn: Makes one request and returns (result, response headers).
+            tokens: Tokens the request may use (prompt plus max output).
+
+        Raises:
+            LLMCallFailed: The error was not retryable or every attempt failed.
+        """
+
+        def _attempt() -> T:
+            self._acquire(tokens)
+            limits = RateLimitHeaders()
+            ok = False
+            try:
+                with span("llm.attempt", "llm") as info:
+                    try:
+                        result, headers = fn()
+                    except Exception as exc:
+                        info["status"] = _status(exc) or type(exc).__name__
+                        limits = RateLimitHeaders.from_headers(_headers(exc))
+                        raise
+                limits = RateLimitHeaders.from_headers(headers)
+                ok = True
+                return result
+            finally:
+                self._release(tokens, limits, ok)
+
+        with self._cond:
+            self._stats["calls"] += 1
+        retrying = Retrying(
+            stop=stop_after_attempt(self._attempts),
+            wait=self._wait,
+            retry=retry_if_exception(_retryable),
+            sleep=self._sleep,
+            reraise=True,
+        )
+        try:
+            return retrying(_attempt)
+        except Exception as exc:
+            with self._cond:
+                self._stats["failed"] += 1
+            attempts = retrying.statistics.get("attempt_number", 1)
+            raise LLMCallFailed(f"{type(exc).__name__}: {exc}", attempts) from exc
+
+
+_lock = threading.Lock()
+_options: dict[str, Any] = {}
+_schedulers: dict[str, LLMScheduler] = {}
+
+
+def configure_schedulers(**options: Any) -> None:
+    """Set LLMScheduler keyword arguments for schedulers created from now on."""
+    with _lock:
+        _options.clear()
+        _options.update(options)
+        _schedulers.clear()
+
+
+def get_scheduler(key: str) -> LLMScheduler:
+    """The process-wide scheduler for `key` (one per endpoint and model)."""
+    with _lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = LLMScheduler(**_options)
+        return scheduler
@@ -0,0 +1,281 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Final
+from urllib.parse import urlparse
+
+__all__ = ["AnalysisService", "Job", "ServiceBusy", "make_server"]
+
+Analyze = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+_MAX_BODY: Final[int] = 64 * 1024
+_PENDING: Final[frozenset[str]] = frozenset({"queued", "running"})
+
+
+class ServiceBusy(Exception):
+    """The job queue is full; the client should retry later."""
+
+
+@dataclass
+class Job:
+    """One submitted analysis and, once finished, its report or error."""
+
+    id: str
+    url: str
+    options: dict[str, Any]
+    status: str = "queued"  # queued | running | done | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+    def to_dict(self, with_result: bool = False) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "id": self.id,
+            "url": self.url,
+            "options": self.options,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            out["error"] = self.error
+        if with_result and self.result is not None:
+            out["result"] = self.result
+        return out
+
+
+class AnalysisService:
+    """
+    Job queue and bounded worker pool around one `analyze(url, options)`.
+
+    A URL submitted again (with the same options) while it is queued or
+    running joins the existing job instead of starting another analysis.
+    Finished jobs are kept for polling, oldest dropped beyond `keep`.
+    Everything `analyze` holds on to (HTTP session, LLM client, caches,
+    browser pool) stays warm between jobs.
+    """
+
+    def __init__(
+        self,
+        analyze: Analyze,
+        workers: int = 4,
+        max_queue: int = 256,
+        keep: int = 1000,
+        validate: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Args:
+            analyze: Runs one analysis and returns its report.
+            workers: Analyses running at once.
+            max_queue: Jobs waiting for a worker before submit() refuses.
+            keep: Finished jobs kept for status and result lookups.
+            validate: Checks and normalizes the options of a submission;
+                raises ValueError to reject it.
+        """
+        self._analyze = analyze
+        self._validate = validate
+        self._keep = max(1, keep)
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._inflight: dict[str, str] = {}
+        self._counts = {"submitted": 0, "deduplicated": 0, "done": 0, "failed": 0}
+        self._workers = [
+            threading.Thread(target=self._work, name=f"analysis-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._workers:
+            t.start()
+
+    def __enter__(self) -> "AnalysisService":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _key(url: str, options: dict[str, Any]) -> str:
+        return json.dumps([url, options], sort_keys=True)
+
+    def submit(
+        self, url: str, options: dict[str, Any] | None = None
+    ) -> tuple[Job, bool]:
+        """
+        Queue an analysis of `url`, or join the one already in flight.
+
+        Returns:
+            The job and whether it was an existing in-flight job.
+
+        Raises:
+            ValueError: `url` is not http(s) or the options were rejected.
+            ServiceBusy: The queue is full.
+        """
+        url = (url or "").strip()
+        if urlparse(url).scheme not in ("http", "https") or not urlparse(url).netloc:
+            raise ValueError(f"not an http(s) URL: {url!r}")
+        opts = dict(options or {})
+        if self._validate is not None:
+            opts = self._validate(opts)
+        key = self._key(url, opts)
+        with self._lock:
+            running = self._inflight.get(key)
+            if running is not None:
+                self._counts["deduplicated"] += 1
+                return self._jobs[running], True
+            job = Job(uuid.uuid4().hex, url, opts)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise ServiceBusy("job queue is full") from None
+            self._jobs[job.id] = job
+            self._inflight[key] = job.id
+            self._counts["submitted"] += 1
+            self._trim()
+            return job, False
+
+    def _trim(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status not in _PENDING]
+        for job in finished[: max(0, len(finished) - self._keep)]:
+            del self._jobs[job.id]
+
+    def job(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            by_status: dict[str, int] = {}
+            for j in self._jobs.values():
+                by_status[j.status] = by_status.get(j.status, 0) + 1
+            return {
+                **self._counts,
+                "workers": len(self._workers),
+                "queued": self._queue.qsize(),
+                "jobs": by_status,
+            }
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                job.status = "running"
+                job.started_at = time.time()
+            try:
+                result = self._analyze(job.url, job.options)
+                error = None
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+            with self._lock:
+                job.result, job.error = result, error
+                job.status = "done" if error is None else "failed"
+                job.finished_at = time.time()
+                self._counts[job.status] += 1
+                self._inflight.pop(self._key(job.url, job.options), None)
+                self._trim()
+
+    def close(self) -> None:
+        """Finish queued jobs and stop the workers."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for t in self._workers:
+            t.join()
+
+
+def _content_length(value: str | None) -> int:
+    # A negative length would make rfile.read() wait for EOF.
+    if value is None or not value.strip().isdecimal():
+        raise ValueError("missing or invalid Content-Length")
+    return int(value)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+        if parts == ["health"]:
+            self._send(200, {"status": "ok", **service.stats()})
+            return
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = service.job(parts[1])
+            if job is None:
+                self._send(404, {"error": "unknown job"})
+                return
+            if len(parts) == 2:
+                self._send(200, job.to_dict())
+                return
+            if parts[2] == "result":
+                pending = job.status in _PENDING
+                self._send(202 if pending else 200, job.to_dict(with_result=True))
+                return
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = _content_length(self.headers.get("Content-Length"))
+            if length > _MAX_BODY:
+                self._send(413, {"error": "request body too large"})
+                return
+            data = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(data, dict) or not isinstance(
+                data.get("options", {}), dict
+            ):
+                raise ValueError('expected {"url": ..., "options": {...}}')
+            job, joined = self.server.service.submit(
+                str(data.get("url", "")), data.get("options")
+            )
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        except ServiceBusy as e:
+            self._send(503, {"error": str(e)})
+            return
+        self._send(202, {**job.to_dict(), "deduplicated": joined})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: AnalysisService) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def make_server(
+    service: AnalysisService, host: str = "127.0.0.1", port: int = 8080
+) -> ThreadingHTTPServer:
+    """
+    HTTP front end for `service`; call `serve_forever()` on the result.
+
+    Endpoints: `POST /jobs` with `{"url": ..., "options": {...}}` (202, or
+    400/413/503), `GET /jobs/<id>` (status), `GET /jobs/<id>/result` (202 while
+    pending, 200 with the report once finished) and `GET /health`.
+    """
+    return _Server((host, port), service)
@@ -0,0 +1,75 @@
+import importlib.util
+import threading
+from typing import Final
+
+import requests
+from requests.adapters import HTTPAdapter
+
+__all__ = ["DEFAULT_HEADERS", "configure_session", "get_session"]
+
+
+def _accept_encoding() -> str:
+    # urllib3 only decodes brotli bodies when a brotli binding is importable.
+    for mod in ("brotli", "brotlicffi"):
+        if importlib.util.find_spec(mod) is not None:
+            return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+DEFAULT_HEADERS: Final[dict[str, str]] = {
+    "User-Agent": "PrivacyPolicyAnalyzer/0.2 (+https://example.org)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": _accept_encoding(),
+}
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def _build_session(
+    per_host: int, max_hosts: int, headers: dict[str, str] | None
+) -> requests.Session:
+    session = requests.Session()
+    session.headers.clear()
+    session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+    adapter = HTTPAdapter(
+        pool_connections=max_hosts, pool_maxsize=per_host, pool_block=True
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def configure_session(
+    per_host: int = 8,
+    max_hosts: int = 32,
+    headers: dict[str, str] | None = None,
+) -> requests.Session:
+    """
+    Build the process-wide keep-alive session used by every network helper.
+
+    Args:
+        per_host: Maximum pooled connections per host; extra requests wait.
+        max_hosts: Number of per-host connection pools kept alive.
+        headers: Extra default headers merged over DEFAULT_HEADERS.
+
+    Returns:
+        The newly installed session.
+    """
+    global _session
+    session = _build_session(per_host, max_hosts, headers)
+    with _lock:
+        old, _session = _session, session
+    if old is not None:
+        old.close()
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it with defaults on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _build_session(8, 32, None)
+        return _session
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+__all__ = ["SimilarMatch", "SimilarityIndex", "simhash"]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SHINGLE: Final[int] = 5
+_BITS: Final[int] = 64
+# 64 bits split into 5 bands: any two hashes within Hamming distance 4 share
+# at least one band exactly (pigeonhole), so one indexed lookup per band finds
+# every candidate without scanning the table.
+_BAND_WIDTHS: Final[tuple[int, ...]] = (13, 13, 13, 13, 12)
+MAX_DISTANCE: Final[int] = len(_BAND_WIDTHS) - 1
+MIN_WORDS: Final[int] = 40
+
+
+def _shingles(text: str) -> Counter[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) <= _SHINGLE:
+        return Counter([" ".join(words)]) if words else Counter()
+    return Counter(
+        " ".join(words[i : i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1)
+    )
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of `text` over 5-word shingles, weighted by frequency."""
+    acc = [0] * _BITS
+    for shingle, weight in _shingles(text).items():
+        h = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(_BITS):
+            acc[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit, v in enumerate(acc) if v > 0)
+
+
+def _bands(h: int) -> list[int]:
+    out, shift = [], 0
+    for width in _BAND_WIDTHS:
+        out.append(h >> shift & ((1 << width) - 1))
+        shift += width
+    return out
+
+
+def _to_signed(h: int) -> int:
+    return h - (1 << _BITS) if h >= 1 << (_BITS - 1) else h
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    """A stored chunk result close enough to reuse, and where it came from."""
+
+    result: dict[str, Any]
+    source_url: str
+    source_chunk: int
+    similarity: float
+
+
+class SimilarityIndex:
+    """
+    SQLite-backed SimHash index of already scored chunks.
+
+    Lookups are restricted to entries stored under the same `scope` (model
+    and prompt version) and return the closest entry whose similarity
+    (1 - Hamming distance / 64) is at least `threshold`. The threshold is
+    clamped so that at most `MAX_DISTANCE` bits may differ, which keeps every
+    lookup a handful of indexed band probes regardless of corpus size.
+    Chunks shorter than `MIN_WORDS` words are neither stored nor matched.
+    With `refresh=True` lookups always miss but new results are still added.
+    """
+
+    def __init__(
+        self, path: str | Path, threshold: float = 0.95, refresh: bool = False
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._refresh = refresh
+        self._max_distance = min(MAX_DISTANCE, int((1.0 - threshold) * _BITS))
+        cols = ", ".join(f"b{i} INTEGER" for i in range(len(_BAND_WIDTHS)))
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS chunks (id INTEGER PRIMARY KEY,"
+                f" scope TEXT, simhash INTEGER, {cols}, result TEXT,"
+                " source_url TEXT, source_chunk INTEGER, created REAL)"
+            )
+            for i in range(len(_BAND_WIDTHS)):
+                self._db.execute(
+                    f"CREATE INDEX IF NOT EXISTS chunks_b{i} ON chunks (b{i}, scope)"
+                )
+
+    def lookup(self, scope: str, text: str) -> SimilarMatch | None:
+        """Return the closest stored result for `text`, or None."""
+        if self._refresh or len(_WORD.findall(text)) < MIN_WORDS:
+            return None
+        h = simhash(text)
+        where = " OR ".join(
+            f"(b{i} = ? AND scope = ?)" for i in range(len(_BAND_WIDTHS))
+        )
+        params: list[Any] = []
+        for band in _bands(h):
+            params += [band, scope]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT simhash, result, source_url, source_chunk FROM chunks"
+                f" WHERE {where}",
+                params,
+            ).fetchall()
+        best: tuple[int, Any, str, int] | None = None
+        for stored, result, url, idx in rows:
+            dist = ((stored % (1 << _BITS)) ^ h).bit_count()
+            if dist <= self._max_distance and (best is None or dist < best[0]):
+                best = (dist, result, url, idx)
+        if best is None:
+            return None
+        dist, result, url, idx = best
+        return SimilarMatch(
+            result=json.loads(result),
+            source_url=url,
+            source_chunk=idx,
+            similarity=round(1.0 - dist / _BITS, 4),
+        )
+
+    def add(
+        self, scope: str, text: str, result: dict[str, Any], source_url: str, chunk: int
+    ) -> None:
+        """Store a scored chunk so later near-duplicates can reuse it."""
+        if len(_WORD.findall(text)) < MIN_WORDS:
+            return
+        h = simhash(text)
+        cols = ", ".join(f"b{i}" for i in range(len(_BAND_WIDTHS)))
+        marks = ", ".join("?" * (len(_BAND_WIDTHS) + 6))
+        with self._lock, self._db:
+            self._db.execute(
+                f"INSERT INTO chunks (scope, simhash, {cols}, result, source_url,"
+                f" source_chunk, created) VALUES ({marks})",
+                [
+                    scope,
+                    _to_signed(h),
+                    *_bands(h),
+                    json.dumps(result, ensure_ascii=False),
+                    source_url,
+                    chunk,
+                    time.time(),
+                ],
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
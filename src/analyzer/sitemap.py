@@ -0,0 +1,157 @@
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Final
+
+from .tracing import bind
+
+__all__ = ["crawl_sitemap", "iter_sitemap_locs"]
+
+_GZIP_MAGIC: Final[bytes] = b"\x1f\x8b"
+_MAX_INFLATE: Final[int] = 1 << 20
+_CHILD_HINTS: Final[tuple[str, ...]] = ("page", "legal", "policy", "privacy", "static")
+
+StreamFetcher = Callable[[str], Iterable[bytes]]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_sitemap_locs(chunks: Iterable[bytes]) -> Iterator[tuple[str, str]]:
+    """
+    Incrementally parse a (possibly gzipped) sitemap from raw byte chunks.
+
+    Yields `("sitemap", loc)` for sitemap-index entries and `("url", loc)` for
+    urlset entries as soon as each `<loc>` closes. Gzip is detected from the
+    magic bytes, inflated in bounded slices, and parsed elements are dropped
+    right away, so memory does not grow with the document size. Parsing stops
+    quietly on malformed input.
+    """
+    parser: ET.XMLPullParser[Any]
+    parser = ET.XMLPullParser(events=("start", "end"))
+    inflater: zlib._Decompress | None = None
+    root: ET.Element | None = None
+    kind = "url"
+    first = True
+    for raw in chunks:
+        if not raw:
+            continue
+        if first:
+            first = False
+            if raw[:2] == _GZIP_MAGIC:
+                inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        pending = raw
+        while pending:
+            if inflater is None:
+                data, pending = pending, b""
+            else:
+                try:
+                    data = inflater.decompress(pending, _MAX_INFLATE)
+                except zlib.error:
+                    return
+                pending = inflater.unconsumed_tail
+            try:
+                parser.feed(data)
+                for ev in parser.read_events():
+                    event, el = ev[0], ev[-1]
+                    if not isinstance(el, ET.Element):
+                        continue
+                    if event == "start":
+                        if root is None:
+                            root = el
+                            if _local(el.tag) == "sitemapindex":
+                                kind = "sitemap"
+                        continue
+                    name = _local(el.tag)
+                    if name == "loc":
+                        loc = (el.text or "").strip()
+                        if loc:
+                            yield kind, loc
+                    elif name in ("url", "sitemap") and root is not None:
+                        root.clear()
+            except ET.ParseError:
+                return
+
+
+def crawl_sitemap(
+    url: str,
+    fetch: StreamFetcher,
+    match: Callable[[str], bool],
+    max_urls: int = 50,
+    max_children: int = 20,
+    workers: int = 4,
+    depth: int = 2,
+) -> list[str]:
+    """
+    Collect matching page URLs from a sitemap or sitemap index.
+
+    Child sitemaps of an index are streamed in parallel (likely-relevant
+    ones first) and every stream stops as soon as `max_urls` matches have
+    been found overall.
+
+    Args:
+        url: Sitemap URL.
+        fetch: Returns the raw response body of a URL as byte chunks.
+        match: Predicate selecting interesting page URLs.
+        max_urls: Stop after this many matches.
+        max_children: Upper bound on child sitemaps followed per index.
+        workers: Parallel child sitemap downloads.
+        depth: Maximum nesting of sitemap indexes.
+
+    Returns:
+        Unique matching URLs, ordered by sitemap position.
+    """
+    stop = threading.Event()
+    lock = threading.Lock()
+    found: dict[str, None] = {}
+
+    def _add(loc: str) -> None:
+        with lock:
+            if len(found) < max_urls:
+                found.setdefault(loc, None)
+            if len(found) >= max_urls:
+                stop.set()
+
+    def _walk(sm_url: str, level: int) -> list[str]:
+        if stop.is_set():
+            return []
+        hinted: list[str] = []
+        others: list[str] = []
+        hits: list[str] = []
+        stream = fetch(sm_url)
+        try:
+            for kind, loc in iter_sitemap_locs(stream):
+                if stop.is_set():
+                    break
+                if kind == "url":
+                    if match(loc):
+                        hits.append(loc)
+                        _add(loc)
+                elif level < depth:
+                    low = loc.lower()
+                    if any(h in low for h in _CHILD_HINTS):
+                        if len(hinted) < max_children:
+                            hinted.append(loc)
+                    elif len(others) < max_children:
+                        others.append(loc)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        children = (hinted + others)[:max_children]
+        if not children or stop.is_set():
+            return hits
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(bind(_walk), c, level + 1) for c in children]
+            for fut in futures:
+                try:
+                    hits.extend(fut.result())
+                except Exception:
+                    continue
+        return hits
+
+    ordered = _walk(url, 1)
+    return list(dict.fromkeys(ordered))[:max_urls]
@@ -0,0 +1,236 @@
+import contextvars
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Final, ParamSpec, TypeVar
+
+__all__ = [
+    "MODEL_PRICES",
+    "Tracer",
+    "bind",
+    "estimate_cost",
+    "record_usage",
+    "span",
+    "write_chrome_trace",
+]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# USD per 1M (input, output) tokens; looked up by longest model-name prefix.
+MODEL_PRICES: Final[dict[str, tuple[float, float]]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "o3-mini": (1.10, 4.40),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+# Shared origin so spans of every tracer in the process line up in one trace.
+_EPOCH_NS: Final[int] = time.perf_counter_ns()
+
+_current: contextvars.ContextVar["Tracer | None"] = contextvars.ContextVar(
+    "analyzer_tracer", default=None
+)
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int
+) -> float | None:
+    """Estimated USD cost of a call, or None for models without a known price."""
+    prefix = max(
+        (p for p in MODEL_PRICES if model.startswith(p)), key=len, default=None
+    )
+    if prefix is None:
+        return None
+    price_in, price_out = MODEL_PRICES[prefix]
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+@dataclass(frozen=True)
+class _Span:
+    name: str
+    cat: str
+    start_ns: int
+    dur_ns: int
+    tid: int
+    args: dict[str, Any]
+
+
+class Tracer:
+    """
+    Collects timed spans and LLM token usage for one analysis.
+
+    A tracer is made current with `activate()`; `span()` and `record_usage()`
+    report to the current tracer and do nothing when there is none. Work
+    handed to thread pools must be wrapped with `bind()` to stay attached.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: list[_Span] = []
+        self._usage: dict[str, dict[str, int]] = {}
+        self._start_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def add(self, span: _Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def add_usage(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            u = self._usage.setdefault(
+                model, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+            )
+            u["calls"] += 1
+            u["prompt_tokens"] += prompt_tokens
+            u["completion_tokens"] += completion_tokens
+
+    def timings(self) -> dict[str, Any]:
+        """
+        Wall time so far plus count, total and max duration per span name.
+
+        Spans run concurrently, so totals of different names can add up to
+        more than `wall_ms`.
+        """
+        with self._lock:
+            spans = list(self._spans)
+        per_name: dict[str, dict[str, Any]] = {}
+        for s in spans:
+            t = per_name.setdefault(
+                s.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            ms = s.dur_ns / 1e6
+            t["count"] += 1
+            t["total_ms"] += ms
+            t["max_ms"] = max(t["max_ms"], ms)
+        for t in per_name.values():
+            t["total_ms"] = round(t["total_ms"], 2)
+            t["max_ms"] = round(t["max_ms"], 2)
+        return {
+            "wall_ms": round((time.perf_counter_ns() - self._start_ns) / 1e6, 2),
+            "spans": per_name,
+        }
+
+    def usage(self) -> dict[str, Any]:
+        """Token usage and estimated cost per model, plus totals."""
+        with self._lock:
+            usage: dict[str, dict[str, Any]] = {
+                m: dict(u) for m, u in self._usage.items()
+            }
+        total_tokens = 0
+        total_cost = 0.0
+        unpriced = []
+        for model, u in usage.items():
+            u["total_tokens"] = u["prompt_tokens"] + u["completion_tokens"]
+            cost = estimate_cost(model, u["prompt_tokens"], u["completion_tokens"])
+            u["cost_usd"] = round(cost, 6) if cost is not None else None
+            total_tokens += u["total_tokens"]
+            if cost is None:
+                unpriced.append(model)
+            else:
+                total_cost += cost
+        out: dict[str, Any] = {
+            "models": usage,
+            "total_tokens": total_tokens,
+            "cost_usd": round(total_cost, 6),
+        }
+        if unpriced:
+            out["unpriced_models"] = unpriced
+        return out
+
+    def chrome_events(self, pid: int = 1, label: str = "") -> list[dict[str, Any]]:
+        """Spans as Chrome trace "complete" events (microsecond timestamps)."""
+        with self._lock:
+            spans = list(self._spans)
+        events: list[dict[str, Any]] = []
+        if label:
+            events.append(
+                {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}}
+            )
+        for s in spans:
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.cat,
+                    "ph": "X",
+                    "ts": s.start_ns / 1000,
+                    "dur": s.dur_ns / 1000,
+                    "pid": pid,
+                    "tid": s.tid,
+                    "args": s.args,
+                }
+            )
+        return events
+
+
+@contextmanager
+def span(name: str, cat: str = "", **args: Any) -> Iterator[dict[str, Any]]:
+    """
+    Time the enclosed block as a span of the current tracer.
+
+    Yields the span's argument dict so the block can annotate it (status,
+    sizes, ...). Does not change any context, so it is safe in generators.
+    """
+    tracer = _current.get()
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        tracer.add(
+            _Span(
+                name,
+                cat,
+                start - _EPOCH_NS,
+                time.perf_counter_ns() - start,
+                threading.get_ident(),
+                args,
+            )
+        )
+
+
+def record_usage(model: str, usage: Any) -> None:
+    """Add an OpenAI `usage` object (or None) to the current tracer."""
+    tracer = _current.get()
+    if tracer is None or usage is None:
+        return
+    tracer.add_usage(
+        model,
+        int(getattr(usage, "prompt_tokens", 0) or 0),
+        int(getattr(usage, "completion_tokens", 0) or 0),
+    )
+
+
+def bind(fn: Callable[P, R]) -> Callable[P, R]:
+    """Wrap `fn` so each call runs in a copy of the caller's context."""
+    ctx = contextvars.copy_context()
+
+    def _run(*args: P.args, **kwargs: P.kwargs) -> R:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return _run
+
+
+def write_chrome_trace(path: str, tracers: Iterable[tuple[str, Tracer]]) -> None:
+    """Write one Chrome trace file with a process lane per labelled tracer."""
+    events: list[dict[str, Any]] = []
+    for pid, (label, tracer) in enumerate(tracers, 1):
+        events.extend(tracer.chrome_events(pid, label))
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
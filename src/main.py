@@ -1,42 +1,78 @@
 import argparse
-import gzip
-import io
+import functools
 import json
+import math
 import os
 import pathlib
 import sys
-import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
-from analyzer.prompts import SYSTEM_SCORER, build_user_prompt
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TYPE_CHECKING,
+    cast,
+)
+from urllib.parse import urlparse
+from analyzer.adaptive import order_chunks, overall_stderr
+from analyzer.batch_api import (
+    BatchJobManifest,
+    BatchTransport,
+    OpenAIBatchTransport,
+    build_chat_request,
+    build_packed_chat_request,
+    parse_batch_results,
+    parse_packed_content,
+)
+from analyzer.browser import configure_browser_pool, get_browser_pool
+from analyzer.chunking import (
+    cap_char_chunks,
+    cap_token_chunks,
+    get_encoding,
+    split_text_into_token_chunks,
+    token_budget,
+)
+from analyzer.cache import ChunkResultCache, chunk_cache_key
+from analyzer.cascade import escalation_reason
+from analyzer.discovery import DiscoveryStage, SuccessStats, race_candidates
+from analyzer.discoverycache import configure_discovery_cache, get_discovery_cache
+from analyzer.extract import Page, configure_extractor, extract_page
+from analyzer.httpcache import configure_http_cache, get_http_cache
+from analyzer.incremental import SnapshotStore, locate_chunks, plan_incremental
+from analyzer.memo import FetchMemo
+from analyzer.prefilter import prefilter_text
+from analyzer.prompts import PACKED_SYSTEM_SCORER, PROMPT_VERSION, SYSTEM_SCORER
+from analyzer.ratelimit import LLMCallFailed, configure_schedulers, get_scheduler
 from analyzer.scoring import aggregate_chunk_results
+from analyzer.similarity import SimilarityIndex
+from analyzer.tracing import Tracer, bind, record_usage, span, write_chrome_trace
+from analyzer.sitemap import crawl_sitemap
+from analyzer.service import AnalysisService, make_server
+from analyzer.session import configure_session, get_session
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from openai import OpenAI
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-import chromedriver_autoinstaller
+# openai, trafilatura, langchain-text-splitters, numpy and selenium are
+# imported where first needed so `--help` and simple runs start quickly.
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 ROOT = pathlib.Path(__file__).resolve().parent
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-try:
-    import trafilatura
-
-    _HAS_TRAFILATURA = True
-except Exception:
-    trafilatura = None  # type: ignore[assignment]
-    _HAS_TRAFILATURA = False
-
-
 load_dotenv()
 
 _PRIVACY_CUES = (
@@ -84,22 +120,40 @@ def _is_privacy_like(s: str) -> bool:
     return any(k in s for k in _PRIVACY_CUES)
 
 
+_FETCH_MEMO = FetchMemo()
+_PROMPT_MAX_CHARS = 6000
+
+
+def _download(url: str, timeout: int = 15) -> Optional[requests.Response]:
+    """
+    HTTP GET through the shared session (and HTTP cache) with redirects allowed.
+
+    Error responses are returned too, so discovery can tell a missing page
+    from a broken fetch; None means the request itself failed.
+    """
+    http_cache = get_http_cache()
+    with span("http.get", "http", url=url) as info:
+        try:
+            if http_cache is not None:
+                # robots.txt may be reused for its max-age; pages are always revalidated.
+                fresh_ok = urlparse(url).path == "/robots.txt"
+                r = http_cache.get(
+                    get_session(), url, timeout=timeout, fresh_ok=fresh_ok
+                )
+            else:
+                r = get_session().get(url, timeout=timeout, allow_redirects=True)
+            info.update(status=r.status_code, bytes=len(r.content))
+            return cast(requests.Response, r)
+        except Exception as e:
+            info["error"] = type(e).__name__
+            return None
+
+
 def _http_get(url: str, timeout: int = 15) -> Optional[requests.Response]:
-    """HTTP GET with basic headers and redirects allowed."""
-    try:
-        r = requests.get(
-            url,
-            timeout=timeout,
-            allow_redirects=True,
-            headers={
-                "User-Agent": "PrivacyPolicyAnalyzer/0.2 (+https://example.org)",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-            },
-        )
-        return r if (r.status_code < 400 and r.text) else None
-    except Exception:
-        return None
+    """HTTP GET that downloads each URL at most once per run."""
+    r = _FETCH_MEMO.fetch(url, lambda u: _download(u, timeout=timeout))
+    # A Response is falsy for 4xx/5xx.
+    return cast(Optional[requests.Response], r if r and r.text else None)
 
 
 def _fetch_text(url: str, timeout: int = 12) -> Optional[str]:
@@ -108,71 +162,69 @@ def _fetch_text(url: str, timeout: int = 12) -> Optional[str]:
     return r.text if r else None
 
 
-def _head_ok(url: str, timeout: int = 8) -> bool:
-    """Lightweight existence probe using HEAD; redirects considered OK."""
-    try:
-        r = requests.head(
-            url,
-            timeout=timeout,
-            allow_redirects=True,
-            headers={
-                "User-Agent": "PrivacyPolicyAnalyzer/0.2 (+https://example.org)",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-            },
-        )
-        if 200 <= r.status_code < 300:
-            return True
-        if r.status_code in (301, 302, 303, 307, 308):
-            return True
-        return False
-    except Exception:
+_MISSING_STATUSES = (404, 410)
+
+
+def _answered(url: str) -> bool:
+    """
+    True when the server gave a definitive answer for `url`: a page, or
+    404/410. Timeouts, connection errors and 5xx responses are transient.
+    """
+    r = _FETCH_MEMO.fetch(url, _download)
+    if r is None:
         return False
+    return 200 <= r.status_code < 300 or r.status_code in _MISSING_STATUSES
 
 
-def _extract_text_http(url: str) -> Optional[str]:
-    if _HAS_TRAFILATURA:
+def _head_ok(url: str, timeout: int = 8) -> bool:
+    """Lightweight existence probe using HEAD; redirects considered OK."""
+    with span("http.head", "http", url=url) as info:
         try:
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                text = trafilatura.extract(downloaded, include_formatting=False) or ""
-                t = text.strip()
-                return t if len(t) >= 400 else None
+            r = get_session().head(url, timeout=timeout, allow_redirects=True)
+            info["status"] = r.status_code
+            if 200 <= r.status_code < 300:
+                return True
+            if r.status_code in (301, 302, 303, 307, 308):
+                return True
+            return False
         except Exception:
-            pass
-    r = _http_get(url)
+            return False
+
+
+def _parse_page(r: Optional[requests.Response]) -> Optional[Page]:
+    """Parse a downloaded page once: main text, privacy links and signals."""
     if not r:
         return None
-    soup = BeautifulSoup(r.text, "html.parser")
-    body = soup.find("body")
-    t = body.get_text("\n").strip() if body else ""
-    return t if len(t) >= 400 else None
+    with span("extract.page", "extract", url=r.url) as info:
+        page = extract_page(
+            r.content,
+            r.url,
+            r.headers.get("Content-Type"),
+            link_filter=_is_privacy_like,
+        )
+        if page is not None:
+            info.update(strategy=page.strategy, chars=len(page.text))
+        return page
+
+
+def _page(url: str) -> Optional[Page]:
+    """The parsed page at `url`, downloaded and parsed at most once per run."""
+    page = _FETCH_MEMO.derive(url, "page", _download, _parse_page)
+    return cast(Optional[Page], page)
+
+
+def _extract_text_http(url: str) -> Optional[str]:
+    """Main text of a page, extracted once per run and shared by all callers."""
+    page = _page(url)
+    text: str = page.text if page is not None else ""
+    return text if len(text) >= 400 else None
 
 
 def fetch_content_with_selenium(url: str) -> Optional[str]:
-    """Return visible text using headless Chrome; robust for dynamic pages."""
-    chromedriver_autoinstaller.install()
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--disable-extensions")
-    opts.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-    )
-    driver = webdriver.Chrome(options=opts)
-    try:
-        driver.get(url)
-        WebDriverWait(driver, 12).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        return driver.find_element(By.TAG_NAME, "body").get_attribute("innerText")
-    except Exception:
-        return None
-    finally:
-        driver.quit()
+    """Return visible text using a pooled headless Chrome; robust for dynamic pages."""
+    with span("browser.fetch", "browser", url=url):
+        text: Optional[str] = get_browser_pool().fetch_text(url)
+        return text
 
 
 def fetch_policy_text(url: str, prefer: str = "auto") -> Optional[str]:
@@ -219,120 +271,146 @@ def _get_sitemaps_from_robots(base_url: str) -> List[str]:
     return uniq
 
 
-def _fetch_sitemap_urls(url: str, max_urls: int = 50) -> List[str]:
-    """Return privacy-like URLs found in the sitemap (gz and index supported)."""
-    r = _http_get(url)
-    if not r:
-        return []
-    data = r.content
-    if url.endswith(".gz"):
+def _stream_bytes(url: str, timeout: int = 15) -> Iterator[bytes]:
+    """Yield a response body in chunks without buffering it whole."""
+    http_cache = get_http_cache()
+    with span("http.stream", "http", url=url) as info:
+        info["bytes"] = 0
         try:
-            data = gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+            if http_cache is not None:
+                parts = http_cache.stream(get_session(), url, timeout=timeout)
+                for part in parts:
+                    info["bytes"] += len(part)
+                    yield part
+                return
+            with get_session().get(url, timeout=timeout, stream=True) as r:
+                info["status"] = r.status_code
+                if r.status_code >= 400:
+                    return
+                for part in r.iter_content(chunk_size=64 * 1024):
+                    info["bytes"] += len(part)
+                    yield part
         except Exception:
-            return []
-    try:
-        root = ET.fromstring(data)
-    except Exception:
-        return []
-    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-    urls: List[str] = []
-    if root.tag.endswith("sitemapindex"):
-        for i, loc in enumerate(root.findall(".//sm:loc", ns)):
-            if i >= 5:
-                break
-            child = (loc.text or "").strip()
-            urls.extend(_fetch_sitemap_urls(child, max_urls=max_urls))
-            if len(urls) >= max_urls:
-                break
-    else:
-        for loc in root.findall(".//sm:loc", ns):
-            u = (loc.text or "").strip()
-            if u and _is_privacy_like(u):
-                urls.append(u)
-                if len(urls) >= max_urls:
-                    break
-    seen, uniq = set(), []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            uniq.append(u)
-    return uniq
+            return
+
+
+def _fetch_sitemap_urls(url: str, max_urls: int = 50) -> List[str]:
+    """Return privacy-like URLs found in the sitemap (gz and index supported)."""
+    urls: List[str] = crawl_sitemap(
+        url, _stream_bytes, _is_privacy_like, max_urls=max_urls
+    )
+    return urls
 
 
 def _discover_candidates_from_html(start_url: str) -> List[str]:
     """Collect privacy-like links from the HTML of the given page."""
-    r = _http_get(start_url)
-    if not r:
-        return []
-    soup = BeautifulSoup(r.text, "html.parser")
-    links: List[str] = []
-    for a in soup.find_all("a", href=True):
-        text = (a.get_text(" ") or "") + " " + a["href"]  # type: ignore[operator, index]
-        if _is_privacy_like(text):
-            links.append(urljoin(r.url, a["href"]))  # type: ignore[index]
-    seen, uniq = set(), []
-    for u in links:
-        if u not in seen:
-            seen.add(u)
-            uniq.append(u)
-    return uniq
+    page = _page(start_url)
+    return [u for u, _ in page.links] if page else []
 
 
 def _extract_text_quality(url: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract and sanity-check text content for policy-ness."""
-    if _HAS_TRAFILATURA:
-        try:
-            downloaded = trafilatura.fetch_url(url)
-            if not downloaded:
-                return None, None
-            text = trafilatura.extract(downloaded, include_formatting=False) or ""
-            t = text.strip()
-            if len(t) >= 500 and _is_privacy_like(t[:2000]):
-                return t, url
-            return None, url
-        except Exception:
-            return None, None
-    r = _http_get(url)
-    if not r:
+    page = _page(url)
+    if page is None:
         return None, None
-    soup = BeautifulSoup(r.text, "html.parser")
-    body = soup.find("body")
-    t = (body.get_text("\n").strip() if body else "")[:4000]
-    if len(t) >= 500 and _is_privacy_like(t):
-        return t, r.url
-    return None, r.url
+    t = page.text
+    if len(t) >= 500 and _is_privacy_like(t[:2000]):
+        return t, page.url
+    return None, page.url
+
+
+_PATH_STATS = SuccessStats()
 
 
-def resolve_privacy_url(input_url: str) -> Tuple[str, Optional[str]]:
-    """Resolve a likely privacy policy URL starting from any given page."""
+def _sitemap_candidates(base: str) -> List[str]:
+    out: List[str] = []
+    for sm in _get_sitemaps_from_robots(base):
+        out.extend(_fetch_sitemap_urls(sm, max_urls=50))
+    return out
+
+
+def _html_candidate_ok(url: str) -> bool:
+    text, _ = _extract_text_quality(url)
+    return bool(text)
+
+
+def resolve_privacy_url(
+    input_url: str, deadline: Optional[float] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Resolve a likely privacy policy URL starting from any given page.
+
+    Common paths, sitemap entries and homepage links are probed at the same
+    time; the first verified URL in that precedence order wins and remaining
+    probes are cancelled. `deadline` bounds the search in seconds.
+
+    With a discovery cache, a host's earlier resolution is re-verified with
+    one fetch (which the analysis then reuses) and trusted if it still
+    passes; otherwise common paths that recently failed and sitemaps that
+    recently had no candidates are skipped. Only definitive misses are
+    remembered: a path that answered 404/410 or with a page that is not a
+    policy, or a host whose robots.txt answered but listed no candidates.
+    """
     if _is_privacy_like(input_url):
         return input_url, None
 
     parsed = urlparse(input_url)
+    host = parsed.netloc
     base = f"{parsed.scheme}://{parsed.netloc}".rstrip("/")
+    cache = get_discovery_cache()
 
-    path_heads: List[str] = []
-    for p in _COMMON_PATHS:
-        cand = base + p
-        if _head_ok(cand) or _light_verify(cand):
-            if _light_verify(cand):
-                return cand, input_url
-            path_heads.append(cand)
+    if cache is not None:
+        cached = cache.resolved(host)
+        if cached:
+            with span("discovery.cached", "discovery", url=cached) as info:
+                ok = _light_verify(cached)
+                info["verified"] = ok
+            if ok:
+                return cached, input_url
+            cache.forget(host)
 
-    for cand in path_heads:
-        if _light_verify(cand):
-            return cand, input_url
+    skip: Set[str] = set()
+    if cache is not None:
+        skip = cache.failed_paths(host, _COMMON_PATHS)
+    path_of = {base + p: p for p in _COMMON_PATHS if p not in skip}
 
-    for sm in _get_sitemaps_from_robots(base):
-        for cand in _fetch_sitemap_urls(sm, max_urls=50):
-            if _light_verify(cand):
-                return cand, input_url
+    def _record(stage: DiscoveryStage, url: str, ok: bool) -> None:
+        if stage.name == "common_paths":
+            _PATH_STATS.record(path_of[url], ok)
+            # Only definitive misses are remembered; an outage is retried.
+            if cache is not None and (ok or _answered(url)):
+                cache.record_path(host, path_of[url], ok)
 
-    for cand in _discover_candidates_from_html(input_url):
-        text, _ = _extract_text_quality(cand)
-        if text:
-            return cand, input_url
+    def _sitemaps() -> List[str]:
+        cands = _sitemap_candidates(base)
+        if cache is not None and (cands or _answered(base + "/robots.txt")):
+            cache.record_sitemap(host, bool(cands))
+        return cands
 
+    stages = [
+        DiscoveryStage(
+            "common_paths",
+            list(path_of),
+            _light_verify,
+            rank=lambda u: _PATH_STATS.rate(path_of[u]),
+        ),
+        DiscoveryStage(
+            "sitemaps",
+            [] if cache is not None and cache.no_sitemap(host) else _sitemaps,
+            _light_verify,
+        ),
+        DiscoveryStage(
+            "html_links",
+            lambda: _discover_candidates_from_html(input_url),
+            _html_candidate_ok,
+        ),
+    ]
+    with span("discovery", "discovery", url=input_url):
+        winner = race_candidates(stages, deadline=deadline, on_result=_record)
+    if winner:
+        if cache is not None:
+            cache.store_resolved(host, winner)
+        return winner, input_url
     return input_url, None
 
 
@@ -340,6 +418,8 @@ def split_text_into_chunks(
     text: str, chunk_size: int = 3500, chunk_overlap: int = 350
 ) -> List[str]:
     """Split text into chunks using paragraph-first recursive boundaries."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
@@ -348,22 +428,62 @@ def split_text_into_chunks(
     return splitter.split_text(text or "")
 
 
-def analyze_chunk_json(text_chunk: str, model: str) -> Optional[Dict[str, Any]]:
-    """Analyze a text chunk with the LLM and return one JSON object."""
+@functools.lru_cache(maxsize=None)
+def _openai_client(api_key: str, base_url: Optional[str] = None) -> "OpenAI":
+    """
+    Return a process-wide OpenAI client so its connection pool is reused.
+
+    `base_url` points it at any OpenAI-compatible endpoint; None keeps the
+    default (or OPENAI_BASE_URL).
+    """
+    from openai import OpenAI
+
+    # Retries belong to the LLM scheduler; SDK retries would multiply them.
+    return OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+
+
+def _llm_client(base_url: Optional[str]) -> "OpenAI":
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set. Configure your .env file.")
-    client = OpenAI(api_key=api_key)
-    resp = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": SYSTEM_SCORER},
-            {"role": "user", "content": build_user_prompt(text_chunk)},
-        ],
-        temperature=0,
-        max_tokens=600,
-        response_format={"type": "json_object"},
-    )
+        if not base_url:
+            raise RuntimeError("OPENAI_API_KEY is not set. Configure your .env file.")
+        # Local OpenAI-compatible servers usually accept any key.
+        api_key = "unused"
+    return _openai_client(api_key, base_url)
+
+
+def _chat(body: Dict[str, Any], base_url: Optional[str]) -> Any:
+    """
+    One chat completion through the endpoint's shared LLMScheduler.
+
+    The scheduler admits the call within the concurrency limit and the
+    request/token budgets from earlier responses, and retries throttled or
+    failed calls; LLMCallFailed means the call failed for good.
+    """
+    client = _llm_client(base_url)
+    messages = body.get("messages", [])
+    tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    tokens += int(body.get("max_tokens") or 0)
+
+    def _request() -> Tuple[Any, Any]:
+        raw = client.chat.completions.with_raw_response.create(**body)
+        return raw.parse(), raw.headers
+
+    scheduler = get_scheduler(f"{base_url or ''}|{body.get('model', '')}")
+    return scheduler.call(_request, tokens=tokens)
+
+
+def analyze_chunk_json(
+    text_chunk: str,
+    model: str,
+    max_len: Optional[int] = 6000,
+    base_url: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Analyze a text chunk with the LLM and return one JSON object."""
+    body = build_chat_request("", model, text_chunk, max_len)["body"]
+    with span("llm.chat", "llm", model=model, chunks=1):
+        resp = _chat(body, base_url)
+    record_usage(model, resp.usage)
     content = (resp.choices[0].message.content or "").strip()
     try:
         return json.loads(content)  # type: ignore[no-any-return]
@@ -371,7 +491,229 @@ def analyze_chunk_json(text_chunk: str, model: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def main() -> None:
+def analyze_chunks_packed(
+    chunks: List[str],
+    model: str,
+    max_len: Optional[int] = 6000,
+    base_url: Optional[str] = None,
+) -> Optional[List[Any]]:
+    """
+    Score several chunks in one LLM call.
+
+    Returns one entry per chunk, or None when the reply does not hold exactly
+    one object per chunk.
+    """
+    body = build_packed_chat_request("", model, chunks, max_len)["body"]
+    with span("llm.chat", "llm", model=model, chunks=len(chunks)):
+        resp = _chat(body, base_url)
+    record_usage(model, resp.usage)
+    items: Optional[List[Any]] = parse_packed_content(
+        resp.choices[0].message.content or "", len(chunks)
+    )
+    return items
+
+
+def _valid(j: Any) -> bool:
+    return isinstance(j, dict) and "scores" in j
+
+
+def score_chunks(
+    chunks: List[str],
+    model: str,
+    concurrency: int = 1,
+    cache: Optional[ChunkResultCache] = None,
+    progress: bool = True,
+    max_len: Optional[int] = 6000,
+    similar: Optional[SimilarityIndex] = None,
+    source_url: str = "",
+    pack: int = 1,
+    numbers: Optional[List[int]] = None,
+    base_url: Optional[str] = None,
+    failures: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score chunks with up to `concurrency` parallel calls, preserving order.
+
+    Exact repeats are served from `cache`; chunks close enough to one already
+    in `similar` reuse its result and carry a `reused_from` entry instead.
+    With `pack > 1` the remaining chunks are scored `pack` at a time in one
+    request each; a reply with the wrong number of objects is retried one
+    chunk per call, as is any chunk whose packed object is invalid.
+    `numbers` gives the chunk numbers used for `index` (default 1..n) and
+    every result records the `model` that produced it; `base_url` selects
+    an OpenAI-compatible endpoint. A chunk whose call fails for good (after
+    the scheduler's retries) is left out and, when `failures` is given,
+    recorded there; the other chunks are still returned.
+    """
+    total = len(chunks)
+    nums = numbers or list(range(1, total + 1))
+    # Packed and single runs use different system prompts, so their results
+    # are cached and indexed apart.
+    system = PACKED_SYSTEM_SCORER if pack > 1 else SYSTEM_SCORER
+    scope = chunk_cache_key(model, system, PROMPT_VERSION, "")
+    sent = [chunk[:max_len] for chunk in chunks]
+    keys = [chunk_cache_key(model, system, PROMPT_VERSION, t) for t in sent]
+    outputs: List[Optional[Dict[str, Any]]] = [None] * total
+
+    def _lookup(i: int) -> Optional[Dict[str, Any]]:
+        if cache is not None:
+            hit = cache.get(keys[i])
+            if hit is not None:
+                return cast(Dict[str, Any], hit)
+        if similar is not None:
+            match = similar.lookup(scope, sent[i])
+            if match is not None:
+                reused = dict(match.result)
+                reused["reused_from"] = {
+                    "url": match.source_url,
+                    "chunk": match.source_chunk,
+                    "similarity": match.similarity,
+                }
+                return reused
+        return None
+
+    def _failed(group: List[int], exc: LLMCallFailed) -> None:
+        if progress:
+            print(f"Chunk {', '.join(str(nums[i]) for i in group)} failed: {exc}")
+        if failures is not None:
+            failures.extend(
+                {"chunk": nums[i], "error": str(exc), "attempts": exc.attempts}
+                for i in group
+            )
+
+    def _single(i: int) -> Any:
+        if progress:
+            print(f"Analyzing chunk {nums[i]}...")
+        try:
+            return analyze_chunk_json(
+                chunks[i], model=model, max_len=max_len, base_url=base_url
+            )
+        except LLMCallFailed as exc:
+            _failed([i], exc)
+            return None
+
+    def _score(group: List[int]) -> List[Tuple[int, Any]]:
+        if len(group) == 1:
+            return [(group[0], _single(group[0]))]
+        if progress:
+            print(f"Analyzing chunks {', '.join(str(nums[i]) for i in group)}...")
+        try:
+            packed = analyze_chunks_packed(
+                [chunks[i] for i in group],
+                model=model,
+                max_len=max_len,
+                base_url=base_url,
+            )
+        except LLMCallFailed:
+            packed = None
+        if packed is None:
+            return [(i, _single(i)) for i in group]
+        return [(i, j if _valid(j) else _single(i)) for i, j in zip(group, packed)]
+
+    todo: List[int] = []
+    for i in range(total):
+        outputs[i] = _lookup(i)
+        if outputs[i] is None:
+            todo.append(i)
+    size = max(1, pack)
+    groups = [todo[k : k + size] for k in range(0, len(todo), size)]
+    if concurrency <= 1 or len(groups) <= 1:
+        scored = [_score(g) for g in groups]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(groups))) as pool:
+            scored = list(pool.map(bind(_score), groups))
+
+    for i, j in (pair for group in scored for pair in group):
+        outputs[i] = j
+        if _valid(j):
+            if cache is not None:
+                cache.set(keys[i], j)
+            if similar is not None:
+                similar.add(scope, sent[i], j, source_url, nums[i])
+
+    results: List[Dict[str, Any]] = []
+    for i, j in zip(nums, outputs):
+        if isinstance(j, dict) and "scores" in j:
+            j["index"] = i
+            j.setdefault("model", model)
+            results.append(j)
+    return results
+
+
+def score_chunks_cascade(
+    chunks: List[str],
+    numbers: List[int],
+    score: Callable[[List[str], List[int], bool], List[Dict[str, Any]]],
+    margin: float = 5.0,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Score chunks with a cheap model and re-score only the uncertain ones.
+
+    `score(chunks, numbers, strong)` scores with the cheap model, or with the
+    strong one when `strong` is True. Chunks whose cheap result is missing,
+    off-schema, inconsistent or borderline (see `escalation_reason`) are
+    escalated; when the strong model fails too, a valid cheap result is kept.
+
+    Returns:
+        Valid results in chunk order and the escalated chunks with reasons.
+    """
+    cheap = {j["index"]: j for j in score(chunks, numbers, False)}
+    escalate: List[Tuple[int, str]] = []
+    for chunk_no in numbers:
+        reason = escalation_reason(cheap.get(chunk_no), margin)
+        if reason is not None:
+            escalate.append((chunk_no, reason))
+    if escalate:
+        pos = {n: k for k, n in enumerate(numbers)}
+        redo = [n for n, _ in escalate]
+        strong = score([chunks[pos[n]] for n in redo], redo, True)
+        cheap.update({j["index"]: j for j in strong})
+    results = [cheap[n] for n in numbers if n in cheap]
+    return results, [{"chunk": n, "reason": r} for n, r in escalate]
+
+
+def score_chunks_adaptive(
+    chunks: List[str],
+    score: Callable[[List[str], List[int]], List[Dict[str, Any]]],
+    wave: int = 4,
+    tolerance: float = 3.0,
+    min_chunks: int = 3,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Score chunks in waves, most informative first, until the result converges.
+
+    After each wave of `wave` chunks the running aggregate is checked; scoring
+    stops once every category has a score (confidence 1.0) and the estimated
+    standard error of the overall score is below `tolerance` points.
+
+    Returns:
+        Valid results in chunk order and a summary of what was skipped.
+    """
+    order = order_chunks(chunks)
+    results: List[Dict[str, Any]] = []
+    stderr = math.inf
+    done = 0
+    while done < len(order):
+        size = max(wave, min_chunks - done, 1)
+        picked = order[done : done + size]
+        results += score([chunks[i] for i in picked], [i + 1 for i in picked])
+        done += len(picked)
+        if done < min_chunks or not results:
+            continue
+        stderr = overall_stderr(results)
+        if aggregate_chunk_results(results)["confidence"] >= 1.0 and stderr < tolerance:
+            break
+    results.sort(key=lambda j: int(j["index"]))
+    summary = {
+        "chunks_scored": done,
+        "chunks_skipped": len(chunks) - done,
+        "stderr": stderr if math.isfinite(stderr) else None,
+        "tolerance": tolerance,
+    }
+    return results, summary
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Privacy Policy Analyzer (auto-discovery + JSON scoring)"
     )
@@ -388,6 +730,25 @@ def main() -> None:
     parser.add_argument(
         "--chunk-overlap", type=int, default=350, help="Overlap between chunks"
     )
+    parser.add_argument(
+        "--chunker",
+        type=str,
+        choices=["chars", "tokens"],
+        default="chars",
+        help="Split by characters or pack chunks up to a per-model token budget",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=None,
+        help="Token budget per chunk for --chunker tokens (default: per model)",
+    )
+    parser.add_argument(
+        "--chunk-overlap-tokens",
+        type=int,
+        default=100,
+        help="Token overlap between chunks for --chunker tokens",
+    )
     parser.add_argument(
         "--max-chunks",
         type=int,
@@ -408,87 +769,461 @@ def main() -> None:
         default="auto",
         help="Fetch method preference",
     )
+    parser.add_argument(
+        "--extractor",
+        type=str,
+        choices=["auto", "lxml", "trafilatura"],
+        default="auto",
+        help="Main-text extraction for HTTP pages (auto: trafilatura if installed)",
+    )
     parser.add_argument(
         "--no-discover",
         action="store_true",
         help="Skip auto-discovery and analyze the given URL as-is",
     )
+    parser.add_argument(
+        "--discover-timeout",
+        type=float,
+        default=45.0,
+        help="Seconds allowed for policy URL discovery",
+    )
+    parser.add_argument(
+        "--http-per-host",
+        type=int,
+        default=8,
+        help="Maximum pooled HTTP connections per host during discovery/fetch",
+    )
+    parser.add_argument(
+        "--browser-pool-size",
+        type=int,
+        default=1,
+        help="Warm headless Chrome instances kept for the Selenium fallback",
+    )
+    parser.add_argument(
+        "--browser-max-pages",
+        type=int,
+        default=50,
+        help="Pages loaded by one browser before it is recycled",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of scoring requests in flight (1 = sequential)",
+    )
+    parser.add_argument(
+        "--llm-retries",
+        type=int,
+        default=5,
+        help="Retries of a throttled or failed LLM call before its chunk is skipped",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Score the most informative chunks first and stop once scores converge",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=3.0,
+        help="Adaptive mode: stop when the overall score's standard error is below this",
+    )
+    parser.add_argument(
+        "--min-chunks",
+        type=int,
+        default=3,
+        help="Adaptive mode: always score at least this many chunks",
+    )
+    parser.add_argument(
+        "--prefilter",
+        action="store_true",
+        help="Drop boilerplate blocks from fallback (e.g. Selenium) text before chunking",
+    )
+    parser.add_argument(
+        "--min-relevance",
+        type=float,
+        default=0.15,
+        help="Pre-filter drops text blocks whose local privacy relevance is below this",
+    )
+    parser.add_argument(
+        "--pack",
+        type=int,
+        default=1,
+        help="Score up to N chunks per LLM request (1 = one chunk per request)",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="OpenAI-compatible endpoint for --model (default: OPENAI_BASE_URL or OpenAI)",
+    )
+    parser.add_argument(
+        "--cascade-model",
+        type=str,
+        default=os.getenv("ANALYZER_CASCADE_MODEL"),
+        help="Cheap model that scores every chunk first; only uncertain chunks go to --model",
+    )
+    parser.add_argument(
+        "--cascade-base-url",
+        type=str,
+        default=os.getenv("ANALYZER_CASCADE_BASE_URL"),
+        help="OpenAI-compatible endpoint for --cascade-model, e.g. a local server",
+    )
+    parser.add_argument(
+        "--escalate-margin",
+        type=float,
+        default=5.0,
+        help="Escalate cascade chunks scoring within this many points of 40 or 70 (0 = off)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        help="File with one URL per line ('-' for stdin); writes one JSONL record per site",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Batch mode: JSONL output file (default: stdout)",
+    )
+    parser.add_argument(
+        "--sites-concurrency",
+        type=int,
+        default=8,
+        help="Batch mode: sites analyzed in parallel",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=2,
+        help="Batch mode: sites of the same host analyzed in parallel",
+    )
+    parser.add_argument(
+        "--openai-batch",
+        type=str,
+        metavar="MANIFEST",
+        help="Batch mode: score via an offline OpenAI Batch API job tracked in MANIFEST",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between Batch API job status checks",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        metavar="FILE",
+        help="Offline mode: re-aggregate stored results (full-report JSONL or .npz)",
+    )
+    parser.add_argument(
+        "--weights",
+        type=str,
+        metavar="JSON",
+        help="Corpus mode: JSON file mapping categories to weights",
+    )
+    parser.add_argument(
+        "--save-corpus",
+        type=str,
+        metavar="NPZ",
+        help="Corpus mode: save the loaded corpus as a compressed .npz for reuse",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=os.getenv("ANALYZER_CACHE_DIR", ".cache/chunks"),
+        help="Directory of the on-disk chunk result cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=30 * 24 * 3600,
+        help="Seconds before a cached chunk result expires (0 = never)",
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=256,
+        help="Size limit of the chunk cache; oldest entries are evicted first",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the chunk result cache for this run",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached chunk results but store the fresh ones",
+    )
+    parser.add_argument(
+        "--reuse-similar",
+        action="store_true",
+        help="Reuse results of near-duplicate chunks scored earlier (SimHash index)",
+    )
+    parser.add_argument(
+        "--similarity-index",
+        type=str,
+        default=os.getenv("ANALYZER_SIMILARITY_INDEX", ".cache/similar.sqlite"),
+        help="SQLite file holding the near-duplicate chunk index",
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=0.95,
+        help="Minimum SimHash similarity for reuse (floored at 0.9375)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-score only the parts of a policy that changed since the last run",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=str,
+        default=os.getenv("ANALYZER_SNAPSHOT_DIR", ".cache/snapshots"),
+        help="Directory of per-URL text and chunk snapshots for --incremental",
+    )
+    parser.add_argument(
+        "--http-cache-dir",
+        type=str,
+        default=os.getenv("ANALYZER_HTTP_CACHE_DIR", ".cache/http"),
+        help="Directory of the conditional-request (ETag/Last-Modified) HTTP cache",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Always download pages, robots.txt and sitemaps in full",
+    )
+    parser.add_argument(
+        "--discovery-cache-dir",
+        type=str,
+        default=os.getenv("ANALYZER_DISCOVERY_CACHE_DIR", ".cache/discovery"),
+        help="Directory of the per-host cache of resolved policy URLs",
+    )
+    parser.add_argument(
+        "--discovery-ttl",
+        type=int,
+        default=7 * 24 * 3600,
+        help="Seconds before a cached policy URL is rediscovered (0 = never)",
+    )
+    parser.add_argument(
+        "--discovery-negative-ttl",
+        type=int,
+        default=24 * 3600,
+        help="Seconds a failed common path or empty sitemap is skipped (0 = never)",
+    )
+    parser.add_argument(
+        "--no-discovery-cache",
+        action="store_true",
+        help="Rediscover the policy URL of every site from scratch",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="Write a Chrome trace (chrome://tracing, Perfetto) of every span here",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a local HTTP service that queues and analyzes submitted URLs",
+    )
+    parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Address --serve listens on"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8080, help="Port --serve listens on"
+    )
+    parser.add_argument(
+        "--serve-workers",
+        type=int,
+        default=4,
+        help="Analyses --serve runs at once",
+    )
+    parser.add_argument(
+        "--serve-queue",
+        type=int,
+        default=256,
+        help="Jobs --serve queues before answering 503",
+    )
+    return parser
+
+
+def _open_cache(args: argparse.Namespace) -> Optional[ChunkResultCache]:
+    if args.no_cache:
+        return None
+    return ChunkResultCache(
+        args.cache_dir,
+        ttl_seconds=args.cache_ttl,
+        size_limit_mb=args.cache_size_mb,
+        refresh=args.refresh,
+    )
+
+
+def _open_similar(args: argparse.Namespace) -> Optional[SimilarityIndex]:
+    if not args.reuse_similar:
+        return None
+    return SimilarityIndex(
+        args.similarity_index,
+        threshold=args.similarity_threshold,
+        refresh=args.refresh,
+    )
+
+
+def _open_snapshots(args: argparse.Namespace) -> Optional[SnapshotStore]:
+    if not args.incremental:
+        return None
+    return SnapshotStore(args.snapshot_dir)
 
-    args = parser.parse_args()
-    input_url = args.url or input("Enter a site (or privacy policy) URL: ").strip()
 
+def _error(reason: str, input_url: str, resolved_url: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "reason": reason,
+        "url": input_url,
+        "resolved_url": resolved_url,
+    }
+
+
+@dataclass
+class PreparedSite:
+    """Discovery, fetch and chunking outcome for one input URL."""
+
+    resolved_url: str
+    chunks: List[str] = field(default_factory=list)
+    error: Optional[Dict[str, Any]] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    prompt_max_chars: Optional[int] = _PROMPT_MAX_CHARS
+    text: str = ""
+
+
+def _split_text(content: str, args: argparse.Namespace) -> List[str]:
+    """Split text per --chunker without applying --max-chunks."""
+    if args.chunker == "tokens":
+        chunks: List[str] = split_text_into_token_chunks(
+            content,
+            token_budget(args.model, args.chunk_tokens),
+            args.chunk_overlap_tokens,
+            get_encoding(args.model),
+        )
+        return chunks
+    return split_text_into_chunks(
+        content, chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap
+    )
+
+
+def _cap_chunks(
+    content: str, chunks: List[str], args: argparse.Namespace
+) -> Tuple[List[str], Dict[str, Any], Optional[int]]:
+    """Cap chunks of `content` at --max-chunks, reporting sizes and any cut."""
+    if args.chunker == "tokens":
+        enc = get_encoding(args.model)
+        budget = token_budget(args.model, args.chunk_tokens)
+        chunks, info = cap_token_chunks(
+            content,
+            chunks,
+            args.max_chunks,
+            budget,
+            args.chunk_overlap_tokens,
+            enc,
+            hard_cap_tokens=budget * 4,
+        )
+        return chunks, info, None
+    chunks, info = cap_char_chunks(chunks, args.max_chunks, _PROMPT_MAX_CHARS)
+    return chunks, info, _PROMPT_MAX_CHARS
+
+
+def _chunk_text(
+    content: str, args: argparse.Namespace
+) -> Tuple[List[str], Dict[str, Any], Optional[int]]:
+    """Chunk text per --chunker and cap it at --max-chunks, reporting any cut."""
+    return _cap_chunks(content, _split_text(content, args), args)
+
+
+def chunk_content(
+    content: str, args: argparse.Namespace
+) -> Tuple[str, List[str], Dict[str, Any], Optional[int]]:
+    """
+    Pre-filter (with --prefilter) and chunk fetched policy text.
+
+    Returns:
+        The text that was chunked, its chunks, the `prefilter` / `chunking`
+        report blocks and the prompt length limit.
+    """
+    meta: Dict[str, Any] = {}
+    if args.prefilter:
+        raw = content
+        with span("prefilter", "chunking"):
+            content, meta["prefilter"] = prefilter_text(
+                raw, min_relevance=args.min_relevance
+            )
+            if content is not raw:
+                meta["prefilter"]["chunks_dropped"] = max(
+                    0, len(_split_text(raw, args)) - len(_split_text(content, args))
+                )
+
+    with span("chunking", "chunking") as span_info:
+        chunks, info, max_len = _chunk_text(content, args)
+        span_info["chunks"] = len(chunks)
+    if chunks:
+        meta["chunking"] = info
+    return content, chunks, meta, max_len
+
+
+def prepare_chunks(input_url: str, args: argparse.Namespace) -> PreparedSite:
+    """Discover, fetch and chunk one URL."""
     resolved_url, _ = (
-        (input_url, None) if args.no_discover else resolve_privacy_url(input_url)
+        (input_url, None)
+        if args.no_discover
+        else resolve_privacy_url(input_url, deadline=args.discover_timeout)
     )
 
     content = fetch_policy_text(resolved_url, prefer=args.fetch)
     if not content:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "reason": "fetch_failed",
-                    "url": input_url,
-                    "resolved_url": resolved_url,
-                }
-            )
+        return PreparedSite(
+            resolved_url, error=_error("fetch_failed", input_url, resolved_url)
         )
-        return
 
-    chunks = split_text_into_chunks(
-        content, chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap
-    )
+    content, chunks, meta, max_len = chunk_content(content, args)
     if not chunks:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "reason": "no_chunks",
-                    "url": input_url,
-                    "resolved_url": resolved_url,
-                }
-            )
+        return PreparedSite(
+            resolved_url, error=_error("no_chunks", input_url, resolved_url)
         )
-        return
+    return PreparedSite(
+        resolved_url,
+        chunks,
+        meta=meta,
+        prompt_max_chars=max_len,
+        text=content,
+    )
 
-    if len(chunks) > args.max_chunks:
-        head = chunks[: args.max_chunks - 1]
-        tail = " ".join(chunks[args.max_chunks - 1 :])
-        chunks = head + [tail]
-
-    results: List[Dict[str, Any]] = []
-    for i, chunk in enumerate(chunks, 1):
-        print(f"Analyzing chunk {i}/{len(chunks)}...")
-        j = analyze_chunk_json(chunk, model=args.model)
-        if isinstance(j, dict) and "scores" in j:
-            j["index"] = i
-            results.append(j)
 
+def build_report(
+    input_url: str,
+    resolved_url: str,
+    args: argparse.Namespace,
+    n_chunks: int,
+    results: List[Dict[str, Any]],
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Aggregate scored chunks into the report shape selected by --report."""
     if not results:
-        print(
-            json.dumps(
-                {
-                    "status": "error",
-                    "reason": "no_valid_scores",
-                    "url": input_url,
-                    "resolved_url": resolved_url,
-                }
-            )
-        )
-        return
+        return _error("no_valid_scores", input_url, resolved_url)
 
-    agg = aggregate_chunk_results(results)
+    with span("aggregate", "aggregate"):
+        agg = aggregate_chunk_results(results)
     base = {
         "status": "ok",
         "url": input_url,
         "resolved_url": resolved_url,
         "model": args.model,
-        "chunks": len(chunks),
+        "chunks": n_chunks,
         "valid_chunks": len(results),
+        **(extra or {}),
     }
 
     if args.report == "summary":
-        out = {
+        return {
             **base,
             "overall_score": agg["overall_score"],
             "confidence": agg["confidence"],
@@ -496,11 +1231,654 @@ def main() -> None:
             "top_risks": agg["top_risks"],
             "red_flags_count": len(agg["red_flags"]),
         }
-    elif args.report == "detailed":
-        out = {**base, **agg}
+    if args.report == "detailed":
+        return {**base, **agg}
+    return {**base, **agg, "chunks": results}
+
+
+def _snapshot_scope(args: argparse.Namespace) -> str:
+    settings = [
+        args.chunker,
+        args.chunk_size,
+        args.chunk_overlap,
+        args.chunk_tokens,
+        args.chunk_overlap_tokens,
+    ]
+    scope: str = chunk_cache_key(
+        args.model, SYSTEM_SCORER, PROMPT_VERSION, json.dumps(settings)
+    )
+    return scope
+
+
+def score_incremental(
+    site: PreparedSite,
+    args: argparse.Namespace,
+    snapshots: SnapshotStore,
+    score: Callable[[List[str]], List[Dict[str, Any]]],
+) -> Tuple[List[str], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Re-score only the parts of a policy that changed since its last snapshot.
+
+    Previous chunks lying in unchanged text keep their stored results; the
+    changed regions are re-split and passed to `score`. Without a usable
+    snapshot (first run, other model or chunking settings, --refresh, or more
+    than --max-chunks pieces) every chunk is scored. The new text, chunk
+    spans and results replace the snapshot.
+
+    Returns:
+        The chunks, their valid results (indexed in chunk order) and a
+        summary of what changed.
+    """
+    scope = _snapshot_scope(args)
+    prev = None if args.refresh else snapshots.get(site.resolved_url, scope)
+    info: Dict[str, Any] = {"previous": prev is not None}
+
+    # (start offset, chunk, previous result or None when it must be scored)
+    pieces: List[Tuple[int, str, Optional[Dict[str, Any]]]] = []
+    if prev is not None:
+        old_spans = [
+            span if res is not None else None
+            for span, res in zip(prev["spans"], prev["results"])
+        ]
+        plan = plan_incremental(prev["text"], old_spans, site.text)
+        for idx, (start, end) in plan.kept.items():
+            pieces.append((start, site.text[start:end], prev["results"][idx]))
+        for start, end in plan.dirty:
+            region = site.text[start:end]
+            sub = _split_text(region, args)
+            for chunk, span in zip(sub, locate_chunks(region, sub)):
+                pieces.append((start + (span[0] if span else 0), chunk, None))
+        pieces.sort(key=lambda p: p[0])
+        info["changed_lines"] = plan.changed_lines
+        info["changed_sections"] = plan.sections
+        if len(pieces) > args.max_chunks:
+            pieces = []
+
+    if pieces:
+        chunks = [chunk for _, chunk, _ in pieces]
+        spans: List[Optional[Tuple[int, int]]] = [
+            (start, start + len(chunk)) for start, chunk, _ in pieces
+        ]
+        _, site.meta["chunking"], _ = _cap_chunks(site.text, chunks, args)
+    else:
+        chunks = site.chunks
+        spans = locate_chunks(site.text, chunks)
+        pieces = [(0, chunk, None) for chunk in chunks]
+
+    todo = [i for i, (_, _, res) in enumerate(pieces) if res is None]
+    fresh = {todo[j["index"] - 1]: j for j in score([pieces[i][1] for i in todo])}
+    merged: List[Optional[Dict[str, Any]]] = []
+    results: List[Dict[str, Any]] = []
+    for i, (_, _, res) in enumerate(pieces):
+        j = fresh.get(i) if res is None else dict(res)
+        merged.append(j)
+        if j is not None:
+            j["index"] = i + 1
+            results.append(j)
+
+    snapshots.put(
+        site.resolved_url,
+        scope,
+        site.text,
+        spans,
+        [
+            {k: v for k, v in j.items() if k not in ("index", "reused_from")}
+            if j is not None
+            else None
+            for j in merged
+        ],
+    )
+    info["chunks_reused"] = len(pieces) - len(todo)
+    info["chunks_rescored"] = [i + 1 for i in todo]
+    return chunks, results, info
+
+
+def analyze_url(
+    input_url: str,
+    args: argparse.Namespace,
+    cache: Optional[ChunkResultCache] = None,
+    progress: bool = True,
+    similar: Optional[SimilarityIndex] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    tracer: Optional[Tracer] = None,
+) -> Dict[str, Any]:
+    """
+    Run discovery, fetching, chunking and scoring for one URL; return the report.
+
+    Spans and token usage are collected in `tracer` (a new one by default)
+    and summarized in the report's `timings` and `usage` blocks.
+    """
+    tracer = tracer or Tracer()
+    with tracer.activate():
+        report = _analyze(input_url, args, cache, progress, similar, snapshots)
+    report["timings"] = tracer.timings()
+    report["usage"] = tracer.usage()
+    return report
+
+
+def _analyze(
+    input_url: str,
+    args: argparse.Namespace,
+    cache: Optional[ChunkResultCache],
+    progress: bool,
+    similar: Optional[SimilarityIndex],
+    snapshots: Optional[SnapshotStore],
+) -> Dict[str, Any]:
+    site = prepare_chunks(input_url, args)
+    if site.error is not None:
+        return site.error
+
+    failed: List[Dict[str, Any]] = []
+
+    def _score_with(
+        chunks: List[str], numbers: List[int], strong: bool
+    ) -> List[Dict[str, Any]]:
+        cheap = args.cascade_model and not strong
+        return score_chunks(
+            chunks,
+            model=args.cascade_model if cheap else args.model,
+            concurrency=args.concurrency,
+            cache=cache,
+            progress=progress,
+            max_len=site.prompt_max_chars,
+            # Only strong results are shared with similar policies.
+            similar=None if cheap else similar,
+            source_url=site.resolved_url,
+            pack=args.pack,
+            numbers=numbers,
+            base_url=args.cascade_base_url if cheap else args.base_url,
+            failures=failed,
+        )
+
+    escalated: List[Dict[str, Any]] = []
+
+    def _score(
+        chunks: List[str], numbers: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        nums = numbers or list(range(1, len(chunks) + 1))
+        if not args.cascade_model:
+            return _score_with(chunks, nums, True)
+        results, more = score_chunks_cascade(
+            chunks, nums, _score_with, margin=args.escalate_margin
+        )
+        escalated.extend(more)
+        return results
+
+    chunks = site.chunks
+    extra = dict(site.meta)
+    if snapshots is not None:
+        chunks, results, extra["incremental"] = score_incremental(
+            site, args, snapshots, _score
+        )
+    elif args.adaptive:
+        results, extra["adaptive"] = score_chunks_adaptive(
+            chunks,
+            _score,
+            wave=max(1, args.concurrency) * max(1, args.pack),
+            tolerance=args.tolerance,
+            min_chunks=args.min_chunks,
+        )
     else:
-        out = {**base, **agg, "chunks": results}
+        results = _score(chunks)
+    if args.cascade_model:
+        by_model = Counter(str(j.get("model")) for j in results)
+        extra["cascade"] = {
+            "cheap_model": args.cascade_model,
+            "strong_model": args.model,
+            "chunks_by_model": dict(by_model),
+            "escalated": sorted(escalated, key=lambda e: int(e["chunk"])),
+        }
+    if failed:
+        # Cheap-model failures that the strong model recovered are not lost.
+        scored = {int(j["index"]) for j in results}
+        lost = {int(f["chunk"]): f for f in failed if int(f["chunk"]) not in scored}
+        if lost:
+            extra["failed_chunks"] = [lost[n] for n in sorted(lost)]
+    if cache is not None:
+        extra["cache"] = cache.stats()
+    if similar is not None:
+        extra["similar"] = {
+            "reused": [
+                {"chunk": j["index"], "source": j["reused_from"]}
+                for j in results
+                if "reused_from" in j
+            ]
+        }
+    return build_report(input_url, site.resolved_url, args, len(chunks), results, extra)
+
+
+# Flags a --serve client may set per job; everything else comes from the CLI.
+_JOB_OPTIONS = (
+    "model",
+    "report",
+    "fetch",
+    "no_discover",
+    "adaptive",
+    "pack",
+    "cascade_model",
+    "max_chunks",
+)
+
+
+def _job_args(args: argparse.Namespace, options: Dict[str, Any]) -> argparse.Namespace:
+    """
+    CLI args for one --serve job: `args` with the job's `options` applied.
+
+    Options are parsed like the matching flags, so types and choices are
+    checked the same way. Raises ValueError for anything else.
+    """
+    unknown = sorted(set(options) - set(_JOB_OPTIONS))
+    if unknown:
+        raise ValueError(f"unsupported options: {', '.join(unknown)}")
+    argv: List[str] = []
+    for name, value in options.items():
+        flag = "--" + name.replace("_", "-")
+        if value is None:
+            raise ValueError(f"option {name} must not be null")
+        if isinstance(value, bool):
+            if value:
+                argv.append(flag)
+        else:
+            argv += [flag, str(value)]
+    parser = build_parser()
+    parser.exit_on_error = False
+    try:
+        parsed = parser.parse_args(argv)
+    except (argparse.ArgumentError, SystemExit) as e:
+        raise ValueError(f"invalid options: {e}") from None
+    job = argparse.Namespace(**vars(args))
+    for name in options:
+        setattr(job, name, getattr(parsed, name))
+    return job
+
+
+def _job_options(args: argparse.Namespace, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a --serve job's `options` and return every job option's value.
+
+    The result is the parsed, effective value of each `_JOB_OPTIONS` flag,
+    so `{"pack": "4"}`, `{"pack": 4}` and (with `--pack 4` on the command
+    line) `{}` all describe, and de-duplicate to, the same job.
+    """
+    job = _job_args(args, options)
+    return {name: getattr(job, name) for name in _JOB_OPTIONS}
+
+
+def run_service(args: argparse.Namespace) -> None:
+    """
+    Serve analyses over HTTP until interrupted (see analyzer.service).
+
+    Caches, the HTTP session, LLM clients and browsers are created once
+    and shared by every job.
+    """
+    cache = _open_cache(args)
+    similar = _open_similar(args)
+    snapshots = _open_snapshots(args)
+    if os.getenv("OPENAI_API_KEY") or args.base_url:
+        _llm_client(args.base_url)
+        if args.cascade_model:
+            _llm_client(args.cascade_base_url)
+
+    def _analyze_job(url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        # `options` were normalized by _job_options when the job was submitted.
+        return analyze_url(
+            url,
+            argparse.Namespace(**{**vars(args), **options}),
+            cache=cache.scoped() if cache is not None else None,
+            progress=False,
+            similar=similar,
+            snapshots=snapshots,
+        )
+
+    service = AnalysisService(
+        _analyze_job,
+        workers=args.serve_workers,
+        max_queue=args.serve_queue,
+        validate=functools.partial(_job_options, args),
+    )
+    server = make_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host!s}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if cache is not None:
+            cache.close()
+        if similar is not None:
+            similar.close()
+        if snapshots is not None:
+            snapshots.close()
+
 
+def _read_urls(source: str) -> Iterator[str]:
+    """Yield URLs from a file (or stdin for '-'), skipping blanks and # comments."""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in stream:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(
+    urls: Iterable[str], args: argparse.Namespace, out: TextIO
+) -> Dict[str, Any]:
+    """
+    Analyze many sites in one process and write one JSONL record per site.
+
+    At most `args.sites_concurrency` sites run at once and at most
+    `args.per_host` of them share a host. A failing site is recorded as an
+    error record and the batch continues.
+    """
+    cache = _open_cache(args)
+    similar = _open_similar(args)
+    snapshots = _open_snapshots(args)
+    host_limits: Dict[str, threading.BoundedSemaphore] = {}
+    lock = threading.Lock()
+    failures: Counter[str] = Counter()
+    counts = {"sites": 0, "ok": 0}
+    traces: List[Tuple[str, Tracer]] = []
+
+    def _site(url: str) -> None:
+        host = urlparse(url).netloc.lower()
+        with lock:
+            gate = host_limits.setdefault(
+                host, threading.BoundedSemaphore(max(1, args.per_host))
+            )
+        tracer = Tracer()
+        with gate:
+            try:
+                rec = analyze_url(
+                    url,
+                    args,
+                    cache=cache.scoped() if cache is not None else None,
+                    progress=False,
+                    similar=similar,
+                    snapshots=snapshots,
+                    tracer=tracer,
+                )
+            except Exception as e:
+                rec = {
+                    "status": "error",
+                    "reason": "exception",
+                    "url": url,
+                    "error": f"{type(e).__name__}: {e}",
+                }
+        with lock:
+            if args.trace:
+                traces.append((url, tracer))
+            counts["sites"] += 1
+            if rec.get("status") == "ok":
+                counts["ok"] += 1
+            else:
+                failures[str(rec.get("reason", "unknown"))] += 1
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+
+    start = time.monotonic()
+    workers = max(1, args.sites_concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            inflight: Set[Future[None]] = set()
+            for url in urls:
+                if len(inflight) >= workers * 2:
+                    _, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                inflight.add(pool.submit(_site, url))
+            wait(inflight)
+    finally:
+        if cache is not None:
+            cache.close()
+        if similar is not None:
+            similar.close()
+        if snapshots is not None:
+            snapshots.close()
+        if args.trace:
+            write_chrome_trace(args.trace, traces)
+
+    elapsed = time.monotonic() - start
+    return {
+        "status": "done",
+        "sites": counts["sites"],
+        "ok": counts["ok"],
+        "failed": counts["sites"] - counts["ok"],
+        "failures_by_reason": dict(failures),
+        "elapsed_s": round(elapsed, 2),
+        "sites_per_min": round(counts["sites"] / elapsed * 60.0, 2) if elapsed else 0.0,
+    }
+
+
+def run_openai_batch(
+    args: argparse.Namespace,
+    transport: BatchTransport,
+    out: TextIO,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, Any]:
+    """
+    Score a batch of sites through an offline Batch API job.
+
+    The job is tracked in the `args.openai_batch` manifest: sites are
+    discovered and chunked once, all chunk prompts go into one request file,
+    the job is submitted and polled, and results are aggregated per site.
+    Re-running with the same manifest resumes from the last recorded state.
+    """
+    manifest = BatchJobManifest(args.openai_batch)
+
+    if manifest.state == "new":
+        urls = list(_read_urls(args.batch))
+        with ThreadPoolExecutor(max_workers=max(1, args.sites_concurrency)) as pool:
+            prepared = list(pool.map(lambda u: prepare_chunks(u, args), urls))
+        sites: List[Dict[str, Any]] = []
+        with open(manifest.requests_path, "w", encoding="utf-8") as fh:
+            for si, (url, site) in enumerate(zip(urls, prepared)):
+                ids = [f"s{si}-c{ci}" for ci in range(1, len(site.chunks) + 1)]
+                for cid, chunk in zip(ids, site.chunks):
+                    req = build_chat_request(
+                        cid, args.model, chunk, site.prompt_max_chars
+                    )
+                    fh.write(json.dumps(req, ensure_ascii=False) + "\n")
+                sites.append(
+                    {
+                        "url": url,
+                        "resolved_url": site.resolved_url,
+                        "custom_ids": ids,
+                        "error": site.error,
+                        "meta": site.meta,
+                    }
+                )
+        manifest.update(state="prepared", model=args.model, sites=sites)
+
+    if manifest.state == "prepared":
+        job_id = transport.submit(manifest.requests_path)
+        manifest.update(state="submitted", job_id=job_id)
+
+    if manifest.state == "submitted":
+        status = manifest.wait(transport, poll_interval=args.poll_interval, sleep=sleep)
+        if status != "completed":
+            manifest.update(state="failed", job_status=status)
+        else:
+            parsed = parse_batch_results(transport.results(manifest.data["job_id"]))
+            failures: Counter[str] = Counter()
+            for site in manifest.data["sites"]:
+                if site["error"] is not None:
+                    rec = site["error"]
+                else:
+                    results: List[Dict[str, Any]] = []
+                    for ci, cid in enumerate(site["custom_ids"], 1):
+                        j = parsed.get(cid)
+                        if isinstance(j, dict) and "scores" in j:
+                            j["index"] = ci
+                            results.append(j)
+                    rec = build_report(
+                        site["url"],
+                        site["resolved_url"],
+                        args,
+                        len(site["custom_ids"]),
+                        results,
+                        site.get("meta"),
+                    )
+                if rec.get("status") != "ok":
+                    failures[str(rec.get("reason"))] += 1
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+            manifest.update(state="collected", failures_by_reason=dict(failures))
+
+    return {
+        "status": manifest.state,
+        "job_id": manifest.data.get("job_id"),
+        "sites": len(manifest.data.get("sites", [])),
+        "failures_by_reason": manifest.data.get("failures_by_reason", {}),
+    }
+
+
+def run_corpus(args: argparse.Namespace, out: Optional[TextIO]) -> Dict[str, Any]:
+    """
+    Re-aggregate a stored corpus under --weights without any LLM calls.
+
+    Writes one record per site to `out` (if given) and returns corpus-level
+    statistics.
+    """
+    from analyzer.corpus import ScoreCorpus
+
+    corpus = (
+        ScoreCorpus.load(args.corpus)
+        if args.corpus.endswith(".npz")
+        else ScoreCorpus.from_jsonl(args.corpus)
+    )
+    if args.save_corpus:
+        corpus.save(args.save_corpus)
+    weights = None
+    if args.weights:
+        with open(args.weights, encoding="utf-8") as fh:
+            weights = json.load(fh)
+
+    start = time.monotonic()
+    summary: Dict[str, Any] = corpus.summary(weights)
+    if out is not None:
+        agg = corpus.aggregate(weights)
+        cats = corpus.categories
+        means = agg["category_means"]
+        for s, site in enumerate(corpus.sites):
+            rec = {
+                "url": site,
+                "overall_score": float(agg["overall_score"][s]),
+                "confidence": float(agg["confidence"][s]),
+                "top_strengths": [
+                    [cats[c], float(means[s, c])] for c in agg["top_strengths"][s]
+                ],
+                "top_risks": [
+                    [cats[c], float(means[s, c])] for c in agg["top_risks"][s]
+                ],
+            }
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    summary["elapsed_s"] = round(time.monotonic() - start, 3)
+    return summary
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    configure_session(per_host=args.http_per_host)
+    http_cache = configure_http_cache(
+        None if args.no_http_cache else args.http_cache_dir
+    )
+    discovery_cache = configure_discovery_cache(
+        None if args.no_discovery_cache else args.discovery_cache_dir,
+        ttl_seconds=args.discovery_ttl,
+        negative_ttl_seconds=args.discovery_negative_ttl,
+    )
+    configure_browser_pool(
+        size=args.browser_pool_size, max_pages=args.browser_max_pages
+    )
+    configure_extractor(args.extractor)
+    configure_schedulers(max_attempts=max(0, args.llm_retries) + 1)
+
+    if args.serve:
+        run_service(args)
+        return
+
+    if args.corpus:
+        sink: Optional[TextIO] = (
+            open(args.output, "w", encoding="utf-8") if args.output else None
+        )
+        try:
+            summary = run_corpus(args, sink)
+        finally:
+            if sink is not None:
+                sink.close()
+        print(json.dumps(summary, indent=2))
+        return
+
+    if args.openai_batch:
+        if not args.batch:
+            raise SystemExit("--openai-batch requires --batch FILE")
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set. Configure your .env file.")
+        out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        try:
+            summary = run_openai_batch(
+                args, OpenAIBatchTransport(_openai_client(api_key)), out
+            )
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(json.dumps(summary), file=sys.stderr)
+        return
+
+    if args.batch:
+        out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        try:
+            summary = run_batch(_read_urls(args.batch), args, out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if http_cache is not None:
+            summary["http_cache"] = http_cache.stats()
+        if discovery_cache is not None:
+            summary["discovery_cache"] = discovery_cache.stats()
+        print(json.dumps(summary), file=sys.stderr)
+        return
+
+    _FETCH_MEMO.clear()
+    input_url = args.url or input("Enter a site (or privacy policy) URL: ").strip()
+
+    cache = _open_cache(args)
+    similar = _open_similar(args)
+    snapshots = _open_snapshots(args)
+    tracer = Tracer()
+    try:
+        out = analyze_url(
+            input_url,
+            args,
+            cache=cache,
+            similar=similar,
+            snapshots=snapshots,
+            tracer=tracer,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+        if similar is not None:
+            similar.close()
+        if snapshots is not None:
+            snapshots.close()
+        if args.trace:
+            write_chrome_trace(args.trace, [(input_url, tracer)])
+
+    if out["status"] != "ok":
+        print(json.dumps(out))
+        return
+    out["fetch"] = _FETCH_MEMO.stats()
+    if http_cache is not None:
+        out["fetch"]["http_cache"] = http_cache.stats()
+    if discovery_cache is not None:
+        out["fetch"]["discovery_cache"] = discovery_cache.stats()
     print(json.dumps(out, ensure_ascii=False, indent=2))
 
 
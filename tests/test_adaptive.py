@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+from src.analyzer.adaptive import order_chunks, overall_stderr
+from src.analyzer.scoring import SCORING_WEIGHTS
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+
+def _result(score, index=0):
+    return {"scores": {k: score for k in SCORING_WEIGHTS}, "index": index}
+
+
+def test_order_chunks_puts_broad_chunks_first():
+    chunks = [
+        "Welcome to our website.",
+        "We retain data as long as needed and you have the right to access it.",
+        "We collect your email. We share it with third parties and transfer it "
+        "outside the EU. We use encryption. Children under the age of 13...",
+    ]
+    assert order_chunks(chunks) == [2, 1, 0]
+
+
+def test_overall_stderr_shrinks_with_agreeing_scores():
+    assert overall_stderr([]) == math.inf
+    assert overall_stderr([{"scores": {"retention_and_deletion": 5}}]) == math.inf
+    one = overall_stderr([_result(6)])
+    many = overall_stderr([_result(6), _result(7), _result(6), _result(7)])
+    assert many < one
+    assert overall_stderr([_result(6)] * 3) == 0.0
+
+
+def test_score_chunks_adaptive_stops_once_converged():
+    calls = []
+
+    def _score(chunks, numbers):
+        calls.append(numbers)
+        return [_result(6, n) for n in numbers]
+
+    chunks = [f"chunk {i}" for i in range(10)]
+    results, summary = main.score_chunks_adaptive(chunks, _score, wave=2, min_chunks=3)
+
+    assert calls == [[1, 2, 3]]
+    assert summary == {
+        "chunks_scored": 3,
+        "chunks_skipped": 7,
+        "stderr": 0.0,
+        "tolerance": 3.0,
+    }
+    assert [r["index"] for r in results] == [1, 2, 3]
+
+
+def test_score_chunks_adaptive_scores_everything_when_noisy():
+    def _score(chunks, numbers):
+        return [_result(0 if n % 2 else 10, n) for n in numbers]
+
+    chunks = [f"chunk {i}" for i in range(6)]
+    results, summary = main.score_chunks_adaptive(chunks, _score, wave=2)
+
+    assert summary["chunks_skipped"] == 0
+    assert summary["stderr"] > 3.0
+    assert len(results) == 6
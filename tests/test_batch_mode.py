@@ -0,0 +1,74 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+
+def test_run_batch_writes_jsonl_and_survives_failures(monkeypatch):
+    def fake_analyze(url, args, cache=None, progress=True, **kw):
+        assert progress is False
+        if "boom" in url:
+            raise RuntimeError("exploded")
+        if "empty" in url:
+            return main._error("fetch_failed", url, url)
+        return {"status": "ok", "url": url, "overall_score": 50.0}
+
+    monkeypatch.setattr(main, "analyze_url", fake_analyze)
+    args = main.build_parser().parse_args(["--batch", "-", "--no-cache"])
+    out = io.StringIO()
+    urls = [
+        "https://a.test/",
+        "https://boom.test/",
+        "https://empty.test/",
+        "https://b.test/",
+    ]
+
+    summary = main.run_batch(urls, args, out)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(r["url"] for r in records) == sorted(urls)
+    assert summary["sites"] == 4 and summary["ok"] == 2 and summary["failed"] == 2
+    assert summary["failures_by_reason"] == {"exception": 1, "fetch_failed": 1}
+    boom = next(r for r in records if "boom" in r["url"])
+    assert boom["error"] == "RuntimeError: exploded"
+
+
+def test_run_batch_respects_per_host_limit(monkeypatch):
+    active, peak = {}, {}
+    lock = threading.Lock()
+
+    def fake_analyze(url, args, cache=None, progress=True, **kw):
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        return {"status": "ok", "url": url}
+
+    monkeypatch.setattr(main, "analyze_url", fake_analyze)
+    args = main.build_parser().parse_args(
+        ["--batch", "-", "--no-cache", "--sites-concurrency", "8", "--per-host", "2"]
+    )
+    urls = [f"https://same.test/{i}" for i in range(8)] + [
+        f"https://o{i}.test/" for i in range(4)
+    ]
+
+    summary = main.run_batch(urls, args, io.StringIO())
+
+    assert summary["ok"] == 12
+    assert peak["same.test"] <= 2
+
+
+def test_read_urls_skips_blanks_and_comments(tmp_path):
+    f = tmp_path / "urls.txt"
+    f.write_text("https://a.test/\n\n# note\n  https://b.test/  \n")
+    assert list(main._read_urls(str(f))) == ["https://a.test/", "https://b.test/"]
@@ -0,0 +1,44 @@
+import copy
+
+import pytest
+
+bench = pytest.importorskip(
+    "benchmarks.run", reason="requires optional runtime deps (openai, bs4, ...)"
+)
+
+
+@pytest.fixture(scope="module")
+def report():
+    return bench.run_benchmarks(repeat=1)
+
+
+def test_every_fixture_site_is_discovered_fetched_and_scored(report):
+    assert set(report["sites"]) == {name for name, _ in bench.SITES}
+    for name, path in bench.SITES:
+        site = report["sites"][name]
+        assert site["found"], name
+        assert site["resolved"] == path
+        stages = site["stages"]
+        assert set(stages) == set(bench.STAGES)
+        assert not any("error" in m for m in stages.values())
+        assert stages["resolve"]["requests"] > 0
+        assert stages["fetch"]["requests"] == 1
+        assert stages["chunking"]["requests"] == 0
+        assert stages["chunking"]["chunks"] > 0
+        assert stages["scoring"]["scored"] == stages["chunking"]["chunks"]
+        assert stages["scoring"]["requests"] == stages["scoring"]["scored"]
+
+
+def test_compare_flags_only_real_regressions(report):
+    assert bench.compare(report, report) == []
+
+    worse = copy.deepcopy(report)
+    stage = worse["sites"]["direct"]["stages"]["resolve"]
+    stage["requests"] += 10
+    stage["wall_ms"] += 1.0  # below the absolute floor
+    worse["sites"]["links"]["found"] = False
+    problems = bench.compare(worse, report)
+
+    assert any(p.startswith("direct.resolve.requests") for p in problems)
+    assert not any("wall_ms" in p for p in problems)
+    assert "links: policy no longer found" in problems
@@ -0,0 +1,80 @@
+import pytest
+
+browser = pytest.importorskip(
+    "src.analyzer.browser", reason="requires selenium/chromedriver-autoinstaller"
+)
+
+
+class FakeDriver:
+    def __init__(self, texts=None, fail_on=None):
+        self.texts = texts or {}
+        self.fail_on = fail_on
+        self.url = "about:blank"
+        self.cdp = []
+        self.quit_called = False
+
+    def get(self, url):
+        if url == self.fail_on:
+            raise browser.WebDriverException("crashed")
+        self.url = url
+
+    def execute_script(self, script):
+        if "readyState" in script:
+            return ["complete", len(self.texts.get(self.url, ""))]
+        if "innerText" in script:
+            return self.texts.get(self.url)
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(drivers, **kw):
+    it = iter(drivers)
+    return browser.BrowserPool(factory=lambda: next(it), settle_timeout=1.0, **kw)
+
+
+def test_pool_reuses_warm_browser_and_resets_between_pages(monkeypatch):
+    monkeypatch.setattr(browser.time, "sleep", lambda s: None)
+    d = FakeDriver({"https://a.test/p": "policy text", "https://b.test/p": "other"})
+    pool = _pool([d])
+    assert pool.fetch_text("https://a.test/p") == "policy text"
+    assert pool.fetch_text("https://b.test/p") == "other"
+    assert pool.launched == 1
+    assert "Network.clearBrowserCookies" in d.cdp
+    assert d.url == "about:blank"
+
+
+def test_pool_recycles_after_max_pages_and_on_crash(monkeypatch):
+    monkeypatch.setattr(browser.time, "sleep", lambda s: None)
+    first = FakeDriver({"https://a.test/": "x"})
+    second = FakeDriver(fail_on="https://a.test/boom")
+    third = FakeDriver({"https://a.test/": "y"})
+    pool = _pool([first, second, third], max_pages=1)
+
+    assert pool.fetch_text("https://a.test/") == "x"
+    assert first.quit_called
+    assert pool.fetch_text("https://a.test/boom") is None
+    assert second.quit_called
+    assert pool.fetch_text("https://a.test/") == "y"
+    assert pool.launched == 3
+
+
+def test_wait_for_settle_returns_once_text_is_stable(monkeypatch):
+    monkeypatch.setattr(browser.time, "sleep", lambda s: None)
+    sizes = iter(
+        [("loading", -1), ("complete", 10), ("complete", 20)] + [("complete", 20)] * 5
+    )
+
+    class Growing(FakeDriver):
+        calls = 0
+
+        def execute_script(self, script):
+            Growing.calls += 1
+            return list(next(sizes))
+
+    browser.wait_for_settle(Growing(), timeout=5, stable_rounds=2)
+    assert Growing.calls == 5
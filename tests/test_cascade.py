@@ -0,0 +1,91 @@
+import pytest
+
+from src.analyzer.cascade import chunk_score, escalation_reason
+from src.analyzer.scoring import SCORING_WEIGHTS
+
+
+def _result(score, red_flags=()):
+    return {
+        "scores": {k: score for k in SCORING_WEIGHTS},
+        "rationales": {k: "ok" for k in SCORING_WEIGHTS},
+        "red_flags": list(red_flags),
+    }
+
+
+def test_chunk_score_is_weighted_over_valid_categories():
+    assert chunk_score(_result(9)) == 90.0
+    assert chunk_score({"scores": {"retention_and_deletion": 3}}) == 30.0
+    assert chunk_score({"scores": {}}) is None
+
+
+@pytest.mark.parametrize(
+    "result, reason",
+    [
+        (None, "invalid"),
+        ({"rationales": {}}, "invalid"),
+        ({"scores": {"retention_and_deletion": 5}, "rationales": {}}, "schema"),
+        ({**_result(9), "rationales": None}, "schema"),
+        (
+            {
+                **_result(9),
+                "scores": {**_result(9)["scores"], "security_and_breach": 11},
+            },
+            "schema",
+        ),
+        (_result(9, ["Indefinite retention"]), "inconsistent"),
+        (_result(4), "borderline"),
+        (_result(7), "borderline"),
+        (_result(9), None),
+        (_result(2, ["Sells data"]), None),
+    ],
+)
+def test_escalation_reason(result, reason):
+    assert escalation_reason(result) == reason
+
+
+def test_borderline_margin_zero_disables_it():
+    assert escalation_reason(_result(4), margin=0) is None
+
+
+def test_analyze_url_cascade_escalates_only_uncertain_chunks(monkeypatch):
+    main = pytest.importorskip("src.main")
+    calls = []
+
+    def _fake(text_chunk, model, base_url=None, **kw):
+        calls.append((model, base_url, text_chunk[:6]))
+        if model == "strong":
+            return _result(8)
+        kind = text_chunk[:6]
+        if kind == "broken":
+            return {"oops": True}
+        return _result(4 if kind == "border" else 9)
+
+    paras = ["clearx", "broken", "border", "clearx"]
+    text = "\n\n".join(p + " " + "words here. " * 20 for p in paras)
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake)
+    monkeypatch.setattr(main, "fetch_policy_text", lambda url, prefer: text)
+    args = main.build_parser().parse_args(
+        [
+            "--url", "https://a.test/privacy",
+            "--no-discover",
+            "--chunk-size", "260",
+            "--chunk-overlap", "0",
+            "--model", "strong",
+            "--cascade-model", "cheap",
+            "--cascade-base-url", "http://localhost:11434/v1",
+            "--report", "full",
+        ]
+    )  # fmt: skip
+
+    out = main.analyze_url(args.url, args, progress=False)
+
+    assert out["chunks"] and [c["index"] for c in out["chunks"]] == [1, 2, 3, 4]
+    assert [c["model"] for c in out["chunks"]] == ["cheap", "strong", "strong", "cheap"]
+    assert out["cascade"]["escalated"] == [
+        {"chunk": 2, "reason": "invalid"},
+        {"chunk": 3, "reason": "borderline"},
+    ]
+    assert out["cascade"]["chunks_by_model"] == {"cheap": 2, "strong": 2}
+    assert {b for m, b, _ in calls if m == "cheap"} == {"http://localhost:11434/v1"}
+    assert {b for m, b, _ in calls if m == "strong"} == {None}
+    assert sorted(t for m, _, t in calls if m == "strong") == ["border", "broken"]
@@ -0,0 +1,34 @@
+from analyzer.cache import ChunkResultCache, chunk_cache_key
+
+
+def test_chunk_cache_key_depends_on_every_component():
+    base = chunk_cache_key("gpt-4o", "sys", "1", "chunk")
+    assert base == chunk_cache_key("gpt-4o", "sys", "1", "chunk")
+    assert base != chunk_cache_key("gpt-4o-mini", "sys", "1", "chunk")
+    assert base != chunk_cache_key("gpt-4o", "sys2", "1", "chunk")
+    assert base != chunk_cache_key("gpt-4o", "sys", "2", "chunk")
+    assert base != chunk_cache_key("gpt-4o", "sys", "1", "chunk!")
+
+
+def test_chunk_cache_counts_hits_and_misses(tmp_path):
+    cache = ChunkResultCache(str(tmp_path))
+    assert cache.get("k") is None
+    cache.set("k", {"scores": {"a": 1}})
+    assert cache.get("k") == {"scores": {"a": 1}}
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_chunk_cache_refresh_skips_reads_but_writes(tmp_path):
+    cache = ChunkResultCache(str(tmp_path))
+    cache.set("k", {"scores": {"a": 1}})
+    cache.close()
+
+    refreshing = ChunkResultCache(str(tmp_path), refresh=True)
+    assert refreshing.get("k") is None
+    refreshing.set("k", {"scores": {"a": 2}})
+    refreshing.close()
+
+    cache = ChunkResultCache(str(tmp_path))
+    assert cache.get("k") == {"scores": {"a": 2}}
+    cache.close()
@@ -0,0 +1,99 @@
+import json
+import random
+import time
+
+import numpy as np
+import pytest
+
+from src.analyzer.corpus import ScoreCorpus
+from src.analyzer.scoring import SCORING_WEIGHTS, aggregate_chunk_results
+
+CATS = list(SCORING_WEIGHTS)
+
+
+def _site(rng, n_chunks):
+    return [
+        {"scores": {c: rng.randint(0, 10) for c in CATS if rng.random() > 0.2}}
+        for _ in range(n_chunks)
+    ]
+
+
+def test_aggregate_matches_per_site_aggregation():
+    rng = random.Random(7)
+    sites = [(f"https://s{i}.test/", _site(rng, rng.randint(1, 6))) for i in range(50)]
+    corpus = ScoreCorpus.from_results(sites)
+    agg = corpus.aggregate()
+
+    for s, (_, results) in enumerate(sites):
+        ref = aggregate_chunk_results(results)
+        assert agg["overall_score"][s] == pytest.approx(ref["overall_score"], abs=0.01)
+        assert agg["confidence"][s] == ref["confidence"]
+        assert [CATS[c] for c in agg["top_strengths"][s]] == [
+            k for k, _ in ref["top_strengths"]
+        ]
+        assert [CATS[c] for c in agg["top_risks"][s]] == [
+            k for k, _ in ref["top_risks"]
+        ]
+
+
+def test_reweighting_and_new_categories():
+    sites = [
+        ("a", [{"scores": {"retention_and_deletion": 10, "ai_training": 0}}]),
+        ("b", [{"scores": {"retention_and_deletion": 0, "ai_training": 10}}]),
+        ("empty", [{"error": "x"}]),
+    ]
+    corpus = ScoreCorpus.from_results(sites)
+    assert corpus.sites == ["a", "b"]
+    assert corpus.categories[-1] == "ai_training"
+
+    agg = corpus.aggregate({"ai_training": 1.0})
+    assert agg["overall_score"].tolist() == [0.0, 100.0]
+    # Extra categories do not count towards confidence, as per site.
+    ref = aggregate_chunk_results(sites[0][1])["confidence"]
+    assert agg["confidence"].tolist() == [ref, ref]
+    with pytest.raises(ValueError):
+        corpus.aggregate({"nope": 1.0})
+
+
+def test_summary_percentiles_and_npz_round_trip(tmp_path):
+    rng = random.Random(1)
+    corpus = ScoreCorpus.from_results((f"s{i}", _site(rng, 3)) for i in range(20))
+    path = tmp_path / "corpus.npz"
+    corpus.save(path)
+    loaded = ScoreCorpus.load(path)
+
+    assert loaded.sites == corpus.sites
+    np.testing.assert_array_equal(loaded.offsets, corpus.offsets)
+    summary = loaded.summary(percentiles=(50, 90))
+    assert summary["sites"] == 20 and summary["chunks"] == 60
+    assert set(summary["overall_score"]) == {"mean", "p50", "p90"}
+    assert summary["categories"]["retention_and_deletion"]["p50"] <= 10
+    json.dumps(summary)
+
+
+def test_reweighting_large_corpus_is_fast():
+    n_sites, per_site = 100_000, 10
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 11, size=(n_sites * per_site, len(CATS))).astype(
+        np.float32
+    )
+    offsets = np.arange(0, n_sites * per_site + 1, per_site, dtype=np.int64)
+    corpus = ScoreCorpus([f"s{i}" for i in range(n_sites)], CATS, scores, offsets)
+
+    start = time.monotonic()
+    agg = corpus.aggregate({c: 1.0 for c in CATS})
+    assert time.monotonic() - start < 5.0
+    assert agg["overall_score"].shape == (n_sites,)
+
+
+def test_from_jsonl_reads_full_reports(tmp_path):
+    path = tmp_path / "out.jsonl"
+    recs = [
+        {"status": "ok", "url": "a", "resolved_url": "https://a/p",
+         "chunks": [{"scores": {"retention_and_deletion": 4}, "index": 1}]},
+        {"status": "error", "reason": "fetch_failed", "url": "b"},
+    ]  # fmt: skip
+    path.write_text("\n".join(json.dumps(r) for r in recs) + '\nnot json\n[]\n1\n"x"\n')
+    corpus = ScoreCorpus.from_jsonl(path)
+    assert corpus.sites == ["https://a/p"]
+    assert corpus.scores.shape == (1, len(CATS))
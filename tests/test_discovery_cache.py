@@ -0,0 +1,196 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.analyzer.discoverycache import DiscoveryCache
+
+
+def test_cache_remembers_resolutions_and_failures_per_host(tmp_path):
+    cache = DiscoveryCache(str(tmp_path))
+    try:
+        assert cache.resolved("shop.test") is None
+        cache.store_resolved("Shop.test", "https://shop.test/legal/privacy")
+        assert cache.resolved("shop.test") == "https://shop.test/legal/privacy"
+
+        cache.record_path("shop.test", "/privacy", False)
+        cache.record_path("shop.test", "/legal/privacy", True)
+        assert cache.failed_paths("shop.test", ["/privacy", "/legal/privacy"]) == {
+            "/privacy"
+        }
+        assert cache.failed_paths("other.test", ["/privacy"]) == set()
+
+        assert not cache.no_sitemap("shop.test")
+        cache.record_sitemap("shop.test", False)
+        assert cache.no_sitemap("shop.test")
+        cache.record_sitemap("shop.test", True)
+        assert not cache.no_sitemap("shop.test")
+
+        cache.record_path("shop.test", "/privacy", False)
+        cache.record_sitemap("shop.test", False)
+        cache.forget("shop.test")
+        assert cache.resolved("shop.test") is None
+        assert cache.failed_paths("shop.test", ["/privacy"]) == set()
+        assert not cache.no_sitemap("shop.test")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 2, 1)
+    finally:
+        cache.close()
+
+
+def test_negative_entries_expire_on_their_own_ttl(tmp_path):
+    cache = DiscoveryCache(str(tmp_path), ttl_seconds=60, negative_ttl_seconds=1)
+    try:
+        cache.store_resolved("shop.test", "https://shop.test/privacy")
+        cache.record_path("shop.test", "/en/privacy", False)
+        cache.record_sitemap("shop.test", False)
+        time.sleep(1.1)
+        assert cache.failed_paths("shop.test", ["/en/privacy"]) == set()
+        assert not cache.no_sitemap("shop.test")
+        assert cache.resolved("shop.test") == "https://shop.test/privacy"
+    finally:
+        cache.close()
+
+
+@pytest.fixture
+def main_with_cache(tmp_path, monkeypatch):
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    # Every page is missing unless a test says otherwise.
+    monkeypatch.setattr(main, "_FETCH_MEMO", main.FetchMemo())
+    monkeypatch.setattr(
+        main, "_download", lambda url, timeout=15: SimpleNamespace(status_code=404)
+    )
+    main.configure_discovery_cache(str(tmp_path / "discovery"))
+    try:
+        yield main
+    finally:
+        main.configure_discovery_cache(None)
+
+
+def test_repeat_resolution_costs_one_verification(main_with_cache, monkeypatch):
+    main = main_with_cache
+    probes = []
+    listings = []
+
+    def _verify(url):
+        probes.append(url)
+        return url.endswith("/legal/privacy")
+
+    def _sitemaps(base):
+        listings.append(base)
+        return []
+
+    monkeypatch.setattr(main, "_light_verify", _verify)
+    monkeypatch.setattr(main, "_sitemap_candidates", _sitemaps)
+    monkeypatch.setattr(main, "_discover_candidates_from_html", lambda u: [])
+
+    first = main.resolve_privacy_url("https://shop.test/")
+    assert first == ("https://shop.test/legal/privacy", "https://shop.test/")
+    assert len(probes) > 1
+
+    probes.clear()
+    assert main.resolve_privacy_url("https://shop.test/about") == (
+        "https://shop.test/legal/privacy",
+        "https://shop.test/about",
+    )
+    assert probes == ["https://shop.test/legal/privacy"]
+
+
+def _settle(cache, host, paths):
+    """Wait for losing probes (cancelled or not) to record their failures."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if cache.no_sitemap(host) and len(cache.failed_paths(host, paths)) == len(
+            paths
+        ):
+            return
+        time.sleep(0.01)
+
+
+def test_unresolved_host_skips_known_failures(main_with_cache, monkeypatch):
+    main = main_with_cache
+    probes = []
+    listings = []
+
+    def _verify(url):
+        probes.append(url)
+        return False
+
+    def _sitemaps(base):
+        listings.append(base)
+        return []
+
+    monkeypatch.setattr(main, "_light_verify", _verify)
+    monkeypatch.setattr(main, "_sitemap_candidates", _sitemaps)
+    monkeypatch.setattr(main, "_discover_candidates_from_html", lambda u: [])
+
+    assert main.resolve_privacy_url("https://shop.test/") == (
+        "https://shop.test/",
+        None,
+    )
+    assert len(probes) == len(main._COMMON_PATHS) and len(listings) == 1
+    _settle(main.get_discovery_cache(), "shop.test", main._COMMON_PATHS)
+
+    probes.clear()
+    assert main.resolve_privacy_url("https://shop.test/") == (
+        "https://shop.test/",
+        None,
+    )
+    assert probes == [] and len(listings) == 1
+
+
+def test_stale_resolution_is_rediscovered_from_scratch(main_with_cache, monkeypatch):
+    main = main_with_cache
+    probes = []
+    live = {"https://shop.test/legal/privacy"}
+
+    def _verify(url):
+        probes.append(url)
+        return url in live
+
+    monkeypatch.setattr(main, "_light_verify", _verify)
+    monkeypatch.setattr(main, "_sitemap_candidates", lambda base: [])
+    monkeypatch.setattr(main, "_discover_candidates_from_html", lambda u: [])
+    main.resolve_privacy_url("https://shop.test/")
+    others = [p for p in main._COMMON_PATHS if p != "/legal/privacy"]
+    _settle(main.get_discovery_cache(), "shop.test", others)
+
+    # The policy moved to a path that failed last time.
+    live = {"https://shop.test/privacy-policy"}
+    probes.clear()
+    assert main.resolve_privacy_url("https://shop.test/")[0] == (
+        "https://shop.test/privacy-policy"
+    )
+    assert probes[0] == "https://shop.test/legal/privacy"
+    assert main.get_discovery_cache().stats()["stale"] == 1
+
+
+def test_transient_failures_are_not_remembered(main_with_cache, monkeypatch):
+    main = main_with_cache
+    status = {"/privacy": 404, "/privacy-policy": 200}
+
+    def _download(url, timeout=15):
+        path = url.removeprefix("https://shop.test")
+        if path == "/legal/privacy":
+            return None  # timeout or connection error
+        return SimpleNamespace(status_code=status.get(path, 503))
+
+    monkeypatch.setattr(main, "_download", _download)
+    monkeypatch.setattr(main, "_light_verify", lambda url: False)
+    monkeypatch.setattr(main, "_sitemap_candidates", lambda base: [])
+    monkeypatch.setattr(main, "_discover_candidates_from_html", lambda u: [])
+
+    assert main.resolve_privacy_url("https://shop.test/") == (
+        "https://shop.test/",
+        None,
+    )
+    cache = main.get_discovery_cache()
+    # robots.txt answered 503, so the empty sitemap proves nothing either.
+    assert cache.failed_paths("shop.test", main._COMMON_PATHS) == {
+        "/privacy",
+        "/privacy-policy",
+    }
+    assert not cache.no_sitemap("shop.test")
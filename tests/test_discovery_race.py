@@ -0,0 +1,68 @@
+import time
+
+from src.analyzer.discovery import DiscoveryStage, SuccessStats, race_candidates
+
+
+def _verifier(good, delays=None, seen=None):
+    def verify(url):
+        if seen is not None:
+            seen.append(url)
+        time.sleep((delays or {}).get(url, 0))
+        return url in good
+
+    return verify
+
+
+def test_race_keeps_sequential_precedence_when_several_verify():
+    verify = _verifier({"/b", "sm1", "html1"}, delays={"/b": 0.1})
+    winner = race_candidates(
+        [
+            DiscoveryStage("common", ["/a", "/b"], verify),
+            DiscoveryStage("sitemaps", lambda: ["sm1"], verify),
+            DiscoveryStage("html", lambda: ["html1"], verify),
+        ]
+    )
+    assert winner == "/b"
+
+
+def test_race_falls_through_to_later_stages():
+    verify = _verifier({"html1"})
+    winner = race_candidates(
+        [
+            DiscoveryStage("common", ["/a", "/b"], verify),
+            DiscoveryStage("sitemaps", lambda: [], verify),
+            DiscoveryStage("html", lambda: ["html0", "html1"], verify),
+        ]
+    )
+    assert winner == "html1"
+
+
+def test_race_returns_none_when_nothing_verifies():
+    verify = _verifier(set())
+    assert race_candidates([DiscoveryStage("common", ["/a"], verify)]) is None
+
+
+def test_race_deadline_returns_best_hit_so_far():
+    verify = _verifier({"/b"}, delays={"/a": 1.0})
+    start = time.monotonic()
+    winner = race_candidates(
+        [DiscoveryStage("common", ["/a", "/b"], verify)], deadline=0.2
+    )
+    assert winner == "/b"
+    assert time.monotonic() - start < 0.9
+
+
+def test_race_probes_by_rank_and_reports_results():
+    stats = SuccessStats()
+    stats.record("/b", True)
+    stats.record("/a", False)
+    seen, results = [], []
+    verify = _verifier({"/b"}, seen=seen)
+    race_candidates(
+        [DiscoveryStage("common", ["/a", "/b"], verify, rank=stats.rate)],
+        workers=1,
+        on_result=lambda stage, url, ok: results.append((stage.name, url, ok)),
+    )
+    assert seen[0] == "/b"
+    assert stats.rate("/b") > 0.5 > stats.rate("/a")
+    assert ("common", "/b", True) in results
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.analyzer import extract
+from src.analyzer.extract import extract_page, register_strategy
+
+HTML = """<html><head><title> Privacy </title><base href="/legal/">
+<style>.x{}</style></head><body>
+<nav><a href="privacy">Privacy notice</a> <a href="/about">About us</a>
+<a href="privacy">Privacy again</a></nav>
+<script>var privacy = 1;</script>
+<main><h1>Privacy Policy</h1><p>We collect data.</p></main>
+</body></html>"""
+
+
+def test_extract_page_reads_text_links_and_signals_in_one_pass():
+    page = extract_page(
+        HTML.encode(),
+        "https://a.test/en/home",
+        link_filter=lambda s: "privacy" in s.lower(),
+        strategy="lxml",
+    )
+    assert page is not None
+    assert page.title == "Privacy"
+    assert page.strategy == "lxml"
+    assert "We collect data." in page.text
+    assert "var privacy" not in page.body_text
+    assert page.links == (("https://a.test/legal/privacy", "Privacy notice"),)
+    assert page.signals["anchors"] == 3
+    assert 0 < page.signals["link_density"] < 1
+
+
+def test_extract_page_decodes_with_declared_charset():
+    body = "<html><body><p>Gizlilik politikası</p></body></html>".encode("iso-8859-9")
+    page = extract_page(body, "https://a.test/", "text/html; charset=ISO-8859-9")
+    assert page is not None
+    assert "Gizlilik politikası" in page.body_text
+
+
+def test_extract_page_plugs_in_strategies_on_the_parsed_tree(monkeypatch):
+    monkeypatch.setattr(extract, "STRATEGIES", dict(extract.STRATEGIES))
+    seen = []
+
+    def headings(tree):
+        seen.append(tree)
+        return " | ".join(h.text_content() for h in tree.iter("h1"))
+
+    def broken(tree):
+        raise RuntimeError("boom")
+
+    register_strategy("headings", headings)
+    register_strategy("broken", broken)
+    page = extract_page(HTML.encode(), "https://a.test/", strategy="headings")
+    assert page is not None and page.text == "Privacy Policy"
+    assert len(seen) == 1
+    fallback = extract_page(HTML.encode(), "https://a.test/", strategy="broken")
+    assert fallback is not None
+    assert fallback.strategy == "lxml" and fallback.text == fallback.body_text
+    with pytest.raises(ValueError):
+        extract_page(HTML.encode(), "https://a.test/", strategy="nope")
+
+
+def test_extract_page_rejects_empty_documents():
+    assert extract_page(b"", "https://a.test/") is None
+    assert extract_page(b"  \n", "https://a.test/") is None
+
+
+def test_main_parses_each_page_once_for_all_helpers(monkeypatch):
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    policy = (
+        "<p>" + "Privacy policy: we collect and share personal data. " * 20 + "</p>"
+    )
+    html = f'<html><body><a href="/privacy">Privacy</a>{policy}</body></html>'
+    downloads, parses = [], []
+
+    def download(url, timeout=15):
+        downloads.append(url)
+        return SimpleNamespace(
+            url=url, content=html.encode(), headers={"Content-Type": "text/html"}
+        )
+
+    real = main.extract_page
+
+    def counting(*args, **kwargs):
+        parses.append(args[1])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(main, "_download", download)
+    monkeypatch.setattr(main, "extract_page", counting)
+    monkeypatch.setattr(main, "_FETCH_MEMO", main.FetchMemo())
+    url = "https://a.test/privacy"
+    assert main._light_verify(url)
+    assert main._extract_text_quality(url)[0]
+    assert main.fetch_policy_text(url, prefer="http")
+    assert main._discover_candidates_from_html(url) == [url]
+    assert downloads == [url]
+    assert parses == [url]
@@ -0,0 +1,91 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from analyzer.memo import FetchMemo
+
+
+def _loader(calls, redirects=None):
+    def load(url):
+        calls.append(url)
+        time.sleep(0.01)
+        return SimpleNamespace(url=(redirects or {}).get(url, url), text=f"body:{url}")
+
+    return load
+
+
+def test_fetch_memo_downloads_each_url_once():
+    calls = []
+    memo = FetchMemo()
+    load = _loader(calls)
+    first = memo.fetch("https://a.test/privacy", load)
+    second = memo.fetch("https://a.test/privacy", load)
+    assert first is second
+    assert calls == ["https://a.test/privacy"]
+    assert memo.stats() == {"downloads": 1, "hits": 1}
+
+
+def test_fetch_memo_keys_by_final_url_after_redirects():
+    calls = []
+    memo = FetchMemo()
+    load = _loader(calls, {"https://a.test/privacy": "https://a.test/legal/privacy"})
+    r = memo.fetch("https://a.test/privacy", load)
+    assert memo.fetch("https://a.test/legal/privacy", load) is r
+    assert calls == ["https://a.test/privacy"]
+
+
+def test_fetch_memo_derive_computes_once_and_memoizes_failures():
+    calls, computed = [], []
+    memo = FetchMemo()
+
+    def compute(r):
+        computed.append(r)
+        return None if r is None else r.text.upper()
+
+    assert (
+        memo.derive("https://a.test/", "upper", _loader(calls), compute)
+        == "BODY:HTTPS://A.TEST/"
+    )
+    assert (
+        memo.derive("https://a.test/", "upper", _loader(calls), compute)
+        == "BODY:HTTPS://A.TEST/"
+    )
+    assert memo.derive("https://b.test/", "x", lambda u: None, compute) is None
+    assert memo.fetch("https://b.test/", _loader(calls)) is None
+    assert len(computed) == 2
+    assert calls == ["https://a.test/"]
+
+
+def test_fetch_memo_concurrent_callers_share_one_download():
+    calls = []
+    memo = FetchMemo()
+    load = _loader(calls)
+    threads = [
+        threading.Thread(target=memo.fetch, args=("https://a.test/p", load))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["https://a.test/p"]
+
+
+def test_fetch_memo_evicts_least_recently_used():
+    calls = []
+    memo = FetchMemo(max_entries=2)
+    load = _loader(calls)
+    for u in (
+        "https://a.test/1",
+        "https://a.test/2",
+        "https://a.test/1",
+        "https://a.test/3",
+    ):
+        memo.fetch(u, load)
+    memo.fetch("https://a.test/2", load)
+    assert calls == [
+        "https://a.test/1",
+        "https://a.test/2",
+        "https://a.test/3",
+        "https://a.test/2",
+    ]
@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.analyzer.httpcache import HttpCache, parse_max_age
+
+_BODIES = {
+    "/policy": (b"<html>policy text</html>", {"ETag": '"v1"'}),
+    "/robots.txt": (b"Sitemap: /sitemap.xml\n", {"Cache-Control": "max-age=3600"}),
+    "/nostore": (b"secret", {"ETag": '"x"', "Cache-Control": "no-store"}),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list = []
+
+    def do_GET(self):
+        body, headers = _BODIES[self.path]
+        type(self).hits.append((self.path, self.headers.get("If-None-Match")))
+        if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+            self.send_response(304)
+            self.send_header("ETag", headers["ETag"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    _Handler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_parse_max_age():
+    assert parse_max_age("public, max-age=600") == 600
+    assert parse_max_age("no-cache, max-age=600") == 0
+    assert parse_max_age("private, no-store") is None
+    assert parse_max_age("") == 0
+
+
+def test_revalidates_with_etag_and_serves_304_from_disk(base_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    s = requests.Session()
+    first = cache.get(s, base_url + "/policy")
+    second = cache.get(s, base_url + "/policy")
+
+    assert first.text == second.text == "<html>policy text</html>"
+    assert second.url == first.url
+    assert _Handler.hits == [("/policy", None), ("/policy", '"v1"')]
+    stats = cache.stats()
+    assert stats["revalidated"] == 1 and stats["fresh"] == 0
+    assert stats["bytes_saved"] == len(_BODIES["/policy"][0])
+    assert stats["hit_rate"] == 0.5
+    cache.close()
+
+
+def test_fresh_robots_are_served_without_request(base_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    s = requests.Session()
+    cache.get(s, base_url + "/robots.txt", fresh_ok=True)
+    again = cache.get(s, base_url + "/robots.txt", fresh_ok=True)
+    streamed = b"".join(cache.stream(s, base_url + "/robots.txt"))
+
+    assert again.text == streamed.decode() == "Sitemap: /sitemap.xml\n"
+    assert len(_Handler.hits) == 1
+    assert cache.stats()["fresh"] == 2
+    cache.close()
+
+
+def test_no_store_responses_are_not_cached(base_url, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    s = requests.Session()
+    cache.get(s, base_url + "/nostore")
+    cache.get(s, base_url + "/nostore")
+    assert _Handler.hits == [("/nostore", None), ("/nostore", None)]
+    cache.close()
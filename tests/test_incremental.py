@@ -0,0 +1,92 @@
+import pytest
+
+from src.analyzer.incremental import SnapshotStore, locate_chunks, plan_incremental
+
+_PARAS = [f"Section {i}. " + f"clause {i} " * 30 for i in range(6)]
+_OLD = "\n".join(_PARAS) + "\n"
+
+
+def test_locate_chunks_handles_overlap_and_missing_chunks():
+    text = "abcdefgh"
+    assert locate_chunks(text, ["abcd", "cdef", "zz", "gh"]) == [
+        (0, 4),
+        (2, 6),
+        None,
+        (6, 8),
+    ]
+
+
+def test_plan_keeps_unchanged_chunks_and_marks_edited_region_dirty():
+    spans = locate_chunks(_OLD, _PARAS)
+    new = _OLD.replace("clause 3 clause 3", "clause 3 amended", 1)
+
+    plan = plan_incremental(_OLD, spans, new)
+
+    assert sorted(plan.kept) == [0, 1, 2, 4, 5]
+    assert len(plan.dirty) == 1
+    start, end = plan.dirty[0]
+    assert "amended" in new[start:end]
+    assert plan.changed_lines == 1
+    assert plan.sections[0]["change"] == "replace"
+    assert plan.sections[0]["new_lines"] == [4, 4]
+
+
+def test_plan_shifts_kept_spans_after_insertions():
+    spans = locate_chunks(_OLD, _PARAS)
+    new = "Intro paragraph added.\n" + _OLD
+
+    plan = plan_incremental(_OLD, spans, new)
+
+    assert len(plan.kept) == 6
+    for idx, (start, end) in plan.kept.items():
+        assert new[start:end] == _PARAS[idx]
+    assert [new[s:e].strip() for s, e in plan.dirty] == ["Intro paragraph added."]
+    assert plan.sections[0]["change"] == "insert"
+
+
+def test_snapshot_store_is_scoped(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.put("https://a/p", "s1", "text", [(0, 4)], [{"scores": {}}])
+    assert store.get("https://a/p", "s1")["spans"] == [(0, 4)]
+    assert store.get("https://a/p", "s2") is None
+    assert store.get("https://b/p", "s1") is None
+    store.close()
+
+
+def test_analyze_url_incremental_rescores_only_changed_chunks(monkeypatch, tmp_path):
+    main = pytest.importorskip("src.main")
+    texts = iter([_OLD, _OLD.replace("clause 3 clause 3", "clause 3 amended", 1)])
+    calls = []
+
+    def _fake(text_chunk, model, **kw):
+        calls.append(text_chunk)
+        return {"scores": {"retention_and_deletion": 6}}
+
+    monkeypatch.setattr(main, "fetch_policy_text", lambda url, prefer: next(texts))
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake)
+    args = main.build_parser().parse_args(
+        [
+            "--url", "https://a.test/privacy",
+            "--no-discover",
+            "--chunk-size", "400",
+            "--chunk-overlap", "0",
+            "--report", "full",
+        ]
+    )  # fmt: skip
+    store = SnapshotStore(str(tmp_path))
+
+    first = main.analyze_url(args.url, args, progress=False, snapshots=store)
+    n_first = len(calls)
+    second = main.analyze_url(args.url, args, progress=False, snapshots=store)
+    store.close()
+
+    assert first["incremental"] == {
+        "previous": False,
+        "chunks_reused": 0,
+        "chunks_rescored": list(range(1, n_first + 1)),
+    }
+    assert second["incremental"]["previous"] is True
+    assert second["incremental"]["chunks_rescored"] == [4]
+    assert second["incremental"]["chunks_reused"] == 5
+    assert len(calls) == n_first + 1 and "amended" in calls[-1]
+    assert [c["index"] for c in second["chunks"]] == list(range(1, 7))
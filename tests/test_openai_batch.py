@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+
+from src.analyzer.batch_api import (
+    BatchJobManifest,
+    LocalBatchTransport,
+    build_chat_request,
+    parse_batch_results,
+)
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+CATS = [
+    "lawful_basis_and_purpose",
+    "collection_and_minimization",
+    "secondary_use_and_limits",
+    "retention_and_deletion",
+    "third_parties_and_processors",
+    "cross_border_transfers",
+    "user_rights_and_redress",
+    "security_and_breach",
+    "transparency_and_notice",
+    "sensitive_children_ads_profiling",
+]
+
+
+def _responder(body):
+    excerpt = body["messages"][1]["content"].rsplit("Excerpt:\n", 1)[-1].strip()
+    if excerpt == "garbage":
+        return "not json"
+    score = int(excerpt[-1])
+    return json.dumps(
+        {"scores": {k: score for k in CATS}, "rationales": {k: "r" for k in CATS}}
+    )
+
+
+def test_build_chat_request_and_parse_results_roundtrip():
+    req = build_chat_request("s0-c1", "gpt-4o", "text")
+    assert req["url"] == "/v1/chat/completions"
+    assert req["body"]["model"] == "gpt-4o"
+    lines = [
+        json.dumps(
+            {
+                "custom_id": "a",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": '{"scores": {}}'}}]},
+                },
+            }
+        ),
+        json.dumps({"custom_id": "b", "response": {"status_code": 500, "body": {}}}),
+        json.dumps({"custom_id": "c", "error": {"message": "x"}}),
+    ]
+    assert parse_batch_results(lines) == {"a": {"scores": {}}, "b": None, "c": None}
+
+
+def _args(tmp_path, urls):
+    src = tmp_path / "urls.txt"
+    src.write_text("\n".join(urls))
+    return main.build_parser().parse_args(
+        [
+            "--batch",
+            str(src),
+            "--openai-batch",
+            str(tmp_path / "job.json"),
+            "--report",
+            "detailed",
+        ]
+    )
+
+
+def _prepare(url, args):
+    if "down" in url:
+        return main.PreparedSite(url, error=main._error("fetch_failed", url, url))
+    if "noise" in url:
+        return main.PreparedSite(url + "privacy", ["garbage"])
+    return main.PreparedSite(
+        url + "privacy", ["chunk 6", "chunk 8"], meta={"chunking": {"mode": "chars"}}
+    )
+
+
+def test_run_openai_batch_maps_results_back_per_site(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "prepare_chunks", _prepare)
+    args = _args(
+        tmp_path, ["https://a.test/", "https://down.test/", "https://noise.test/"]
+    )
+    out = io.StringIO()
+
+    summary = main.run_openai_batch(
+        args,
+        LocalBatchTransport(tmp_path / "jobs", _responder),
+        out,
+        sleep=lambda s: None,
+    )
+
+    recs = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert summary["status"] == "collected"
+    assert summary["failures_by_reason"] == {"fetch_failed": 1, "no_valid_scores": 1}
+    assert recs[0]["status"] == "ok" and recs[0]["valid_chunks"] == 2
+    assert recs[0]["category_scores"]["security_and_breach"]["score"] == 7.0
+    assert recs[0]["chunking"] == {"mode": "chars"}
+    assert [r.get("reason") for r in recs[1:]] == ["fetch_failed", "no_valid_scores"]
+
+
+def test_run_openai_batch_resumes_from_manifest(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "prepare_chunks", _prepare)
+    args = _args(tmp_path, ["https://a.test/"])
+
+    class FlakySubmit(LocalBatchTransport):
+        def submit(self, requests_path):
+            raise ConnectionError("upload failed")
+
+    with pytest.raises(ConnectionError):
+        main.run_openai_batch(
+            args, FlakySubmit(tmp_path / "jobs", _responder), io.StringIO()
+        )
+    assert BatchJobManifest(args.openai_batch).state == "prepared"
+
+    monkeypatch.setattr(main, "prepare_chunks", lambda u, a: pytest.fail("re-prepared"))
+    out = io.StringIO()
+    summary = main.run_openai_batch(
+        args, LocalBatchTransport(tmp_path / "jobs", _responder), out
+    )
+    assert summary["status"] == "collected"
+    assert json.loads(out.getvalue())["status"] == "ok"
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from src.analyzer.batch_api import build_packed_chat_request, parse_packed_content
+from src.analyzer.prompts import PACKED_SYSTEM_SCORER
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+
+def test_packed_request_keeps_stable_prefix_first():
+    a = build_packed_chat_request("", "m", ["one", "two"])["body"]
+    b = build_packed_chat_request("", "m", ["three"])["body"]
+    assert a["messages"][0] == b["messages"][0]
+    assert a["messages"][0]["content"] == PACKED_SYSTEM_SCORER
+    user = a["messages"][1]["content"]
+    assert '<excerpt id="1">\none\n</excerpt>' in user
+    assert '<excerpt id="2">\ntwo\n</excerpt>' in user
+    assert a["max_tokens"] == 1200
+
+
+def test_parse_packed_content_checks_count_and_reorders():
+    content = json.dumps(
+        {
+            "results": [
+                {"excerpt": 2, "scores": {"b": 1}},
+                {"excerpt": 1, "scores": {"a": 1}},
+            ]
+        }
+    )
+    assert parse_packed_content(content, 2) == [
+        {"scores": {"a": 1}},
+        {"scores": {"b": 1}},
+    ]
+    assert parse_packed_content(content, 3) is None
+    assert parse_packed_content("not json", 2) is None
+    assert parse_packed_content('{"scores": {}}', 1) is None
+
+
+def test_score_chunks_packs_and_falls_back_on_mismatch(monkeypatch):
+    packed_calls, single_calls = [], []
+
+    def _packed(chunks, model, **kw):
+        packed_calls.append(list(chunks))
+        if "short" in chunks:
+            return None
+        return [{"scores": {"x": int(c)}} if c != "0" else {"oops": 1} for c in chunks]
+
+    def _single(text_chunk, model, **kw):
+        single_calls.append(text_chunk)
+        return {"scores": {"x": -1}}
+
+    monkeypatch.setattr(main, "analyze_chunks_packed", _packed)
+    monkeypatch.setattr(main, "analyze_chunk_json", _single)
+    chunks = ["1", "2", "0", "short", "5"]
+
+    results = main.score_chunks(
+        chunks, model="m", pack=3, concurrency=2, progress=False
+    )
+
+    assert packed_calls == [["1", "2", "0"], ["short", "5"]]
+    assert sorted(single_calls) == ["0", "5", "short"]
+    assert [r["index"] for r in results] == [1, 2, 3, 4, 5]
+    assert [r["scores"]["x"] for r in results] == [1, 2, -1, -1, -1]
+
+
+def test_packed_and_single_runs_do_not_share_cached_results(monkeypatch, tmp_path):
+    from analyzer.cache import ChunkResultCache
+
+    calls = []
+
+    def _packed(chunks, model, **kw):
+        calls.extend(chunks)
+        return [{"scores": {"x": 1}} for _ in chunks]
+
+    def _single(text_chunk, model, **kw):
+        calls.append(text_chunk)
+        return {"scores": {"x": 2}}
+
+    monkeypatch.setattr(main, "analyze_chunks_packed", _packed)
+    monkeypatch.setattr(main, "analyze_chunk_json", _single)
+    cache = ChunkResultCache(str(tmp_path))
+    try:
+        for pack in (1, 2, 1, 2):
+            main.score_chunks(["a", "b"], model="m", pack=pack, cache=cache)
+        assert calls == ["a", "b", "a", "b"]
+        assert cache.stats()["hits"] == 4
+    finally:
+        cache.close()
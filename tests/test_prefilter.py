@@ -0,0 +1,100 @@
+import pytest
+
+from src.analyzer.prefilter import prefilter_text, relevance
+
+_PROSE = (
+    "We collect personal information such as your email address when you create "
+    "an account, and we retain it only as long as necessary for the purposes "
+    "described in this notice. You have the right to access, correct or delete "
+    "your data at any time by contacting our privacy team."
+)
+_NAV = "Home\nProducts\nPricing\nBlog\nCareers"
+_COOKIES = "\n".join(
+    ["Name\nProvider\nExpiry"]
+    + [f"_ga{i}\nexample{i}.com\n{i + 1} years" for i in range(6)]
+)
+
+
+def test_relevance_prefers_privacy_prose():
+    assert relevance(_PROSE) > 0.8
+    assert relevance("Shop our new summer styles today.") < 0.15
+    assert relevance("") == 0.0
+
+
+def test_prefilter_drops_navigation_cookie_tables_and_repeats():
+    banner = "Accept all cookies"
+    text = "\n\n".join(
+        [
+            _NAV,
+            banner,
+            "Your privacy rights",
+            _PROSE,
+            banner,
+            _PROSE.upper(),
+            banner,
+            _COOKIES,
+        ]
+    )
+
+    out, report = prefilter_text(text)
+
+    assert _NAV not in out and "_ga3" not in out
+    assert out.count(banner) == 1
+    assert "Your privacy rights" in out and _PROSE in out
+    dropped = report["dropped_chars"]
+    assert dropped["navigation"] == len(_NAV) + 1
+    assert dropped["cookie_table"] == len(_COOKIES) + 1
+    assert dropped["repeated"] == 2 * (len(banner) + 1)
+    assert report["chars_in"] == len(text) and report["chars_out"] == len(out)
+
+
+def test_prefilter_groups_fragments_in_tight_markup():
+    text = "\n".join([_NAV, "Privacy Policy", _PROSE, _PROSE])
+    out, report = prefilter_text(text)
+    assert "Careers" not in out
+    assert out.startswith("Privacy Policy")
+    assert report["dropped_chars"]["navigation"] > 0
+    # Surviving lines keep their own separators, so nothing is added.
+    assert "\n\n" not in out
+    assert report["chars_out"] <= report["chars_in"]
+
+
+def test_prefilter_keeps_short_statements_in_tight_markup():
+    sections = [
+        "How Long We Keep It",
+        "We keep logs for 30 days.",
+        "How We Protect It",
+        "We use industry-standard safeguards.",
+        "Questions",
+        "Write to us any time.",
+    ]
+    text = "\n".join([_NAV, "Privacy Policy", _PROSE, _PROSE, *sections])
+    out, report = prefilter_text(text)
+    assert all(line in out for line in sections)
+    assert report["dropped_chars"] == {"navigation": len(_NAV) + 1}
+
+
+def test_prefilter_keeps_text_when_too_little_would_remain():
+    text = _NAV + "\n\nA short note."
+    out, report = prefilter_text(text)
+    assert out == text
+    assert report["skipped"] == "too_little_left"
+
+
+def test_prepare_chunks_reports_prefilter(monkeypatch):
+    main = pytest.importorskip("src.main")
+    text = "\n\n".join([_NAV, _PROSE, _COOKIES, _PROSE.upper()])
+    monkeypatch.setattr(main, "fetch_policy_text", lambda url, prefer: text)
+    args = main.build_parser().parse_args(
+        ["--no-discover", "--prefilter", "--chunk-size", "300", "--chunk-overlap", "0"]
+    )
+
+    site = main.prepare_chunks("https://a.test/privacy", args)
+
+    report = site.meta["prefilter"]
+    assert set(report["dropped_chars"]) == {"navigation", "cookie_table"}
+    assert report["chunks_dropped"] >= 1
+    assert all("_ga" not in c for c in site.chunks)
+
+    args = main.build_parser().parse_args(["--no-discover"])
+    assert "prefilter" not in main.prepare_chunks("https://a.test/p", args).meta
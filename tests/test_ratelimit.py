@@ -0,0 +1,178 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.analyzer.ratelimit import (
+    LLMCallFailed,
+    LLMScheduler,
+    RateLimitHeaders,
+    parse_duration,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _APIError(Exception):
+    def __init__(self, status, headers=None, code=None):
+        super().__init__(f"status {status}")
+        self.status_code = status
+        self.code = code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def _scheduler(clock, **kw):
+    return LLMScheduler(clock=clock, sleep=clock.sleep, **kw)
+
+
+def test_parse_duration_and_rate_limit_headers():
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("1.5s") == pytest.approx(1.5)
+    assert parse_duration("6m0s") == pytest.approx(360.0)
+    assert parse_duration("2") == 2.0
+    assert parse_duration("soon") is None
+    limits = RateLimitHeaders.from_headers(
+        {
+            "X-RateLimit-Remaining-Requests": "0",
+            "x-ratelimit-reset-requests": "250ms",
+            "x-ratelimit-remaining-tokens": "1200",
+            "retry-after-ms": "1500",
+        }
+    )
+    assert limits.remaining_requests == 0
+    assert limits.reset_requests == pytest.approx(0.25)
+    assert limits.remaining_tokens == 1200
+    assert limits.retry_after == pytest.approx(1.5)
+
+
+def test_scheduler_retries_throttled_calls_and_halves_concurrency():
+    clock = _Clock()
+    sched = _scheduler(clock, max_concurrency=8, max_attempts=4)
+    replies = [
+        _APIError(429, {"retry-after-ms": "2000"}),
+        _APIError(503),
+        ("ok", {}),
+    ]
+
+    def call():
+        r = replies.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    assert sched.call(call) == "ok"
+    assert clock.sleeps[0] >= 2.0
+    stats = sched.stats()
+    assert stats["retries"] == 2 and stats["throttled"] == 1
+    assert stats["concurrency_limit"] < 8
+
+
+def test_scheduler_gives_up_with_llm_call_failed():
+    clock = _Clock()
+    sched = _scheduler(clock, max_attempts=3)
+
+    def bad_request():
+        raise _APIError(400)
+
+    with pytest.raises(LLMCallFailed) as err:
+        sched.call(bad_request)
+    assert err.value.attempts == 1
+
+    def overloaded():
+        raise _APIError(500)
+
+    with pytest.raises(LLMCallFailed) as err:
+        sched.call(overloaded)
+    assert err.value.attempts == 3
+
+    def no_quota():
+        raise _APIError(429, code="insufficient_quota")
+
+    with pytest.raises(LLMCallFailed) as err:
+        sched.call(no_quota)
+    assert err.value.attempts == 1
+    assert sched.stats()["failed"] == 3
+
+
+def test_scheduler_waits_for_the_request_budget_to_reset():
+    clock = _Clock()
+    sched = _scheduler(clock)
+    headers = {
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "1.5s",
+    }
+    sched.call(lambda: ("first", headers))
+    assert clock.sleeps == []
+    sched.call(lambda: ("second", {}))
+    assert clock.sleeps == [pytest.approx(1.5)]
+
+
+def test_scheduler_grows_concurrency_back_after_successes():
+    clock = _Clock()
+    sched = _scheduler(clock, max_concurrency=4, max_attempts=2)
+    replies = [_APIError(429, {"retry-after-ms": "10"})] + [("ok", {})] * 40
+
+    def call():
+        r = replies.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    sched.call(call)
+    assert sched.limit <= 2
+    for _ in range(20):
+        sched.call(call)
+    assert sched.limit == 4
+
+
+def test_score_chunks_keeps_partial_results_when_a_call_fails(monkeypatch):
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+
+    def _fake(chunk, model, max_len=6000, base_url=None):
+        if chunk == "b":
+            raise main.LLMCallFailed("RateLimitError: slow down", 6)
+        return {"scores": {"data_collection": 5}}
+
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake)
+    failures = []
+    out = main.score_chunks(
+        ["a", "b", "c"], "m", concurrency=2, progress=False, failures=failures
+    )
+    assert [j["index"] for j in out] == [1, 3]
+    assert failures == [
+        {"chunk": 2, "error": "RateLimitError: slow down", "attempts": 6}
+    ]
+
+
+def test_score_chunks_stays_within_a_server_rate_limit(monkeypatch):
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    servers = pytest.importorskip("benchmarks.servers")
+    with servers.FakeLLM(rate_limit=4, rate_window=0.3) as llm:
+        monkeypatch.setenv("OPENAI_API_KEY", "rate-limit-test")
+        results = main.score_chunks(
+            [f"chunk {i}" for i in range(12)],
+            "gpt-4o-mini",
+            concurrency=6,
+            progress=False,
+            base_url=llm.base_url + "/v1",
+        )
+        seen = llm.traffic.snapshot()
+    assert len(results) == 12
+    # Budgets from the headers keep refusals to a handful, not a retry storm.
+    assert seen["errors"] <= 3
@@ -0,0 +1,40 @@
+import pytest
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+
+def test_resolve_prefers_common_path_over_faster_strategies(monkeypatch):
+    monkeypatch.setattr(
+        main, "_light_verify", lambda u: u.endswith(("/legal/privacy", "/sm-privacy"))
+    )
+    monkeypatch.setattr(
+        main, "_sitemap_candidates", lambda base: [base + "/sm-privacy"]
+    )
+    monkeypatch.setattr(main, "_discover_candidates_from_html", lambda u: [])
+
+    resolved, origin = main.resolve_privacy_url("https://shop.test/")
+
+    assert resolved == "https://shop.test/legal/privacy"
+    assert origin == "https://shop.test/"
+
+
+def test_resolve_uses_homepage_links_and_falls_back(monkeypatch):
+    monkeypatch.setattr(main, "_light_verify", lambda u: False)
+    monkeypatch.setattr(main, "_sitemap_candidates", lambda base: [])
+    monkeypatch.setattr(
+        main, "_discover_candidates_from_html", lambda u: ["https://shop.test/data"]
+    )
+    monkeypatch.setattr(main, "_html_candidate_ok", lambda u: u.endswith("/data"))
+    assert main.resolve_privacy_url("https://shop.test/") == (
+        "https://shop.test/data",
+        "https://shop.test/",
+    )
+
+    monkeypatch.setattr(main, "_html_candidate_ok", lambda u: False)
+    assert main.resolve_privacy_url("https://shop.test/") == (
+        "https://shop.test/",
+        None,
+    )
@@ -0,0 +1,58 @@
+import random
+import time
+
+import pytest
+
+main = pytest.importorskip(
+    "src.main",
+    reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+)
+
+
+def _fake_analyze(text_chunk, model, **kw):
+    time.sleep(random.uniform(0, 0.02))
+    if text_chunk == "bad":
+        return None
+    return {"scores": {"retention_and_deletion": int(text_chunk)}, "model": model}
+
+
+def test_score_chunks_concurrent_keeps_order_and_index(monkeypatch):
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake_analyze)
+    chunks = ["1", "2", "bad", "4", "5", "6"]
+
+    results = main.score_chunks(chunks, model="m", concurrency=4)
+
+    assert [r["index"] for r in results] == [1, 2, 4, 5, 6]
+    assert [r["scores"]["retention_and_deletion"] for r in results] == [1, 2, 4, 5, 6]
+
+
+def test_score_chunks_sequential_matches_concurrent(monkeypatch):
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake_analyze)
+    chunks = [str(i) for i in range(1, 9)]
+
+    seq = main.score_chunks(chunks, model="m", concurrency=1)
+    par = main.score_chunks(chunks, model="m", concurrency=8)
+
+    assert seq == par
+
+
+def test_score_chunks_uses_cache_on_rerun(monkeypatch, tmp_path):
+    from analyzer.cache import ChunkResultCache
+
+    calls = []
+
+    def _counting(text_chunk, model, **kw):
+        calls.append(text_chunk)
+        return _fake_analyze(text_chunk, model)
+
+    monkeypatch.setattr(main, "analyze_chunk_json", _counting)
+    chunks = ["1", "2", "bad"]
+
+    cache = ChunkResultCache(str(tmp_path))
+    first = main.score_chunks(chunks, model="m", concurrency=2, cache=cache)
+    second = main.score_chunks(chunks, model="m", concurrency=2, cache=cache)
+
+    assert first == second
+    assert sorted(calls) == ["1", "2", "bad", "bad"]
+    assert cache.stats() == {"hits": 2, "misses": 4}
+    cache.close()
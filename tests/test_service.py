@@ -0,0 +1,205 @@
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.analyzer.service import AnalysisService, ServiceBusy, make_server
+
+
+def _wait_for(service, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service.job(job_id)
+        if job.status in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_service_runs_each_in_flight_url_once():
+    release = threading.Event()
+    calls = []
+
+    def analyze(url, options):
+        calls.append(url)
+        release.wait(5)
+        return {"status": "ok", "url": url}
+
+    with AnalysisService(analyze, workers=2) as service:
+        first, joined_first = service.submit("https://a.test/")
+        again, joined_again = service.submit("https://a.test/")
+        other, _ = service.submit("https://a.test/", {"report": "full"})
+        assert not joined_first and joined_again
+        assert again is first and other is not first
+        release.set()
+        assert _wait_for(service, first.id).result == {
+            "status": "ok",
+            "url": "https://a.test/",
+        }
+        _wait_for(service, other.id)
+        # Once finished, the same URL is analyzed afresh.
+        fresh, joined = service.submit("https://a.test/")
+        assert not joined and fresh is not first
+        _wait_for(service, fresh.id)
+        stats = service.stats()
+    assert calls == ["https://a.test/"] * 3
+    assert stats["submitted"] == 3 and stats["deduplicated"] == 1
+
+
+def test_service_rejects_bad_input_and_a_full_queue():
+    release = threading.Event()
+
+    def validate(options):
+        if set(options) - {"report"}:
+            raise ValueError("unsupported options")
+        return options
+
+    with AnalysisService(
+        lambda url, options: release.wait(5) or {},
+        workers=1,
+        max_queue=1,
+        validate=validate,
+    ) as service:
+        with pytest.raises(ValueError):
+            service.submit("ftp://a.test/")
+        with pytest.raises(ValueError):
+            service.submit("https://a.test/", {"output": "/etc/passwd"})
+        service.submit("https://a.test/1")
+        deadline = time.monotonic() + 5
+        while service.stats()["queued"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        service.submit("https://a.test/2")
+        with pytest.raises(ServiceBusy):
+            service.submit("https://a.test/3")
+        release.set()
+
+
+def test_service_records_failures():
+    def analyze(url, options):
+        raise RuntimeError("boom")
+
+    with AnalysisService(analyze, workers=1) as service:
+        job, _ = service.submit("https://a.test/")
+        done = _wait_for(service, job.id)
+    assert done.status == "failed"
+    assert done.error == "RuntimeError: boom"
+
+
+def _request(base, method, path, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(base + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_api_submits_polls_and_returns_reports():
+    release = threading.Event()
+
+    def analyze(url, options):
+        release.wait(5)
+        return {"status": "ok", "url": url, "overall_score": 71.5}
+
+    with AnalysisService(analyze, workers=1) as service:
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = "http://127.0.0.1:%d" % server.server_address[1]
+        try:
+            status, job = _request(base, "POST", "/jobs", {"url": "https://a.test/"})
+            assert status == 202 and job["status"] in ("queued", "running")
+            status, dup = _request(base, "POST", "/jobs", {"url": "https://a.test/"})
+            assert dup["id"] == job["id"] and dup["deduplicated"]
+            status, pending = _request(base, "GET", f"/jobs/{job['id']}/result")
+            assert status == 202 and "result" not in pending
+            release.set()
+            _wait_for(service, job["id"])
+            status, done = _request(base, "GET", f"/jobs/{job['id']}/result")
+            assert status == 200 and done["result"]["overall_score"] == 71.5
+            assert _request(base, "GET", f"/jobs/{job['id']}")[1]["status"] == "done"
+            assert _request(base, "GET", "/jobs/nope")[0] == 404
+            assert _request(base, "POST", "/jobs", {"url": "nope"})[0] == 400
+            assert _request(base, "GET", "/health")[1]["done"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def _post_with_length(port, length):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.putrequest("POST", "/jobs")
+        if length is not None:
+            conn.putheader("Content-Length", length)
+        conn.endheaders(b'{"url": "https://a.test/"}')
+        r = conn.getresponse()
+        return r.status, json.loads(r.read())
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("length", [None, "abc", "-1"])
+def test_http_api_rejects_a_bad_content_length(length):
+    with AnalysisService(lambda url, options: {}, workers=1) as service:
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            status, body = _post_with_length(server.server_address[1], length)
+            assert status == 400 and "Content-Length" in body["error"]
+            assert service.stats()["submitted"] == 0
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_job_args_apply_only_supported_validated_options():
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    args = main.build_parser().parse_args(["--model", "gpt-4o"])
+    job = main._job_args(args, {"report": "full", "no_discover": True, "pack": 3})
+    assert (job.report, job.no_discover, job.pack, job.model) == (
+        "full",
+        True,
+        3,
+        "gpt-4o",
+    )
+    assert args.report == "summary"
+    for bad in (
+        {"report": "everything"},
+        {"pack": "many"},
+        {"output": "x"},
+        {"cascade_model": None},
+    ):
+        with pytest.raises(ValueError):
+            main._job_args(args, bad)
+
+
+def test_job_options_normalize_to_the_effective_values():
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    args = main.build_parser().parse_args(["--pack", "4"])
+    same = [{}, {"pack": 4}, {"pack": "4"}, {"pack": 4, "report": "summary"}]
+    normalized = [main._job_options(args, o) for o in same]
+    assert all(n == normalized[0] for n in normalized)
+    assert normalized[0]["pack"] == 4 and set(normalized[0]) == set(main._JOB_OPTIONS)
+
+    release = threading.Event()
+    with AnalysisService(
+        lambda url, options: release.wait(5) or {},
+        workers=1,
+        validate=lambda o: main._job_options(args, o),
+    ) as service:
+        first, _ = service.submit("https://a.test/", {"pack": "4"})
+        again, joined = service.submit("https://a.test/", {})
+        release.set()
+    assert joined and again is first
+    assert first.options["pack"] == 4
@@ -0,0 +1,67 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from analyzer import session as http_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set = set()
+
+    def do_GET(self):
+        type(self).peers.add(self.client_address)
+        body = self.headers.get("X-Test") or self.headers.get("User-Agent", "")
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_configure_session_sets_defaults_and_pool_limits():
+    s = http_session.configure_session(per_host=3, headers={"X-Test": "1"})
+    assert http_session.get_session() is s
+    assert s.headers["User-Agent"] == http_session.DEFAULT_HEADERS["User-Agent"]
+    assert "gzip" in s.headers["Accept-Encoding"]
+    assert s.headers["X-Test"] == "1"
+    adapter = s.get_adapter("https://example.org/")
+    assert adapter._pool_maxsize == 3
+    assert adapter._pool_block is True
+
+
+def test_shared_session_reuses_connection_for_same_host():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        s = http_session.configure_session()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        for p in ("/a", "/b", "/c"):
+            r = s.get(base + p, timeout=5)
+            assert r.text == http_session.DEFAULT_HEADERS["User-Agent"]
+        assert len(_Handler.peers) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_main_fetches_through_the_configured_session():
+    main = pytest.importorskip(
+        "src.main",
+        reason="requires optional runtime deps (dotenv/bs4/requests/selenium/langchain-text-splitters)",
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        http_session.configure_session(headers={"X-Test": "pooled"})
+        main.configure_http_cache(None)
+        r = main._download(f"http://127.0.0.1:{server.server_address[1]}/p")
+        assert r is not None and r.text == "pooled"
+    finally:
+        http_session.configure_session()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,73 @@
+import pytest
+
+from src.analyzer.similarity import SimilarityIndex, simhash
+
+_POLICY = (
+    "We collect personal information that you provide to us such as your name, "
+    "email address and payment details when you register for an account, place "
+    "an order or contact customer support. We use this information to provide "
+    "and improve our services, to process transactions, to send you updates and "
+    "marketing communications where you have consented, and to comply with our "
+    "legal obligations. You may request access to or deletion of your data at "
+    "any time by contacting our privacy team."
+)
+
+
+def test_simhash_is_close_for_small_edits_and_far_for_other_text():
+    base = simhash(_POLICY)
+    edited = simhash(_POLICY.replace("privacy team", "data protection officer"))
+    other = simhash("Cookies are small text files stored on your device. " * 8)
+    assert (base ^ edited).bit_count() <= 8
+    assert (base ^ other).bit_count() > 16
+
+
+def test_index_reuses_near_duplicates_within_scope(tmp_path):
+    index = SimilarityIndex(tmp_path / "sim.sqlite", threshold=0.9)
+    index.add("m1", _POLICY, {"scores": {"a": 7}}, "https://a.example/privacy", 2)
+
+    near = _POLICY.replace("privacy team", "data protection officer")
+    match = index.lookup("m1", near)
+    assert match is not None
+    assert match.result == {"scores": {"a": 7}}
+    assert (match.source_url, match.source_chunk) == ("https://a.example/privacy", 2)
+    assert 0.9 <= match.similarity <= 1.0
+
+    assert index.lookup("m2", near) is None
+    assert index.lookup("m1", "Cookies are small text files. " * 12) is None
+    index.close()
+
+
+def test_index_skips_short_chunks_and_honors_refresh(tmp_path):
+    path = tmp_path / "sim.sqlite"
+    index = SimilarityIndex(path)
+    index.add("m", "too short to index", {"scores": {}}, "u", 1)
+    index.add("m", _POLICY, {"scores": {"a": 1}}, "u", 1)
+    assert len(index) == 1
+    assert index.lookup("m", "too short to index") is None
+    index.close()
+
+    refreshing = SimilarityIndex(path, refresh=True)
+    assert refreshing.lookup("m", _POLICY) is None
+    refreshing.close()
+
+
+def test_score_chunks_reports_reused_chunks(monkeypatch, tmp_path):
+    main = pytest.importorskip("src.main")
+    calls = []
+
+    def _fake(text_chunk, model, **kw):
+        calls.append(text_chunk)
+        return {"scores": {"retention_and_deletion": 6}}
+
+    monkeypatch.setattr(main, "analyze_chunk_json", _fake)
+    index = SimilarityIndex(tmp_path / "sim.sqlite")
+    main.score_chunks([_POLICY], model="m", similar=index, source_url="https://a/p")
+    again = main.score_chunks(
+        [_POLICY + " Thanks."], model="m", similar=index, source_url="https://b/p"
+    )
+    index.close()
+
+    assert len(calls) == 1
+    assert again[0]["reused_from"]["url"] == "https://a/p"
+    assert again[0]["reused_from"]["chunk"] == 1
+    assert again[0]["index"] == 1
@@ -0,0 +1,68 @@
+import gzip
+import threading
+
+from src.analyzer.sitemap import crawl_sitemap, iter_sitemap_locs
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(locs):
+    body = "".join(f"<url><loc>{u}</loc></url>" for u in locs)
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def _index(locs):
+    body = "".join(f"<sitemap><loc>{u}</loc></sitemap>" for u in locs)
+    return f'<?xml version="1.0"?><sitemapindex {NS}>{body}</sitemapindex>'.encode()
+
+
+def _chunked(data, size=7):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _is_privacy(u):
+    return "privacy" in u
+
+
+def test_iter_sitemap_locs_streams_plain_and_gzip_in_small_chunks():
+    doc = _urlset(["https://a.test/", "https://a.test/privacy"])
+    expected = [("url", "https://a.test/"), ("url", "https://a.test/privacy")]
+    assert list(iter_sitemap_locs(_chunked(doc))) == expected
+    assert list(iter_sitemap_locs(_chunked(gzip.compress(doc)))) == expected
+
+
+def test_iter_sitemap_locs_tags_index_entries_and_stops_on_garbage():
+    doc = _index(["https://a.test/sm-1.xml"])
+    assert list(iter_sitemap_locs([doc])) == [("sitemap", "https://a.test/sm-1.xml")]
+    assert list(iter_sitemap_locs([b"<html><body>nope</html>"])) == []
+
+
+def test_crawl_sitemap_follows_children_in_parallel_and_keeps_order():
+    docs = {
+        "idx": _index(["c1", "c2", "c3"]),
+        "c1": _urlset(["https://a.test/x", "https://a.test/privacy"]),
+        "c2": gzip.compress(_urlset(["https://a.test/en/privacy"])),
+        "c3": _urlset(["https://a.test/tr/privacy"]),
+    }
+    got = crawl_sitemap("idx", lambda u: _chunked(docs[u], 64), _is_privacy)
+    assert got == [
+        "https://a.test/privacy",
+        "https://a.test/en/privacy",
+        "https://a.test/tr/privacy",
+    ]
+
+
+def test_crawl_sitemap_stops_reading_once_enough_matches_found():
+    consumed = []
+    lock = threading.Lock()
+    big = _urlset([f"https://a.test/privacy/{i}" for i in range(5000)])
+
+    def fetch(url):
+        for chunk in _chunked(big, 256):
+            with lock:
+                consumed.append(len(chunk))
+            yield chunk
+
+    got = crawl_sitemap("big", fetch, _is_privacy, max_urls=3)
+    assert got == [f"https://a.test/privacy/{i}" for i in range(3)]
+    assert sum(consumed) < len(big) // 10
@@ -0,0 +1,20 @@
+import pytest
+
+startup = pytest.importorskip(
+    "benchmarks.startup", reason="requires the benchmarks package on sys.path"
+)
+
+
+def test_import_main_defers_heavy_dependencies():
+    assert startup._loaded_heavy() == []
+
+
+def test_compare_flags_slower_startup_and_new_heavy_imports():
+    baseline = {"import_ms": 200.0, "help_ms": 210.0, "heavy_modules_loaded": []}
+    same = {"import_ms": 215.0, "help_ms": 205.0, "heavy_modules_loaded": []}
+    assert startup.compare(same, baseline) == []
+
+    slower = {"import_ms": 900.0, "help_ms": 210.0, "heavy_modules_loaded": ["openai"]}
+    problems = startup.compare(slower, baseline)
+    assert any(p.startswith("import_ms") for p in problems)
+    assert any("openai" in p for p in problems)
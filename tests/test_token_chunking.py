@@ -0,0 +1,78 @@
+from src.analyzer.chunking import (
+    cap_char_chunks,
+    cap_token_chunks,
+    split_text_into_token_chunks,
+    token_budget,
+)
+
+
+class WordEncoding:
+    """Deterministic stand-in for a tiktoken encoding: one token per word."""
+
+    def __init__(self):
+        self.vocab, self.rev = {}, {}
+
+    def encode(self, text):
+        out = []
+        for w in text.split():
+            if w not in self.vocab:
+                self.vocab[w] = len(self.vocab)
+                self.rev[self.vocab[w]] = w
+            out.append(self.vocab[w])
+        return out
+
+    def decode(self, tokens):
+        return " ".join(self.rev[t] for t in tokens)
+
+
+def _words(n):
+    return " ".join(f"w{i}" for i in range(n))
+
+
+def test_token_budget_prefers_override_then_longest_model_prefix():
+    assert token_budget("gpt-4.1-mini-2025-04-14") == 4000
+    assert token_budget("gpt-4o-2024-08-06") == 3000
+    assert token_budget("unknown-model") == 2000
+    assert token_budget("gpt-4o", override=123) == 123
+
+
+def test_token_chunks_are_packed_close_to_budget():
+    enc = WordEncoding()
+    chunks = split_text_into_token_chunks(_words(1000), 100, 0, enc)
+    counts = [len(enc.encode(c)) for c in chunks]
+    assert all(c <= 100 for c in counts)
+    assert len(chunks) == 10
+
+
+def test_cap_token_chunks_repacks_instead_of_truncating():
+    enc = WordEncoding()
+    text = _words(1000)
+    chunks = split_text_into_token_chunks(text, 100, 0, enc)
+
+    capped, info = cap_token_chunks(text, chunks, 4, 100, 0, enc, hard_cap_tokens=400)
+
+    assert len(capped) == 4
+    assert "truncated" not in info
+    assert info["total_tokens"] == 1000
+    assert info["token_counts"] == [len(enc.encode(c)) for c in capped]
+
+
+def test_cap_token_chunks_reports_truncation_at_hard_cap():
+    enc = WordEncoding()
+    text = _words(1000)
+    chunks = split_text_into_token_chunks(text, 100, 0, enc)
+
+    capped, info = cap_token_chunks(text, chunks, 2, 100, 0, enc, hard_cap_tokens=200)
+
+    assert len(capped) == 2
+    assert info["truncated"]["chunk"] == 2
+    assert info["total_tokens"] + info["truncated"]["tokens"] == 1000
+
+
+def test_cap_char_chunks_reports_prompt_truncation_of_merged_tail():
+    chunks = ["a" * 100] * 5
+    capped, info = cap_char_chunks(chunks, 3, prompt_max_chars=150)
+    assert len(capped) == 3
+    assert info["char_counts"] == [100, 100, 302]
+    assert info["truncated"] == {"chunks": [3], "chars": 152}
+    assert "truncated" not in cap_char_chunks(chunks, 5, 150)[1]
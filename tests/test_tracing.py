@@ -0,0 +1,115 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from src.analyzer.tracing import Tracer, bind, estimate_cost, record_usage, span
+
+
+def test_span_is_a_no_op_without_a_tracer():
+    with span("idle", x=1) as info:
+        info["y"] = 2
+    assert Tracer().timings()["spans"] == {}
+
+
+def test_bound_pool_work_reports_to_the_callers_tracer():
+    tracer = Tracer()
+
+    def _work(i):
+        with span("work", "test", i=i):
+            return i
+
+    with tracer.activate():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert list(pool.map(bind(_work), range(6))) == list(range(6))
+            pool.submit(_work, 99).result()  # unbound: not recorded
+
+    spans = tracer.timings()["spans"]
+    assert spans["work"]["count"] == 6
+
+
+def test_usage_totals_and_cost_per_model():
+    tracer = Tracer()
+    with tracer.activate():
+        record_usage(
+            "gpt-4o-mini-2024-07-18",
+            SimpleNamespace(prompt_tokens=1000, completion_tokens=100),
+        )
+        record_usage(
+            "gpt-4o-mini-2024-07-18",
+            SimpleNamespace(prompt_tokens=1000, completion_tokens=100),
+        )
+        record_usage(
+            "local-llama", SimpleNamespace(prompt_tokens=50, completion_tokens=5)
+        )
+        record_usage("gpt-4o", None)
+    usage = tracer.usage()
+
+    mini = usage["models"]["gpt-4o-mini-2024-07-18"]
+    assert mini["calls"] == 2 and mini["total_tokens"] == 2200
+    assert mini["cost_usd"] == pytest.approx(estimate_cost("gpt-4o-mini", 2000, 200))
+    assert usage["models"]["local-llama"]["cost_usd"] is None
+    assert usage["unpriced_models"] == ["local-llama"]
+    assert usage["total_tokens"] == 2255
+    assert usage["cost_usd"] == pytest.approx(mini["cost_usd"])
+
+
+def test_analyze_url_reports_timings_usage_and_writes_a_chrome_trace(
+    monkeypatch, tmp_path
+):
+    main = pytest.importorskip("src.main")
+
+    content = json.dumps({"scores": {"retention_and_deletion": 7}})
+    reply = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=900, completion_tokens=60),
+    )
+    raw = SimpleNamespace(parse=lambda: reply, headers={})
+    client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(
+                with_raw_response=SimpleNamespace(create=lambda **kw: raw)
+            )
+        )
+    )
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(main, "_openai_client", lambda key, base_url=None: client)
+    monkeypatch.setattr(
+        main, "fetch_policy_text", lambda url, prefer: "We retain data. " * 300
+    )
+    args = main.build_parser().parse_args(
+        [
+            "--url", "https://a.test/privacy",
+            "--no-discover",
+            "--model", "gpt-4o",
+            "--chunk-size", "1500",
+            "--concurrency", "3",
+        ]
+    )  # fmt: skip
+    # main imports the package as `analyzer`, so use its copy of the module.
+    tracer = main.Tracer()
+
+    out = main.analyze_url(args.url, args, progress=False, tracer=tracer)
+
+    n = out["chunks"]
+    assert n > 1
+    spans = out["timings"]["spans"]
+    assert spans["llm.chat"]["count"] == n
+    assert spans["chunking"]["count"] == 1
+    assert spans["aggregate"]["count"] == 1
+    assert out["usage"]["models"]["gpt-4o"]["calls"] == n
+    assert out["usage"]["models"]["gpt-4o"]["prompt_tokens"] == 900 * n
+    assert out["usage"]["cost_usd"] > 0
+
+    path = tmp_path / "trace.json"
+    main.write_chrome_trace(str(path), [(args.url, tracer)])
+    events = json.loads(path.read_text())["traceEvents"]
+    assert events[0] == {
+        "name": "process_name",
+        "ph": "M",
+        "pid": 1,
+        "args": {"name": args.url},
+    }
+    llm = [e for e in events if e.get("name") == "llm.chat"]
+    assert len(llm) == n and all(e["ph"] == "X" and e["dur"] >= 0 for e in llm)